@@ -1,4 +1,8 @@
-from PyEO import *
+try:
+    from .PyEO import *
+except ImportError:
+    # built with cmake, which names the module libPyEO
+    from libPyEO import *
 
 try:
     import Gnuplot
@@ -36,17 +40,17 @@ else:
             self.indices.append( len(self.indices) )
 
 
-            data1 = Gnuplot.Data(self.indices, self.values[0], with = 'lines')
+            data1 = Gnuplot.Data(self.indices, self.values[0], **{'with': 'lines'})
 
             if l == 1:
                 self.g.plot(data1)
             else:
-                data2 = Gnuplot.Data(self.indices, self.values[1], with = 'lines')
+                data2 = Gnuplot.Data(self.indices, self.values[1], **{'with': 'lines'})
 
                 if l == 2:
                     self.g.plot(data1, data2)
                 else:
-                    data3 = Gnuplot.Data(self.indices, self.values[2], with = 'lines')
+                    data3 = Gnuplot.Data(self.indices, self.values[2], **{'with': 'lines'})
 
                     self.g.plot(data1, data2, data3)
 
@@ -81,3 +85,81 @@ class eoAverageStat(eoStat):
 class eoBestFitnessStat(eoSortedStat):
     def __call__(self, pop):
         self.object = pop[0].fitness
+
+# Parallel evaluation of populations
+#
+# The individuals are shipped to the workers with their pickle support (see
+# PyEO.h) and evaluated in batches. Every batch starts from its own seed,
+# drawn from rng() in the parent, so the fitness does not depend on the
+# number of processes or on which worker gets which batch.
+
+import multiprocessing
+
+# evaluation function of the workers, set when they start (they are forked,
+# so the function itself does not need to be picklable)
+_worker_eval = None
+
+def _init_worker(eval):
+    global _worker_eval
+    _worker_eval = eval
+
+def _evaluate_batch(eval, seed, individuals):
+    rng().reseed(seed)
+    fitness = []
+    for indy in individuals:
+        eval(indy)
+        fitness.append(indy.fitness)
+    return fitness
+
+def _evaluate_worker_batch(batch):
+    seed, individuals = batch
+    return _evaluate_batch(_worker_eval, seed, individuals)
+
+class eoParallelPopEval(eoPopEvalFunc):
+    """Evaluates the individuals with an invalid fitness of a population
+    with 'eval' (an eoEvalFunc), in batches of 'batch_size' across
+    'processes' worker processes (all cores by default, none with 0, in
+    which case they are evaluated in this process with the same seeds).
+
+    It can be given to the algorithms as an eoPopEvalFunc, which evaluates
+    the offspring, or called on a population with evaluate(pop). The pool
+    is started here, so 'eval' has to be ready by then; call close() once
+    done."""
+
+    def __init__(self, eval, processes=None, batch_size=8):
+        eoPopEvalFunc.__init__(self)
+        self.eval = eval
+        self.batch_size = batch_size
+        self.pool = None
+        if processes != 0:
+            self.pool = multiprocessing.Pool(processes, _init_worker, (eval,))
+
+    def evaluate(self, pop):
+        invalid = [i for i in range(len(pop)) if pop[i].invalid()]
+        batches = [invalid[i:i + self.batch_size]
+                   for i in range(0, len(invalid), self.batch_size)]
+        seeds = [rng().rand() for batch in batches]
+
+        if self.pool is None:
+            # the seeds of the batches must not change the stream of rng()
+            state = rng().to_string()
+            for seed, batch in zip(seeds, batches):
+                _evaluate_batch(self.eval, seed, [pop[i] for i in batch])
+            rng().from_string(state)
+            return
+
+        work = [(seed, [pop[i] for i in batch])
+                for seed, batch in zip(seeds, batches)]
+        results = self.pool.map(_evaluate_worker_batch, work)
+        for batch, fitness in zip(batches, results):
+            for i, value in zip(batch, fitness):
+                pop[i].fitness = value
+
+    def __call__(self, parents, offspring):
+        self.evaluate(offspring)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -1,6 +1,7 @@
 #include "helper_functions.h"
 #include "axiom.h"
 #include "variable.h"
+#include "sas_binary.h"
 
 #include <iostream>
 #include <fstream>
@@ -24,6 +25,18 @@ Axiom::Axiom(istream &in, const vector<Variable *> &variables) {
     check_magic(in, "end_rule");
 }
 
+Axiom::Axiom(SASBinaryReader &in, const vector<Variable *> &variables) {
+    int count = in.read_int(); // number of conditions
+    for (int i = 0; i < count; i++) {
+        int varNo = in.read_int();
+        int val = in.read_int();
+        conditions.push_back(Condition(variables[varNo], val));
+    }
+    effect_var = variables[in.read_int()];
+    old_val = in.read_int();
+    effect_val = in.read_int();
+}
+
 bool Axiom::is_redundant() const {
     return effect_var->get_level() == -1;
 }
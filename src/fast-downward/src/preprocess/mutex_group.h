@@ -6,11 +6,13 @@
 using namespace std;
 
 class Variable;
+class SASBinaryReader;
 
 class MutexGroup {
     vector<pair<const Variable *, int> > facts;
 public:
     MutexGroup(istream &in, const vector<Variable *> &variables);
+    MutexGroup(SASBinaryReader &in, const vector<Variable *> &variables);
 
     void strip_unimportant_facts();
     bool is_redundant() const;
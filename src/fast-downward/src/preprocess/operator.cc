@@ -1,6 +1,7 @@
 #include "helper_functions.h"
 #include "operator.h"
 #include "variable.h"
+#include "sas_binary.h"
 
 #include <cassert>
 #include <iostream>
@@ -40,6 +41,34 @@ Operator::Operator(istream &in, const vector<Variable *> &variables) {
     // TODO: Evtl. effektiver: conditions schon sortiert einlesen?
 }
 
+Operator::Operator(SASBinaryReader &in, const vector<Variable *> &variables) {
+    name = in.read_string();
+    int count = in.read_int(); // number of prevail conditions
+    for (int i = 0; i < count; i++) {
+        int varNo = in.read_int();
+        int val = in.read_int();
+        prevail.push_back(Prevail(variables[varNo], val));
+    }
+    count = in.read_int(); // number of pre_post conditions
+    for (int i = 0; i < count; i++) {
+        int eff_conds = in.read_int();
+        vector<EffCond> ecs;
+        for (int j = 0; j < eff_conds; j++) {
+            int var = in.read_int();
+            int value = in.read_int();
+            ecs.push_back(EffCond(variables[var], value));
+        }
+        int varNo = in.read_int();
+        int val = in.read_int();
+        int newVal = in.read_int();
+        if (eff_conds)
+            pre_post.push_back(PrePost(variables[varNo], ecs, val, newVal));
+        else
+            pre_post.push_back(PrePost(variables[varNo], val, newVal));
+    }
+    cost = in.read_int();
+}
+
 void Operator::dump() const {
     cout << name << ":" << endl;
     cout << "prevail:";
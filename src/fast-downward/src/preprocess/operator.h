@@ -8,6 +8,7 @@
 using namespace std;
 
 class Variable;
+class SASBinaryReader;
 
 class Operator {
 public:
@@ -40,6 +41,7 @@ private:
     int cost;
 public:
     Operator(istream &in, const vector<Variable *> &variables);
+    Operator(SASBinaryReader &in, const vector<Variable *> &variables);
 
     void strip_unimportant_effects();
     bool is_redundant() const;
@@ -0,0 +1,65 @@
+#include "sas_binary.h"
+
+#include <cstdio>
+#include <cstdlib>
+using namespace std;
+
+static const char SAS_BINARY_MAGIC[] = "SASB";
+static const int SAS_BINARY_MAGIC_LENGTH = 4;
+
+int SASBinaryReader::read_int() {
+    unsigned int value = 0;
+    for (int shift = 0;; shift += 7) {
+        int byte = in.get();
+        if (byte == EOF || shift > 28) {
+            cerr << "Unexpected end of binary translator file." << endl;
+            exit(1);
+        }
+        value |= static_cast<unsigned int>(byte & 0x7f) << shift;
+        if (!(byte & 0x80))
+            break;
+    }
+    return static_cast<int>(value >> 1) ^ -static_cast<int>(value & 1);
+}
+
+bool SASBinaryReader::read_bytes(char *bytes, int length) {
+    in.read(bytes, length);
+    return !in.fail();
+}
+
+string SASBinaryReader::read_string() {
+    int length = read_int();
+    string value(length, '\0');
+    if (length > 0 && !read_bytes(&value[0], length)) {
+        cerr << "Unexpected end of binary translator file." << endl;
+        exit(1);
+    }
+    return value;
+}
+
+bool is_binary_sas(istream &in) {
+    return in.peek() == SAS_BINARY_MAGIC[0];
+}
+
+void read_and_verify_binary_header(SASBinaryReader &in, int sas_file_version) {
+    char magic[SAS_BINARY_MAGIC_LENGTH];
+    if (!in.read_bytes(magic, SAS_BINARY_MAGIC_LENGTH) ||
+        string(magic, SAS_BINARY_MAGIC_LENGTH) != SAS_BINARY_MAGIC) {
+        cerr << "Failed to match the binary translator file header." << endl;
+        exit(1);
+    }
+    int binary_version = in.read_int();
+    if (binary_version != SAS_BINARY_VERSION) {
+        cerr << "Expected binary translator file version "
+             << SAS_BINARY_VERSION << ", got " << binary_version << "." << endl;
+        cerr << "Exiting." << endl;
+        exit(1);
+    }
+    int version = in.read_int();
+    if (version != sas_file_version) {
+        cerr << "Expected translator file version " << sas_file_version
+             << ", got " << version << "." << endl;
+        cerr << "Exiting." << endl;
+        exit(1);
+    }
+}
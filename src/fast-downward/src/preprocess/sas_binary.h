@@ -0,0 +1,29 @@
+#ifndef SAS_BINARY_H
+#define SAS_BINARY_H
+
+#include <iostream>
+#include <string>
+using namespace std;
+
+/* Reader for the binary encoding of output.sas written by the translator
+   with --binary-sas. The encoding has the same sections in the same order
+   as the text format, without the magic words: every number is a zigzag
+   varint (7 bits per byte, least significant group first, with the sign
+   in the lowest bit) and every string is its length followed by its
+   bytes. */
+
+static const int SAS_BINARY_VERSION = 2;
+
+class SASBinaryReader {
+    istream &in;
+public:
+    SASBinaryReader(istream &in_) : in(in_) {}
+    int read_int();
+    bool read_bytes(char *bytes, int length);
+    string read_string();
+};
+
+bool is_binary_sas(istream &in);
+void read_and_verify_binary_header(SASBinaryReader &in, int sas_file_version);
+
+#endif
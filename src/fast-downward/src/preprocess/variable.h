@@ -5,6 +5,8 @@
 #include <vector>
 using namespace std;
 
+class SASBinaryReader;
+
 class Variable {
     vector<string> values;
     string name;
@@ -13,6 +15,7 @@ class Variable {
     bool necessary;
 public:
     Variable(istream &in);
+    Variable(SASBinaryReader &in);
     void set_level(int level);
     void set_necessary();
     int get_level() const;
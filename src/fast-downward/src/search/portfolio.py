@@ -6,6 +6,7 @@ import optparse
 import os
 import os.path
 import resource
+import shutil
 import signal
 import subprocess
 import sys
@@ -35,11 +36,16 @@ EXPECTED_EXITCODES = set([
     EXIT_PLAN_FOUND, EXIT_UNSOLVABLE, EXIT_UNSOLVED_INCOMPLETE,
     EXIT_OUT_OF_MEMORY, EXIT_TIMEOUT])
 
+# Search process that reads the task once (see SearchServer), if any.
+_server = None
 
 def parse_args():
     parser = optparse.OptionParser()
     parser.add_option("--plan-file", default="sas_plan",
                       help="Filename for the found plans (default: %default)")
+    parser.add_option("--fork-after-load", action="store_true", default=False,
+                      help="Read the task once and fork the search process "
+                      "for every configuration")
     return parser.parse_args()
 
 def safe_unlink(filename):
@@ -93,20 +99,92 @@ def adapt_search(args, search_cost_type, heuristic_cost_type, plan_file):
     print "next plan number: %d" % (plan_no + 1)
     return curr_plan_file
 
+def _cpu_limits(timeout):
+    # Don't try to raise the hard limit.
+    _, external_hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+    hard_limit = min(int(math.ceil(timeout)) + 1, external_hard_limit)
+    # Soft limit reached --> SIGXCPU.
+    # Hard limit reached --> SIGKILL.
+    return hard_limit - 1, hard_limit
+
+class SearchServer(object):
+    """Search process in portfolio mode ("downward --portfolio"): it reads
+    the task once and forks a child for every configuration, with the given
+    arguments and limits. The children run in the same directory, so plan
+    numbering works as with a fresh process per configuration."""
+
+    def __init__(self, planner, sas_file):
+        read_fd, write_fd = os.pipe()
+
+        def unset_soft_memory_limit():
+            # The "downward" wrapper lowers it for this Python process only.
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            set_limit(resource.RLIMIT_AS, hard, hard)
+
+        self.process = subprocess.Popen([planner, "--portfolio", str(write_fd)],
+                                        stdin=subprocess.PIPE,
+                                        preexec_fn=unset_soft_memory_limit)
+        os.close(write_fd)
+        self.replies = os.fdopen(read_fd)
+        # The children are not our children, so their time is not in
+        # os.times() until the server exits.
+        self.cpu_time = 0.0
+        shutil.copyfileobj(open(sas_file), self.process.stdin)
+        self.process.stdin.flush()
+
+    def run(self, args, plan_file, timeout=None, memory=None):
+        """Returns the exit code of the search, or None if the server is
+        gone."""
+        if timeout is not None:
+            cpu_limits = "%d %d" % _cpu_limits(timeout)
+        else:
+            cpu_limits = "-1 -1"
+        request = ["run", plan_file, cpu_limits,
+                   str(memory) if memory is not None else "-1", str(len(args))]
+        request += [arg.replace("\n", " ") for arg in args]
+        try:
+            self.process.stdin.write("\n".join(request) + "\n")
+            self.process.stdin.flush()
+        except IOError:
+            return None
+        reply = self.replies.readline().split()
+        if not reply:
+            return None
+        self.cpu_time = float(reply[1])
+        return int(reply[0])
+
+    def close(self):
+        try:
+            self.process.stdin.write("quit\n")
+            self.process.stdin.close()
+        except IOError:
+            pass
+        self.process.wait()
+        self.replies.close()
+        self.cpu_time = 0.0
+
 def run_search(planner, args, sas_file, plan_file, timeout=None, memory=None):
+    global _server
     complete_args = [planner] + args + ["--plan-file", plan_file]
     print "args: %s" % complete_args
     print "timeout: %.2f" % timeout
     sys.stdout.flush()
 
+    if _server is not None:
+        returncode = _server.run(args, plan_file, timeout, memory)
+        if returncode is not None:
+            print "returncode:", returncode
+            print
+            return returncode
+        sys.stderr.write("The search server is gone, falling back to a "
+                         "process per configuration.\n")
+        _server.close()
+        _server = None
+
     def set_limits():
         if timeout is not None:
-            # Don't try to raise the hard limit.
-            _, external_hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
-            hard_limit = min(int(math.ceil(timeout)) + 1, external_hard_limit)
-            # Soft limit reached --> SIGXCPU.
-            # Hard limit reached --> SIGKILL.
-            set_limit(resource.RLIMIT_CPU, hard_limit - 1, hard_limit)
+            soft_limit, hard_limit = _cpu_limits(timeout)
+            set_limit(resource.RLIMIT_CPU, soft_limit, hard_limit)
         if memory is not None:
             # Memory in Bytes
             set_limit(resource.RLIMIT_AS, memory, memory)
@@ -121,6 +199,8 @@ def run_search(planner, args, sas_file, plan_file, timeout=None, memory=None):
 
 def determine_timeout(remaining_time_at_start, configs, pos):
     remaining_time = remaining_time_at_start - sum(os.times()[:4])
+    if _server is not None:
+        remaining_time -= _server.cpu_time
     relative_time = configs[pos][0]
     print "remaining time: %s" % remaining_time
     remaining_relative_time = sum(config[0] for config in configs[pos:])
@@ -202,13 +282,21 @@ def run(configs, optimal=True, final_config=None, final_config_builder=None,
 
     print "remaining time at start: %s" % remaining_time_at_start
 
-    if optimal:
-        exitcodes = run_opt(configs, planner, sas_file, plan_file,
-                            remaining_time_at_start, memory)
-    else:
-        exitcodes = run_sat(configs, unitcost, planner, sas_file, plan_file,
-                            final_config, final_config_builder,
-                            remaining_time_at_start, memory)
+    global _server
+    if options.fork_after_load:
+        _server = SearchServer(planner, sas_file)
+    try:
+        if optimal:
+            exitcodes = run_opt(configs, planner, sas_file, plan_file,
+                                remaining_time_at_start, memory)
+        else:
+            exitcodes = run_sat(configs, unitcost, planner, sas_file,
+                                plan_file, final_config, final_config_builder,
+                                remaining_time_at_start, memory)
+    finally:
+        if _server is not None:
+            _server.close()
+            _server = None
     sys.exit(_generate_exitcode(exitcodes))
 
 def _can_change_cost_type(args):
@@ -6,6 +6,7 @@ from __future__ import print_function
 import sys
 import itertools
 
+import hooks
 import pddl
 import timers
 from functools import reduce
@@ -327,6 +328,8 @@ def compute_model(prog):
     print("%d auxiliary atoms" % auxiliary_atoms)
     print("%d final queue length" % len(queue.queue))
     print("%d total queue pushes" % queue.num_pushes)
+    hooks.notify("model_computed", len(rules), relevant_atoms,
+                 auxiliary_atoms, len(queue.queue), queue.num_pushes)
     return queue.queue
 
 if __name__ == "__main__":
@@ -8,28 +8,64 @@ import timers
 DEBUG = False
 
 
-def expand_group(group, task, reachable_facts):
+class ReachableFactIndex(object):
+    """Index of the reachable facts by predicate and by their arguments
+    with one position masked. A group fact with the variable ?X at that
+    position then expands to exactly the reachable facts that match it,
+    instead of trying every object of the task."""
+
+    def __init__(self, reachable_facts, objects):
+        self.by_predicate = {}
+        for fact in reachable_facts:
+            self.by_predicate.setdefault(fact.predicate, []).append(fact)
+        # Position of every object, so that the expanded facts come in
+        # the order of task.objects, as they did when we tried them all.
+        self.object_position = dict(
+            (obj.name, position) for position, obj in enumerate(objects))
+        self.masked = {}
+
+    def _masked_index(self, predicate, pos):
+        key = (predicate, pos)
+        index = self.masked.get(key)
+        if index is None:
+            index = {}
+            object_position = self.object_position
+            for fact in self.by_predicate.get(predicate, ()):
+                args = fact.args
+                if pos < len(args) and args[pos] in object_position:
+                    index.setdefault(args[:pos] + args[pos + 1:], []).append(
+                        (object_position[args[pos]], fact))
+            for masked_key, members in index.items():
+                members.sort()
+                index[masked_key] = [fact for _, fact in members]
+            self.masked[key] = index
+        return index
+
+    def matches(self, fact, pos):
+        """Return the reachable facts obtained by replacing the argument
+        at position pos of fact by an object."""
+        args = fact.args
+        index = self._masked_index(fact.predicate, pos)
+        return index.get(args[:pos] + args[pos + 1:], ())
+
+
+def expand_group(group, task, reachable_facts, index=None):
+    if index is None:
+        index = ReachableFactIndex(reachable_facts, task.objects)
     result = []
     for fact in group:
         try:
-            pos = list(fact.args).index("?X")
+            pos = fact.args.index("?X")
         except ValueError:
             result.append(fact)
         else:
-            # NOTE: This could be optimized by only trying objects of the correct
-            #       type, or by using a unifier which directly generates the
-            #       applicable objects. It is not worth optimizing this at this stage,
-            #       though.
-            for obj in task.objects:
-                newargs = list(fact.args)
-                newargs[pos] = obj.name
-                atom = pddl.Atom(fact.predicate, newargs)
-                if atom in reachable_facts:
-                    result.append(atom)
+            result.extend(index.matches(fact, pos))
     return result
 
 def instantiate_groups(groups, task, reachable_facts):
-    return [expand_group(group, task, reachable_facts) for group in groups]
+    index = ReachableFactIndex(reachable_facts, task.objects)
+    return [expand_group(group, task, reachable_facts, index)
+            for group in groups]
 
 class GroupCoverQueue:
     def __init__(self, groups, partial_encoding):
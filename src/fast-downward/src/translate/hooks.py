@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Statistics hooks of the translator.
+#
+# The feature extractors of the portfolio (see features/translate) need
+# the sizes of the task at several points of the translation. Instead of
+# keeping their own copy of the translator, they register a hook object
+# here, and the translator tells all registered hooks about these events:
+#
+#   task_normalized(task)
+#       after parsing and normalizing the PDDL task.
+#   model_computed(generated_rules, relevant_atoms, auxiliary_atoms,
+#                  final_queue_length, total_queue_pushes)
+#       after computing the relaxed reachable atoms (build_model).
+#   task_pruned(operators_removed, axioms_removed, propositions_removed)
+#       after removing what cannot help to reach the goal (relevance.py),
+#       only with --relevance-analysis.
+#   task_simplified(implied_effects_removed, effect_conditions_simplified,
+#                   implied_preconditions_added)
+#       after translating the task to SAS+ (pddl_to_sas).
+#   task_translated(sas_task)
+#       before writing output.sas.
+#
+# A hook only needs to define the methods of the events it is interested
+# in. Hooks must not modify the objects they are passed: the output of
+# the translator has to be the same with and without them.
+
+_hooks = []
+
+
+def register(hook):
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def unregister(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def notify(event, *args):
+    for hook in list(_hooks):
+        handler = getattr(hook, event, None)
+        if handler is not None:
+            handler(*args)
@@ -34,6 +34,9 @@ def instantiate(task, model):
     relaxed_reachable = False
     fluent_facts = get_fluent_facts(task, model)
     init_facts = set(task.init)
+    # Ground actions and axioms refer to these canonical atoms instead of
+    # creating their own copies (see pddl.Atom.instantiate).
+    canonical_fluent_facts = dict((fact, fact) for fact in fluent_facts)
 
     type_to_objects = get_objects_by_type(task.objects, task.types)
 
@@ -54,14 +57,16 @@ def instantiate(task, model):
             variable_mapping = dict([(par.name, arg)
                                      for par, arg in zip(parameters, atom.args)])
             inst_action = action.instantiate(variable_mapping, init_facts,
-                                             fluent_facts, type_to_objects)
+                                             canonical_fluent_facts,
+                                             type_to_objects)
             if inst_action:
                 instantiated_actions.append(inst_action)
         elif isinstance(atom.predicate, pddl.Axiom):
             axiom = atom.predicate
             variable_mapping = dict([(par.name, arg)
                                      for par, arg in zip(axiom.parameters, atom.args)])
-            inst_axiom = axiom.instantiate(variable_mapping, init_facts, fluent_facts)
+            inst_axiom = axiom.instantiate(variable_mapping, init_facts,
+                                           canonical_fluent_facts)
             if inst_axiom:
                 instantiated_axioms.append(inst_axiom)
         elif atom.predicate == "@goal-reachable":
@@ -124,7 +124,9 @@ class Action(object):
         else:
             return None
 
-class PropositionalAction:
+class PropositionalAction(object):
+    # There is one of these per ground action, so avoid a per-instance dict.
+    __slots__ = ("name", "precondition", "add_effects", "del_effects", "cost")
     def __init__(self, name, precondition, effects, cost):
         self.name = name
         self.precondition = precondition
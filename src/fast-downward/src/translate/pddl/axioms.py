@@ -46,7 +46,9 @@ class Axiom(object):
         effect = conditions.Atom(self.name, effect_args)
         return PropositionalAxiom(name, condition, effect)
 
-class PropositionalAxiom:
+class PropositionalAxiom(object):
+    # There is one of these per ground axiom, so avoid a per-instance dict.
+    __slots__ = ("name", "condition", "effect")
     def __init__(self, name, condition, effect):
         self.name = name
         self.condition = condition
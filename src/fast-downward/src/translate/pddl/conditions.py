@@ -1,5 +1,12 @@
 from __future__ import print_function
 
+try:
+    # Python 3.x
+    from sys import intern
+except ImportError:
+    # Python 2.x: intern is a builtin
+    pass
+
 from . import pddl_types
 
 def parse_condition(alist):
@@ -54,13 +61,26 @@ def parse_literal(alist):
     else:
         return Atom(alist[0], alist[1:])
 
+# Grounding creates the same predicate names and argument tuples over and
+# over again. Literals share them through this table, so that every
+# distinct argument tuple (and the strings in it) is stored only once.
+_interned_args = {}
+
+def intern_args(args):
+    args = tuple([intern(arg) if type(arg) is str else arg for arg in args])
+    return _interned_args.setdefault(args, args)
+
 # Conditions (of any type) are immutable, because they need to
 # be hashed occasionally. Immutability also allows more efficient comparison
 # based on a precomputed hash value.
 #
 # Careful: Most other classes (e.g. Effects, Axioms, Actions) are not!
+#
+# Conditions are created in huge numbers when grounding, so every class in
+# this hierarchy declares __slots__ to avoid a per-instance dict.
 
 class Condition(object):
+    __slots__ = ("parts", "hash")
     def __init__(self, parts):
         self.parts = tuple(parts)
         self.hash = hash((self.__class__, self.parts))
@@ -126,6 +146,7 @@ class Condition(object):
         return False
 
 class ConstantCondition(Condition):
+    __slots__ = ()
     # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
     __hash__ = Condition.__hash__
     parts = ()
@@ -140,12 +161,14 @@ class Impossible(Exception):
     pass
 
 class Falsity(ConstantCondition):
+    __slots__ = ()
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
         raise Impossible()
     def negate(self):
         return Truth()
 
 class Truth(ConstantCondition):
+    __slots__ = ()
     def to_untyped_strips(self):
         return []
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
@@ -154,6 +177,7 @@ class Truth(ConstantCondition):
         return Falsity()
 
 class JunctorCondition(Condition):
+    __slots__ = ()
     # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
     __hash__ = Condition.__hash__
     def __eq__(self, other):
@@ -165,6 +189,7 @@ class JunctorCondition(Condition):
         return self.__class__(parts)
 
 class Conjunction(JunctorCondition):
+    __slots__ = ()
     def _simplified(self, parts):
         result_parts = []
         for part in parts:
@@ -192,6 +217,7 @@ class Conjunction(JunctorCondition):
         return Disjunction([p.negate() for p in self.parts])
 
 class Disjunction(JunctorCondition):
+    __slots__ = ()
     def _simplified(self, parts):
         result_parts = []
         for part in parts:
@@ -212,6 +238,7 @@ class Disjunction(JunctorCondition):
         return True
 
 class QuantifiedCondition(Condition):
+    __slots__ = ("parameters",)
     # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
     __hash__ = Condition.__hash__
     def __init__(self, parameters, parts):
@@ -249,6 +276,7 @@ class QuantifiedCondition(Condition):
         return self.__class__(self.parameters, parts)
 
 class UniversalCondition(QuantifiedCondition):
+    __slots__ = ()
     def _untyped(self, parts):
         type_literals = [NegatedAtom(par.type, [par.name]) for par in self.parameters]
         return UniversalCondition(self.parameters,
@@ -259,6 +287,7 @@ class UniversalCondition(QuantifiedCondition):
         return True
 
 class ExistentialCondition(QuantifiedCondition):
+    __slots__ = ()
     def _untyped(self, parts):
         type_literals = [Atom(par.type, [par.name]) for par in self.parameters]
         return ExistentialCondition(self.parameters,
@@ -272,12 +301,15 @@ class ExistentialCondition(QuantifiedCondition):
         return True
 
 class Literal(Condition):
+    __slots__ = ("predicate", "args")
     # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
     __hash__ = Condition.__hash__
     parts = []
     def __init__(self, predicate, args):
+        if type(predicate) is str:
+            predicate = intern(predicate)
         self.predicate = predicate
-        self.args = tuple(args)
+        self.args = intern_args(args)
         self.hash = hash((self.__class__, self.predicate, self.args))
     def __eq__(self, other):
         # Compare hash first for speed reasons.
@@ -316,14 +348,17 @@ class Literal(Condition):
         return set(arg for arg in self.args if arg[0] == "?")
 
 class Atom(Literal):
+    __slots__ = ()
     negated = False
     def to_untyped_strips(self):
         return [self]
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        # fluent_facts maps each fluent atom to its canonical instance,
+        # which is shared by all ground actions and axioms using it.
         args = [var_mapping.get(arg, arg) for arg in self.args]
         atom = Atom(self.predicate, args)
         if atom in fluent_facts:
-            result.append(atom)
+            result.append(fluent_facts[atom])
         elif atom not in init_facts:
             raise Impossible()
     def negate(self):
@@ -332,6 +367,7 @@ class Atom(Literal):
         return self
 
 class NegatedAtom(Literal):
+    __slots__ = ()
     negated = True
     def _relaxed(self, parts):
         return Truth()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pddl
+
+# Backward relevance analysis of the grounded task.
+#
+# instantiate.explore grounds everything that is relaxed reachable from
+# the initial state, whether or not it can help to reach the goal. Here
+# we compute the atoms that are relevant for the goal:
+#
+#   - the atoms of the goal are relevant;
+#   - an action is relevant if one of its effects changes a relevant
+#     atom, and then the atoms of its precondition and of the conditions
+#     of these effects are relevant;
+#   - an axiom is relevant if it derives a relevant atom, and then the
+#     atoms of its condition are relevant.
+#
+# Negative literals count as their atom. Irrelevant actions and axioms
+# are dropped, and so are the effects of the relevant actions on
+# irrelevant atoms and the irrelevant atoms themselves.
+#
+# Plans of the pruned task are plans of the original task: the kept
+# actions keep their whole precondition and all their effects on
+# relevant atoms, and the removed effects change atoms that neither the
+# goal nor any kept precondition, effect condition or axiom reads.
+
+
+def _atom(literal):
+    if literal.negated:
+        return pddl.Atom(literal.predicate, literal.args)
+    return literal
+
+
+def _effects(action):
+    for conditions, atom in action.add_effects:
+        yield conditions, atom
+    for conditions, atom in action.del_effects:
+        yield conditions, atom
+
+
+def compute_relevant_atoms(goal_list, actions, axioms):
+    achievers = {}
+    for action in actions:
+        for conditions, atom in _effects(action):
+            achievers.setdefault(atom, []).append((action, conditions))
+    for axiom in axioms:
+        achievers.setdefault(_atom(axiom.effect), []).append(
+            (axiom, axiom.condition))
+
+    relevant = set()
+    queue = []
+
+    def add(literals):
+        for literal in literals:
+            atom = _atom(literal)
+            if atom not in relevant:
+                relevant.add(atom)
+                queue.append(atom)
+
+    expanded = set()
+    add(goal_list)
+    while queue:
+        atom = queue.pop()
+        for operator, conditions in achievers.get(atom, ()):
+            add(conditions)
+            if id(operator) not in expanded:
+                expanded.add(id(operator))
+                if isinstance(operator, pddl.PropositionalAction):
+                    add(operator.precondition)
+    return relevant
+
+
+def prune(goal_list, atoms, actions, axioms):
+    """Remove the irrelevant actions, axioms and atoms, in place.
+    Return the number of actions, axioms and atoms removed."""
+    relevant = compute_relevant_atoms(goal_list, actions, axioms)
+
+    def is_relevant(effect):
+        return effect[1] in relevant
+
+    kept_actions = []
+    for action in actions:
+        action.add_effects = [eff for eff in action.add_effects
+                              if is_relevant(eff)]
+        action.del_effects = [eff for eff in action.del_effects
+                              if is_relevant(eff)]
+        if action.add_effects or action.del_effects:
+            kept_actions.append(action)
+    kept_axioms = [axiom for axiom in axioms
+                   if _atom(axiom.effect) in relevant]
+    irrelevant_atoms = [atom for atom in atoms if atom not in relevant]
+
+    removed = (len(actions) - len(kept_actions),
+               len(axioms) - len(kept_axioms), len(irrelevant_atoms))
+    actions[:] = kept_actions
+    axioms[:] = kept_axioms
+    atoms.difference_update(irrelevant_atoms)
+    return removed
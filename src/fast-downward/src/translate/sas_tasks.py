@@ -2,6 +2,66 @@ from __future__ import print_function
 
 SAS_FILE_VERSION = 3
 
+## The binary encoding stores the same sections as the text format, in
+## the same order, but without the begin_/end_ magic words: every number
+## is a zigzag varint (7 bits per byte, least significant group first,
+## with the sign folded into the lowest bit so that -1 takes one byte)
+## and every string is its length followed by its UTF-8 bytes. The header
+## starts with a magic word that cannot begin a text file, so readers can
+## tell both formats apart by peeking at the first byte.
+SAS_BINARY_MAGIC = b"SASB"
+SAS_BINARY_VERSION = 2
+
+## Number of operators whose lines are joined before each write.
+OUTPUT_CHUNK_SIZE = 10000
+
+## Number of bytes of binary output buffered before each write.
+BINARY_BUFFER_SIZE = 1 << 16
+
+
+def write_lines(stream, lines):
+    if lines:
+        stream.write("\n".join(lines))
+        stream.write("\n")
+
+
+class SASBinaryWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = bytearray()
+    def write_header(self):
+        self.buffer.extend(SAS_BINARY_MAGIC)
+        self.write_int(SAS_BINARY_VERSION)
+        self.write_int(SAS_FILE_VERSION)
+    def write_int(self, value):
+        buffer = self.buffer
+        if value < 0:
+            value = (-value << 1) - 1
+        else:
+            value <<= 1
+        while value >= 0x80:
+            buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buffer.append(value)
+    def write_ints(self, values):
+        for value in values:
+            self.write_int(value)
+    def write_pairs(self, pairs):
+        self.write_int(len(pairs))
+        for var, val in pairs:
+            self.write_int(var)
+            self.write_int(val)
+    def write_string(self, value):
+        data = value.encode("utf-8")
+        self.write_int(len(data))
+        self.buffer.extend(data)
+        if len(self.buffer) >= BINARY_BUFFER_SIZE:
+            self.flush()
+    def flush(self):
+        if self.buffer:
+            self.stream.write(bytes(self.buffer))
+            del self.buffer[:]
+
 
 class SASTask:
     def __init__(self, variables, mutexes, init, goal,
@@ -14,24 +74,42 @@ class SASTask:
         self.axioms = sorted(axioms, key=lambda axiom: (axiom.condition, axiom.effect))
         self.metric = metric
     def output(self, stream):
-        print("begin_version", file=stream)
-        print(SAS_FILE_VERSION, file=stream)
-        print("end_version", file=stream)
-        print("begin_metric", file=stream)
-        print(int(self.metric), file=stream)
-        print("end_metric", file=stream)
-        self.variables.output(stream)
-        print(len(self.mutexes), file=stream)
+        lines = ["begin_version", str(SAS_FILE_VERSION), "end_version",
+                 "begin_metric", str(int(self.metric)), "end_metric"]
+        self.variables.output_lines(lines)
+        lines.append(str(len(self.mutexes)))
+        for mutex in self.mutexes:
+            mutex.output_lines(lines)
+        self.init.output_lines(lines)
+        self.goal.output_lines(lines)
+        lines.append(str(len(self.operators)))
+        write_lines(stream, lines)
+        for start in range(0, len(self.operators), OUTPUT_CHUNK_SIZE):
+            lines = []
+            for op in self.operators[start:start + OUTPUT_CHUNK_SIZE]:
+                op.output_lines(lines)
+            write_lines(stream, lines)
+        lines = [str(len(self.axioms))]
+        for axiom in self.axioms:
+            axiom.output_lines(lines)
+        write_lines(stream, lines)
+    def output_binary(self, stream):
+        writer = SASBinaryWriter(stream)
+        writer.write_header()
+        writer.write_int(int(self.metric))
+        self.variables.output_binary(writer)
+        writer.write_int(len(self.mutexes))
         for mutex in self.mutexes:
-            mutex.output(stream)
-        self.init.output(stream)
-        self.goal.output(stream)
-        print(len(self.operators), file=stream)
+            mutex.output_binary(writer)
+        self.init.output_binary(writer)
+        self.goal.output_binary(writer)
+        writer.write_int(len(self.operators))
         for op in self.operators:
-            op.output(stream)
-        print(len(self.axioms), file=stream)
+            op.output_binary(writer)
+        writer.write_int(len(self.axioms))
         for axiom in self.axioms:
-            axiom.output(stream)
+            axiom.output_binary(writer)
+        writer.flush()
     def get_encoding_size(self):
         task_size = 0
         task_size += self.variables.get_encoding_size()
@@ -57,17 +135,30 @@ class SASVariables:
                 axiom_str = ""
             print("v%d in {%s}%s" % (var, list(range(rang)), axiom_str))
     def output(self, stream):
-        print(len(self.ranges), file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append(str(len(self.ranges)))
         for var, (rang, axiom_layer, values) in enumerate(zip(
                 self.ranges, self.axiom_layers, self.value_names)):
-            print("begin_variable", file=stream)
-            print("var%d" % var, file=stream)
-            print(axiom_layer, file=stream)
-            print(rang, file=stream)
             assert rang == len(values), (rang, values)
+            lines.append("begin_variable")
+            lines.append("var%d" % var)
+            lines.append(str(axiom_layer))
+            lines.append(str(rang))
+            lines.extend(str(value) for value in values)
+            lines.append("end_variable")
+    def output_binary(self, writer):
+        writer.write_int(len(self.ranges))
+        for var, (rang, axiom_layer, values) in enumerate(zip(
+                self.ranges, self.axiom_layers, self.value_names)):
+            assert rang == len(values), (rang, values)
+            writer.write_string("var%d" % var)
+            writer.write_int(axiom_layer)
+            writer.write_int(rang)
             for value in values:
-                print(value, file=stream)
-            print("end_variable", file=stream)
+                writer.write_string(str(value))
     def get_encoding_size(self):
         # A variable with range k has encoding size k + 1 to also give the
         # variable itself some weight.
@@ -80,11 +171,16 @@ class SASMutexGroup:
         for var, val in self.facts:
             print("v%d: %d" % (var, val))
     def output(self, stream):
-        print("begin_mutex_group", file=stream)
-        print(len(self.facts), file=stream)
-        for var, val in self.facts:
-            print(var, val, file=stream)
-        print("end_mutex_group", file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append("begin_mutex_group")
+        lines.append(str(len(self.facts)))
+        lines.extend("%d %d" % (var, val) for var, val in self.facts)
+        lines.append("end_mutex_group")
+    def output_binary(self, writer):
+        writer.write_pairs(self.facts)
     def get_encoding_size(self):
         return len(self.facts)
 
@@ -96,10 +192,15 @@ class SASInit:
             if val != -1:
                 print("v%d: %d" % (var, val))
     def output(self, stream):
-        print("begin_state", file=stream)
-        for val in self.values:
-            print(val, file=stream)
-        print("end_state", file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append("begin_state")
+        lines.extend(str(val) for val in self.values)
+        lines.append("end_state")
+    def output_binary(self, writer):
+        writer.write_ints(self.values)
 
 class SASGoal:
     def __init__(self, pairs):
@@ -108,11 +209,16 @@ class SASGoal:
         for var, val in self.pairs:
             print("v%d: %d" % (var, val))
     def output(self, stream):
-        print("begin_goal", file=stream)
-        print(len(self.pairs), file=stream)
-        for var, val in self.pairs:
-            print(var, val, file=stream)
-        print("end_goal", file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append("begin_goal")
+        lines.append(str(len(self.pairs)))
+        lines.extend("%d %d" % (var, val) for var, val in self.pairs)
+        lines.append("end_goal")
+    def output_binary(self, writer):
+        writer.write_pairs(self.pairs)
     def get_encoding_size(self):
         return len(self.pairs)
 
@@ -135,19 +241,31 @@ class SASOperator:
                 cond_str = ""
             print("  v%d: %d -> %d%s" % (var, pre, post, cond_str))
     def output(self, stream):
-        print("begin_operator", file=stream)
-        print(self.name[1:-1], file=stream)
-        print(len(self.prevail), file=stream)
-        for var, val in self.prevail:
-            print(var, val, file=stream)
-        print(len(self.pre_post), file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append("begin_operator")
+        lines.append(self.name[1:-1])
+        lines.append(str(len(self.prevail)))
+        lines.extend("%d %d" % (var, val) for var, val in self.prevail)
+        lines.append(str(len(self.pre_post)))
         for var, pre, post, cond in self.pre_post:
-            print(len(cond), end=' ', file=stream)
+            parts = [str(len(cond))]
             for cvar, cval in cond:
-                print(cvar, cval, end=' ', file=stream)
-            print(var, pre, post, file=stream)
-        print(self.cost, file=stream)
-        print("end_operator", file=stream)
+                parts.append("%d %d" % (cvar, cval))
+            parts.append("%d %d %d" % (var, pre, post))
+            lines.append(" ".join(parts))
+        lines.append(str(self.cost))
+        lines.append("end_operator")
+    def output_binary(self, writer):
+        writer.write_string(self.name[1:-1])
+        writer.write_pairs(self.prevail)
+        writer.write_int(len(self.pre_post))
+        for var, pre, post, cond in self.pre_post:
+            writer.write_pairs(cond)
+            writer.write_ints((var, pre, post))
+        writer.write_int(self.cost)
     def get_encoding_size(self):
         size = 1 + len(self.prevail)
         for var, pre, post, cond in self.pre_post:
@@ -172,12 +290,19 @@ class SASAxiom:
         var, val = self.effect
         print("  v%d: %d" % (var, val))
     def output(self, stream):
-        print("begin_rule", file=stream)
-        print(len(self.condition), file=stream)
-        for var, val in self.condition:
-            print(var, val, file=stream)
+        lines = []
+        self.output_lines(lines)
+        write_lines(stream, lines)
+    def output_lines(self, lines):
+        lines.append("begin_rule")
+        lines.append(str(len(self.condition)))
+        lines.extend("%d %d" % (var, val) for var, val in self.condition)
+        var, val = self.effect
+        lines.append("%d %d %d" % (var, 1 - val, val))
+        lines.append("end_rule")
+    def output_binary(self, writer):
+        writer.write_pairs(self.condition)
         var, val = self.effect
-        print(var, 1 - val, val, file=stream)
-        print("end_rule", file=stream)
+        writer.write_ints((var, 1 - val, val))
     def get_encoding_size(self):
         return 1 + len(self.condition)
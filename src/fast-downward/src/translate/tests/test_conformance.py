@@ -0,0 +1,102 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from hashlib import sha1
+
+# The portfolio used to carry its own copy of the translator for the
+# feature extractors and for every learner planner. They all use this one
+# now, and must still write the very same files as these copies did.
+
+TRANSLATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.normpath(os.path.join(TRANSLATE_DIR, "..", "..", ".."))
+REFERENCE = os.path.join(TRANSLATE_DIR, "tests", "conformance.txt")
+
+CONSUMERS = [
+    ("fast-downward/src/translate/translate.py", False),
+    ("features/translate/translate.py", True),
+    ("features/translate/translate_client.py", True),
+    ("learner/features/translate/translate.py", True),
+    ]
+
+LEARNER_PLANNERS = ["fd-autotune-1", "fd-autotune-2", "fdss-1", "fdss-2",
+                    "lama-2011"]
+
+
+def get_tasks():
+    tasks = {}
+    for name in ["issue7", "issue34", "issue49-orig", "issue49-truegoal",
+                 "issue49-falsegoal", "issue58", "issue73"]:
+        tasks[name] = [os.path.join(TRANSLATE_DIR, "regression-tests",
+                                    "%s-%s.pddl" % (name, kind))
+                       for kind in ("domain", "problem")]
+    for name in ["small", "medium"]:
+        tasks[name] = [os.path.join(SRC_DIR, "launcher", "benchmarks", name,
+                                    "%s.pddl" % kind)
+                       for kind in ("domain", "problem")]
+    return tasks
+
+
+def read_reference():
+    reference = {}
+    for line in open(REFERENCE):
+        if line.strip() and not line.startswith("#"):
+            task, filename, digest = line.split()
+            reference[task, filename] = digest
+    return reference
+
+
+def translate(script, domain, problem):
+    workdir = tempfile.mkdtemp(prefix="translate-conformance-")
+    env = dict(os.environ)
+    # translate_client.py has to translate the task itself.
+    env["TRANSLATE_SERVER_SOCKET"] = os.path.join(workdir, "no-server")
+    try:
+        with open(os.devnull, "w") as devnull:
+            code = subprocess.call(
+                [sys.executable, os.path.join(SRC_DIR, script),
+                 domain, problem],
+                cwd=workdir, env=env, stdout=devnull, stderr=devnull)
+        digests = {}
+        for filename in ["output.sas", "translateFile", "translateFileSimply"]:
+            path = os.path.join(workdir, filename)
+            if os.path.exists(path):
+                digests[filename] = sha1(open(path, "rb").read()).hexdigest()
+        return code, digests
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_conformance():
+    reference = read_reference()
+    for task, (domain, problem) in sorted(get_tasks().items()):
+        expected = dict((filename, digest)
+                        for (name, filename), digest in reference.items()
+                        if name == task)
+        for script, writes_features in CONSUMERS:
+            code, digests = translate(script, domain, problem)
+            if not writes_features:
+                expected_here = dict(
+                    (filename, digest) for filename, digest in expected.items()
+                    if filename == "output.sas")
+            else:
+                expected_here = expected
+            assert (code == 0) == bool(expected_here), (script, task, code)
+            assert digests == expected_here, (script, task)
+
+
+def test_learner_planners_use_shared_translator():
+    shared = os.path.join(TRANSLATE_DIR, "translate.py")
+    for planner in LEARNER_PLANNERS:
+        for plan in ["plan", os.path.join("src", "plan")]:
+            path = os.path.join(SRC_DIR, "learner", planner, plan)
+            # invokeplanner.py runs a copy of the planner elsewhere, and
+            # passes it the shared translator in $FD_TRANSLATE.
+            match = re.search(
+                r'^TRANSLATE="\$\{FD_TRANSLATE:-\$BASEDIR/([^"}]*)\}"',
+                open(path).read(), re.MULTILINE)
+            assert match, path
+            translator = os.path.join(os.path.dirname(path), match.group(1))
+            assert os.path.samefile(translator, shared), path
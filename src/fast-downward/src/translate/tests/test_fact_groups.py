@@ -0,0 +1,52 @@
+import fact_groups
+import pddl
+
+
+class Task(object):
+    def __init__(self, objects):
+        self.objects = [pddl.TypedObject(name, "object") for name in objects]
+
+
+def expand_group_by_objects(group, task, reachable_facts):
+    result = []
+    for fact in group:
+        try:
+            pos = list(fact.args).index("?X")
+        except ValueError:
+            result.append(fact)
+        else:
+            for obj in task.objects:
+                atom = pddl.Atom(fact.predicate, fact.args[:pos] +
+                                 (obj.name,) + fact.args[pos + 1:])
+                if atom in reachable_facts:
+                    result.append(atom)
+    return result
+
+
+def test_expand_group():
+    task = Task(["truck1", "truck2", "pkg1", "pkg2", "a", "b", "c"])
+    reachable_facts = set([
+        pddl.Atom("at", ["pkg1", "a"]), pddl.Atom("at", ["pkg1", "b"]),
+        pddl.Atom("at", ["pkg2", "c"]), pddl.Atom("in", ["pkg1", "truck2"]),
+        pddl.Atom("in", ["pkg1", "truck1"]), pddl.Atom("in", ["pkg2", "truck1"]),
+        pddl.Atom("at", ["truck1", "c"]), pddl.Atom("empty", []),
+        # not an object of the task
+        pddl.Atom("at", ["pkg1", "d"])])
+    groups = [
+        [pddl.Atom("at", ["pkg1", "?X"]), pddl.Atom("in", ["pkg1", "?X"])],
+        [pddl.Atom("at", ["pkg2", "?X"]), pddl.Atom("in", ["pkg2", "?X"])],
+        [pddl.Atom("at", ["?X", "c"]), pddl.Atom("empty", [])],
+        [pddl.Atom("at", ["?X", "?X"])],
+        [pddl.Atom("on", ["?X"])],
+        ]
+    expanded = fact_groups.instantiate_groups(groups, task, reachable_facts)
+    assert expanded == [expand_group_by_objects(group, task, reachable_facts)
+                        for group in groups]
+    assert expanded[0] == [
+        pddl.Atom("at", ["pkg1", "a"]), pddl.Atom("at", ["pkg1", "b"]),
+        pddl.Atom("in", ["pkg1", "truck1"]), pddl.Atom("in", ["pkg1", "truck2"])]
+    assert expanded[2] == [
+        pddl.Atom("at", ["truck1", "c"]), pddl.Atom("at", ["pkg2", "c"]),
+        pddl.Atom("empty", [])]
+    assert expanded[3] == []
+    assert expanded[4] == []
@@ -0,0 +1,64 @@
+import pddl
+import relevance
+
+
+def atom(predicate, *args):
+    return pddl.Atom(predicate, list(args))
+
+
+def action(name, precondition, add_effects, del_effects=()):
+    effects = [([], eff) for eff in add_effects]
+    effects += [([], eff.negate()) for eff in del_effects]
+    return pddl.PropositionalAction(name, precondition, effects, 1)
+
+
+def make_task():
+    at_a, at_b = atom("at", "truck", "a"), atom("at", "truck", "b")
+    pkg_a, pkg_b = atom("at", "pkg", "a"), atom("at", "pkg", "b")
+    pkg_in = atom("in", "pkg", "truck")
+    dirty, clean = atom("dirty", "truck"), atom("clean", "truck")
+    actions = [
+        # moving makes the truck dirty, which the goal does not care about
+        action("drive a b", [at_a], [at_b, dirty], [at_a]),
+        action("drive b a", [at_b], [at_a, dirty], [at_b]),
+        action("load a", [at_a, pkg_a], [pkg_in], [pkg_a]),
+        action("unload b", [at_b, pkg_in], [pkg_b], [pkg_in]),
+        action("wash", [dirty], [clean], [dirty]),
+        ]
+    atoms = set([at_a, at_b, pkg_a, pkg_b, pkg_in, dirty, clean])
+    return [pkg_b], atoms, actions
+
+
+def test_prune():
+    goal_list, atoms, actions = make_task()
+    axioms = []
+    removed = relevance.prune(goal_list, atoms, actions, axioms)
+    assert removed == (1, 0, 2)
+    assert [action.name for action in actions] == [
+        "drive a b", "drive b a", "load a", "unload b"]
+    assert atoms == set([atom("at", "truck", "a"), atom("at", "truck", "b"),
+                         atom("at", "pkg", "a"), atom("at", "pkg", "b"),
+                         atom("in", "pkg", "truck")])
+    # the kept actions lose their irrelevant effects only
+    assert [eff for _, eff in actions[0].add_effects] == [
+        atom("at", "truck", "b")]
+    assert [eff for _, eff in actions[0].del_effects] == [
+        atom("at", "truck", "a")]
+
+
+def test_prune_keeps_conditions_and_axioms():
+    goal_list, atoms, actions = make_task()
+    # a goal that needs the truck to be washed, through an axiom
+    ready = atom("ready", "truck")
+    goal_list = [ready.negate()]
+    axioms = [pddl.PropositionalAxiom("ready", [atom("clean", "truck")],
+                                      ready),
+              pddl.PropositionalAxiom("other", [atom("at", "pkg", "a")],
+                                      atom("other"))]
+    atoms.update([ready, atom("other")])
+    removed = relevance.prune(goal_list, atoms, actions, axioms)
+    assert [axiom.name for axiom in axioms] == ["ready"]
+    # wash needs dirty, which the drive actions make true
+    assert [action.name for action in actions] == [
+        "drive a b", "drive b a", "wash"]
+    assert removed == (2, 1, 4)
@@ -3,10 +3,34 @@ from __future__ import print_function
 # -*- coding: utf-8 -*-
 
 import contextlib
+import json
 import os
 import sys
 import time
 
+import tools
+
+
+# Every phase timed with timing() is also recorded here, in the order in
+# which the phases started, as a dictionary with its name, its nesting
+# depth (0 for the phases of translate.main), its wall-clock and CPU time
+# in seconds and the change of its resident memory in KB ("rss_delta",
+# None if it cannot be determined). See write_profile.
+profile = []
+_depth = [0]
+
+
+def reset_profile():
+    del profile[:]
+    _depth[0] = 0
+
+
+def _resident_memory():
+    try:
+        return tools.get_resident_memory_in_kb()
+    except Warning:
+        return None
+
 
 class Timer(object):
     def __init__(self):
@@ -17,23 +41,54 @@ class Timer(object):
         times = os.times()
         return times[0] + times[1]
 
+    def elapsed_time(self):
+        return time.time() - self.start_time
+
+    def elapsed_clock(self):
+        return self._clock() - self.start_clock
+
     def __str__(self):
         return "[%.3fs CPU, %.3fs wall-clock]" % (
-            self._clock() - self.start_clock,
-            time.time() - self.start_time)
+            self.elapsed_clock(), self.elapsed_time())
 
 
 @contextlib.contextmanager
 def timing(text, block=False):
+    phase = {"phase": text, "depth": _depth[0]}
+    profile.append(phase)
+    _depth[0] += 1
+    memory = _resident_memory()
     timer = Timer()
     if block:
         print("%s..." % text)
     else:
         print("%s..." % text, end=' ')
     sys.stdout.flush()
-    yield
+    try:
+        yield
+    finally:
+        _depth[0] -= 1
+    phase["wall"] = round(timer.elapsed_time(), 6)
+    phase["cpu"] = round(timer.elapsed_clock(), 6)
+    if memory is not None:
+        phase["rss_delta"] = _resident_memory() - memory
+    else:
+        phase["rss_delta"] = None
     if block:
         print("%s: %s" % (text, timer))
     else:
         print(timer)
     sys.stdout.flush()
+
+
+def write_profile(filename, **info):
+    """Write the phases timed so far to filename as a JSON object with
+    the given info (e.g. the names of the domain and task) and the list
+    of phases under "phases". One file is written per translation, so
+    that the profiles of many runs can be aggregated later on (see
+    features/translate/profile_report.py)."""
+    result = dict(info)
+    result["phases"] = [phase for phase in profile if "wall" in phase]
+    with open(filename, "w") as profile_file:
+        json.dump(result, profile_file, sort_keys=True)
+        profile_file.write("\n")
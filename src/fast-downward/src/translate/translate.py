@@ -9,10 +9,12 @@ from itertools import product
 
 import axiom_rules
 import fact_groups
+import hooks
 import instantiate
 import normalize
 import optparse
 import pddl
+import relevance
 import sas_tasks
 import simplify
 import sys
@@ -479,7 +481,7 @@ def unsolvable_sas_task(msg):
                              operators, axioms, metric)
 
 
-def pddl_to_sas(task):
+def pddl_to_sas(task, relevance_analysis=False):
     with timers.timing("Instantiating", block=True):
         (relaxed_reachable, atoms, actions, axioms,
          reachable_action_params) = instantiate.explore(task)
@@ -495,6 +497,16 @@ def pddl_to_sas(task):
     for item in goal_list:
         assert isinstance(item, pddl.Literal)
 
+    if relevance_analysis:
+        with timers.timing("Removing irrelevant operators", block=True):
+            operators_removed, axioms_removed, atoms_removed = (
+                relevance.prune(goal_list, atoms, actions, axioms))
+        print("%d irrelevant operators removed" % operators_removed)
+        print("%d irrelevant axioms removed" % axioms_removed)
+        print("%d irrelevant propositions removed" % atoms_removed)
+        hooks.notify("task_pruned", operators_removed, axioms_removed,
+                     atoms_removed)
+
     with timers.timing("Computing fact groups", block=True):
         groups, mutex_groups, translation_key = fact_groups.compute_groups(
             task, atoms, reachable_action_params,
@@ -530,6 +542,9 @@ def pddl_to_sas(task):
           simplified_effect_condition_counter)
     print("%d implied preconditions added" %
           added_implied_precondition_counter)
+    hooks.notify("task_simplified", removed_implied_effect_counter,
+                 simplified_effect_condition_counter,
+                 added_implied_precondition_counter)
 
     if DETECT_UNREACHABLE:
         with timers.timing("Detecting unreachable propositions", block=True):
@@ -620,6 +635,18 @@ def dump_statistics(sas_task):
         print("Translator peak memory: %d KB" % peak_memory)
 
 
+def write_profile(filename, task, timer):
+    try:
+        peak_memory = tools.get_peak_memory_in_kb()
+    except Warning:
+        peak_memory = None
+    timers.write_profile(filename, domain=task.domain_name,
+                         task=task.task_name,
+                         wall=round(timer.elapsed_time(), 6),
+                         cpu=round(timer.elapsed_clock(), 6),
+                         peak_memory=peak_memory)
+
+
 def check_python_version(force_old_python):
     if sys.version_info[:2] == (2, 6):
         if force_old_python:
@@ -642,6 +669,16 @@ def parse_options():
     optparser.add_option(
         "--force-old-python", action="store_true",
         help="Allow running the translator with slow Python 2.6")
+    optparser.add_option(
+        "--binary-sas", action="store_true",
+        help="Write output.sas in the compact binary encoding")
+    optparser.add_option(
+        "--profile", metavar="FILE",
+        help="Write the time and memory used by each phase to FILE (JSON)")
+    optparser.add_option(
+        "--relevance-analysis", action="store_true",
+        help="Remove the operators, axioms and propositions that cannot "
+        "help to reach the goal before translating the task")
     options, args = optparser.parse_args()
     # Remove the parsed options from sys.argv
     sys.argv = [sys.argv[0]] + args
@@ -653,12 +690,14 @@ def main():
 
     check_python_version(options.force_old_python)
 
+    timers.reset_profile()
     timer = timers.Timer()
     with timers.timing("Parsing", True):
         task = pddl.open()
 
     with timers.timing("Normalizing task"):
         normalize.normalize(task)
+    hooks.notify("task_normalized", task)
 
     if options.generate_relaxed_task:
         # Remove delete effects.
@@ -667,14 +706,22 @@ def main():
                 if effect.literal.negated:
                     del action.effects[index]
 
-    sas_task = pddl_to_sas(task)
+    sas_task = pddl_to_sas(task, options.relevance_analysis)
+    hooks.notify("task_translated", sas_task)
     dump_statistics(sas_task)
 
     with timers.timing("Writing output"):
-        with open("output.sas", "w") as output_file:
-            sas_task.output(output_file)
+        if options.binary_sas:
+            with open("output.sas", "wb") as output_file:
+                sas_task.output_binary(output_file)
+        else:
+            with open("output.sas", "w") as output_file:
+                sas_task.output(output_file)
     print("Done! %s" % timer)
 
+    if options.profile:
+        write_profile(options.profile, task, timer)
+
 
 if __name__ == "__main__":
     main()
@@ -15,7 +15,8 @@ using namespace std;
 // construction and destruction
 AdditiveHeuristic::AdditiveHeuristic(const Options &opts)
     : RelaxationHeuristic(opts),
-      did_write_overflow_warning(false) {
+      did_write_overflow_warning(false),
+      additive_value(DEAD_END) {
 }
 
 AdditiveHeuristic::~AdditiveHeuristic() {
@@ -127,10 +128,13 @@ int AdditiveHeuristic::compute_add_and_ff(const State &state) {
     int total_cost = 0;
     for (int i = 0; i < goal_propositions.size(); i++) {
         int prop_cost = goal_propositions[i]->cost;
-        if (prop_cost == -1)
+        if (prop_cost == -1) {
+            additive_value = DEAD_END;
             return DEAD_END;
+        }
         increase_cost(total_cost, prop_cost);
     }
+    additive_value = total_cost;
     return total_cost;
 }
 
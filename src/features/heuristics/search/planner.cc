@@ -11,21 +11,17 @@
 
 #include <fstream>
 #include <string>
+#include <vector>
+#include <cstdio>
+#include <cstdlib>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <unistd.h>
 using namespace std;
 
 
-
-int main(int argc, const char **argv) {
-    register_event_handlers();
-
-    if (argc < 2) {
-        cout << OptionParser::usage(argv[0]) << endl;
-        exit(1);
-    }
-
-    if (string(argv[1]).compare("--help") != 0)
-        read_everything(cin);
-
+static int search(int argc, const char **argv) {
     SearchEngine *engine = 0;
 
     //the input will be parsed twice:
@@ -56,3 +52,118 @@ test_results.close();
 
     return engine->found_solution() ? 0 : 1;
 }
+
+static void set_limit(int resource, long soft, long hard) {
+    if (hard < 0)
+        return;
+    struct rlimit limit;
+    limit.rlim_cur = soft;
+    limit.rlim_max = hard;
+    if (setrlimit(resource, &limit) != 0)
+        cerr << "Limit for " << resource << " could not be set to ("
+             << soft << ", " << hard << ")" << endl;
+}
+
+static double used_cpu_time() {
+    struct rusage self, children;
+    getrusage(RUSAGE_SELF, &self);
+    getrusage(RUSAGE_CHILDREN, &children);
+    return self.ru_utime.tv_sec + self.ru_stime.tv_sec +
+           children.ru_utime.tv_sec + children.ru_stime.tv_sec +
+           (self.ru_utime.tv_usec + self.ru_stime.tv_usec +
+            children.ru_utime.tv_usec + children.ru_stime.tv_usec) / 1e6;
+}
+
+/*
+  Portfolio mode (see portfolio.py): the task has been read once, and every
+  configuration is searched in a forked child, so that it does not have to
+  read the task again. The requests follow the task on stdin:
+
+    run
+    <plan file>
+    <soft and hard CPU time limits in seconds, or -1 -1>
+    <memory limit in bytes, or -1>
+    <number of arguments>
+    <one argument per line>
+
+  until "quit" or the end of the input. For every request, the exit code of
+  the child (minus the signal if it was killed) and the CPU time used so far
+  by this process and its children are written to reply_fd on one line.
+*/
+static void serve_portfolio(const char *program, int reply_fd) {
+    FILE *replies = fdopen(reply_fd, "w");
+    if (!replies) {
+        cerr << "cannot write the replies to fd " << reply_fd << endl;
+        exit(1);
+    }
+    string line;
+    while (getline(cin, line)) {
+        if (line.empty())
+            continue;
+        if (line == "quit")
+            break;
+        if (line != "run") {
+            cerr << "unknown portfolio request " << line << endl;
+            exit(1);
+        }
+        string plan_file;
+        long cpu_soft, cpu_hard, memory;
+        int num_args;
+        getline(cin, plan_file);
+        cin >> cpu_soft >> cpu_hard >> memory >> num_args;
+        getline(cin, line);
+        vector<string> args(num_args);
+        for (int i = 0; i < num_args; ++i)
+            getline(cin, args[i]);
+        if (!cin) {
+            cerr << "truncated portfolio request" << endl;
+            exit(1);
+        }
+
+        // Otherwise the child would print our buffered output again.
+        cout.flush();
+        pid_t pid = fork();
+        if (pid == 0) {
+            set_limit(RLIMIT_CPU, cpu_soft, cpu_hard);
+            set_limit(RLIMIT_AS, memory, memory);
+            vector<const char *> argv;
+            argv.push_back(program);
+            for (int i = 0; i < num_args; ++i)
+                argv.push_back(args[i].c_str());
+            argv.push_back("--plan-file");
+            argv.push_back(plan_file.c_str());
+            exit(search(argv.size(), &argv[0]));
+        }
+        int status = 0;
+        if (pid < 0 || waitpid(pid, &status, 0) < 0)
+            status = 1 << 8;
+        int exitcode = WIFSIGNALED(status) ? -WTERMSIG(status) :
+                       WEXITSTATUS(status);
+        fprintf(replies, "%d %.2f\n", exitcode, used_cpu_time());
+        fflush(replies);
+    }
+    fclose(replies);
+}
+
+int main(int argc, const char **argv) {
+    register_event_handlers();
+
+    if (argc < 2) {
+        cout << OptionParser::usage(argv[0]) << endl;
+        exit(1);
+    }
+
+    if (string(argv[1]).compare("--help") != 0)
+        read_everything(cin);
+
+    if (string(argv[1]).compare("--portfolio") == 0) {
+        if (argc != 3) {
+            cerr << "usage: " << argv[0] << " --portfolio <reply fd>" << endl;
+            exit(1);
+        }
+        serve_portfolio(argv[0], atoi(argv[2]));
+        return 0;
+    }
+
+    return search(argc, argv);
+}
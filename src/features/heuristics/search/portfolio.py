@@ -5,6 +5,8 @@ import optparse
 import os
 import os.path
 import resource
+import shutil
+import subprocess
 import sys
 
 
@@ -12,10 +14,16 @@ DEFAULT_TIMEOUT = 1800
 # Measurements show that this process uses about 35 MB of virtual memory.
 BYTES_FOR_PYTHON = 50 * 1024 * 1024
 
+# Search process that reads the task once (see SearchServer), if any.
+_server = None
+
 def parse_args():
     parser = optparse.OptionParser()
     parser.add_option("--plan-file", default="sas_plan",
                       help="Filename for the found plans (default: %default)")
+    parser.add_option("--fork-after-load", action="store_true", default=False,
+                      help="Read the task once and fork the search process "
+                      "for every configuration")
     return parser.parse_args()
 
 def safe_unlink(filename):
@@ -69,10 +77,67 @@ def adapt_search(args, search_cost_type, heuristic_cost_type, plan_file):
     print "next plan number: %d" % (plan_no + 1)
     return curr_plan_file
 
+class SearchServer(object):
+    """Search process in portfolio mode ("downward --portfolio"): it reads
+    the task once and forks a child for every configuration, with the given
+    arguments and limits. The children run in the same directory, so plan
+    numbering works as with a fresh process per configuration."""
+
+    def __init__(self, planner):
+        read_fd, write_fd = os.pipe()
+        self.process = subprocess.Popen([planner, "--portfolio", str(write_fd)],
+                                        stdin=subprocess.PIPE)
+        os.close(write_fd)
+        self.replies = os.fdopen(read_fd)
+        # The children are not our children, so their time is not in
+        # os.times() until the server exits.
+        self.cpu_time = 0.0
+        shutil.copyfileobj(open("output"), self.process.stdin)
+        self.process.stdin.flush()
+
+    def run(self, args, plan_file, timeout=None, memory=None):
+        """Returns the exit code of the search, or None if the server is
+        gone."""
+        if timeout:
+            cpu_limits = "%d %d" % (int(timeout), int(timeout))
+        else:
+            cpu_limits = "-1 -1"
+        request = ["run", plan_file, cpu_limits,
+                   str(int(memory)) if memory else "-1", str(len(args))]
+        request += [arg.replace("\n", " ") for arg in args]
+        try:
+            self.process.stdin.write("\n".join(request) + "\n")
+            self.process.stdin.flush()
+        except IOError:
+            return None
+        reply = self.replies.readline().split()
+        if not reply:
+            return None
+        self.cpu_time = float(reply[1])
+        return int(reply[0])
+
+    def close(self):
+        try:
+            self.process.stdin.write("quit\n")
+            self.process.stdin.close()
+        except IOError:
+            pass
+        self.process.wait()
+        self.replies.close()
+        self.cpu_time = 0.0
+
 def run_search(planner, args, plan_file, timeout=None, memory=None):
+    global _server
     complete_args = [planner] + args + ["--plan-file", plan_file]
     print "args: %s" % complete_args
     sys.stdout.flush()
+    if _server is not None:
+        if _server.run(args, plan_file, timeout, memory) is not None:
+            return
+        sys.stderr.write("The search server is gone, falling back to a "
+                         "process per configuration.\n")
+        _server.close()
+        _server = None
     if not os.fork():
         os.close(0)
         os.open("output", os.O_RDONLY)
@@ -86,6 +151,8 @@ def run_search(planner, args, plan_file, timeout=None, memory=None):
 
 def determine_timeout(remaining_time_at_start, configs, pos):
     remaining_time = remaining_time_at_start - sum(os.times()[:4])
+    if _server is not None:
+        remaining_time -= _server.cpu_time
     relative_time = configs[pos][0]
     print "remaining time: %s" % remaining_time
     remaining_relative_time = sum(config[0] for config in configs[pos:])
@@ -147,11 +214,20 @@ def run(configs, optimal=True, final_config=None, final_config_builder=None,
 
     print "remaining time at start: %s" % remaining_time_at_start
 
-    if optimal:
-        run_opt(configs, planner, plan_file, remaining_time_at_start, memory)
-    else:
-        run_sat(configs, unitcost, planner, plan_file, final_config,
-                final_config_builder, remaining_time_at_start, memory)
+    global _server
+    if options.fork_after_load:
+        _server = SearchServer(planner)
+    try:
+        if optimal:
+            run_opt(configs, planner, plan_file, remaining_time_at_start,
+                    memory)
+        else:
+            run_sat(configs, unitcost, planner, plan_file, final_config,
+                    final_config_builder, remaining_time_at_start, memory)
+    finally:
+        if _server is not None:
+            _server.close()
+            _server = None
 
 def run_sat(configs, unitcost, planner, plan_file, final_config,
             final_config_builder, remaining_time_at_start, memory):
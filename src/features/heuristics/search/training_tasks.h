@@ -1,6 +1,7 @@
 #ifndef TRAINING_TASKS_H
 #define TRAINING_TASKS_H
 
+#include <string>
 #include <vector>
 
 #include "heuristic.h"
@@ -20,8 +21,21 @@
 #include "search_space.h"
 #include "state.h"
 
+/*
+  Values of nine heuristics on the initial state (features of the task):
+  add, blind, cg, cea, ff, goalcount, lmcount, lmcut and hmax, written to
+  tmp_results in this order. Every heuristic runs with its own CPU time
+  limit in a child process, so one that runs out of time or memory only
+  loses its own value, which is written as '?'. h^add, h^FF and h^max
+  share the relaxed task, and h^add and h^FF the exploration.
+*/
 class TrainingTasks{
+    static void compute_heuristics(const State &state, const int cost_type,
+                                   int first_step, int output);
 public:
+    // CPU seconds of every heuristic (also building its structures)
+    static const int HEURISTIC_TIME_LIMIT = 10;
+
     static void solution_path_data_collection(const State &g_initial_state, const int cost_type);
 };
 
@@ -8,6 +8,7 @@
 using namespace std;
 
 class Variable;
+class SASBinaryReader;
 
 class Axiom {
 public:
@@ -23,6 +24,7 @@ private:
     vector<Condition> conditions;    // var, val
 public:
     Axiom(istream &in, const vector<Variable *> &variables);
+    Axiom(SASBinaryReader &in, const vector<Variable *> &variables);
 
     bool is_redundant() const;
     void dump() const;
@@ -14,6 +14,7 @@ using namespace std;
 #include "variable.h"
 #include "successor_generator.h"
 #include "domain_transition_graph.h"
+#include "sas_binary.h"
 
 //ISA
 #include "Features.h"
@@ -115,6 +116,49 @@ void read_axioms(istream &in, const vector<Variable *> &variables,
         axioms.push_back(Axiom(in, variables));
 }
 
+void read_binary_variables(SASBinaryReader &in,
+                           vector<Variable> &internal_variables,
+                           vector<Variable *> &variables) {
+    int count = in.read_int();
+    internal_variables.reserve(count);
+    // Important so that the iterators stored in variables are valid.
+    for (int i = 0; i < count; i++) {
+        internal_variables.push_back(Variable(in));
+        variables.push_back(&internal_variables.back());
+    }
+}
+
+void read_binary_problem_description(SASBinaryReader &in,
+                                     bool &metric,
+                                     vector<Variable> &internal_variables,
+                                     vector<Variable *> &variables,
+                                     vector<MutexGroup> &mutexes,
+                                     State &initial_state,
+                                     vector<pair<Variable *, int> > &goals,
+                                     vector<Operator> &operators,
+                                     vector<Axiom> &axioms) {
+    read_and_verify_binary_header(in, SAS_FILE_VERSION);
+    metric = in.read_int();
+    read_binary_variables(in, internal_variables, variables);
+    int count = in.read_int();
+    for (int i = 0; i < count; i++)
+        mutexes.push_back(MutexGroup(in, variables));
+    initial_state = State(in, variables);
+    count = in.read_int();
+    for (int i = 0; i < count; i++) {
+        int varNo = in.read_int();
+        int val = in.read_int();
+        goals.push_back(make_pair(variables[varNo], val));
+    }
+    count = in.read_int();
+    operators.reserve(count);
+    for (int i = 0; i < count; i++)
+        operators.push_back(Operator(in, variables));
+    count = in.read_int();
+    for (int i = 0; i < count; i++)
+        axioms.push_back(Axiom(in, variables));
+}
+
 void read_preprocessed_problem_description(istream &in,
                                            bool &metric,
                                            vector<Variable> &internal_variables,
@@ -124,6 +168,13 @@ void read_preprocessed_problem_description(istream &in,
                                            vector<pair<Variable *, int> > &goals,
                                            vector<Operator> &operators,
                                            vector<Axiom> &axioms) {
+    if (is_binary_sas(in)) {
+        SASBinaryReader reader(in);
+        read_binary_problem_description(reader, metric, internal_variables,
+                                        variables, mutexes, initial_state,
+                                        goals, operators, axioms);
+        return;
+    }
     read_and_verify_version(in);
     read_metric(in, metric);
     read_variables(in, internal_variables, variables);
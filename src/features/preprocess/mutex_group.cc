@@ -2,6 +2,7 @@
 
 #include "helper_functions.h"
 #include "variable.h"
+#include "sas_binary.h"
 
 MutexGroup::MutexGroup(istream &in, const vector<Variable *> &variables) {
     int size;
@@ -15,6 +16,15 @@ MutexGroup::MutexGroup(istream &in, const vector<Variable *> &variables) {
     check_magic(in, "end_mutex_group");
 }
 
+MutexGroup::MutexGroup(SASBinaryReader &in, const vector<Variable *> &variables) {
+    int size = in.read_int();
+    for (size_t i = 0; i < size; ++i) {
+        int var_no = in.read_int();
+        int value = in.read_int();
+        facts.push_back(make_pair(variables[var_no], value));
+    }
+}
+
 int MutexGroup::get_encoding_size() const {
     return facts.size();
 }
@@ -1,5 +1,6 @@
 #include "state.h"
 #include "helper_functions.h"
+#include "sas_binary.h"
 
 class Variable;
 
@@ -13,6 +14,11 @@ State::State(istream &in, const vector<Variable *> &variables) {
     check_magic(in, "end_state");
 }
 
+State::State(SASBinaryReader &in, const vector<Variable *> &variables) {
+    for (int i = 0; i < variables.size(); i++)
+        values[variables[i]] = in.read_int(); //for axioms, this is default value
+}
+
 int State::operator[](Variable *var) const {
     return values.find(var)->second;
 }
@@ -7,12 +7,14 @@
 using namespace std;
 
 class Variable;
+class SASBinaryReader;
 
 class State {
     map<Variable *, int> values;
 public:
     State() {} // TODO: Entfernen (erfordert kleines Redesign)
     State(istream &in, const vector<Variable *> &variables);
+    State(SASBinaryReader &in, const vector<Variable *> &variables);
 
     int operator[](Variable *var) const;
     void dump() const;
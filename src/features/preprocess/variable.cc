@@ -1,6 +1,7 @@
 #include "variable.h"
 
 #include "helper_functions.h"
+#include "sas_binary.h"
 
 #include <cassert>
 using namespace std;
@@ -17,6 +18,17 @@ Variable::Variable(istream &in) {
     necessary = false;
 }
 
+Variable::Variable(SASBinaryReader &in) {
+    name = in.read_string();
+    layer = in.read_int();
+    int range = in.read_int();
+    values.resize(range);
+    for (size_t i = 0; i < range; ++i)
+        values[i] = in.read_string();
+    level = -1;
+    necessary = false;
+}
+
 void Variable::set_level(int theLevel) {
     assert(level == -1);
     level = theLevel;
@@ -0,0 +1,237 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time of the expansion of the mutex groups on object-heavy tasks.
+
+Generates visitall and logistics tasks of growing size, grounds them with
+the shared translator and times the expansion of the invariant groups into
+mutex groups (fact_groups.instantiate_groups), both with the index of
+reachable facts and by trying every object of the task as the translator
+used to, as well as collecting and choosing the groups. Both expansions
+must give the same groups.
+
+Usage: fact_groups_benchmark.py [options]
+"""
+
+from __future__ import print_function
+
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import translate
+
+# imported by translate from the shared translator
+import fact_groups
+import instantiate
+import invariant_finder
+import normalize
+import pddl
+
+
+VISITALL_DOMAIN = """(define (domain grid-visit-all)
+  (:requirements :typing)
+  (:types place - object)
+  (:predicates (connected ?x ?y - place)
+               (at-robot ?x - place)
+               (visited ?x - place))
+  (:action move
+    :parameters (?curpos ?nextpos - place)
+    :precondition (and (at-robot ?curpos) (connected ?curpos ?nextpos))
+    :effect (and (at-robot ?nextpos) (not (at-robot ?curpos))
+                 (visited ?nextpos))))
+"""
+
+LOGISTICS_DOMAIN = """(define (domain logistics)
+  (:requirements :strips :typing)
+  (:types truck airplane - vehicle
+          package vehicle - physobj
+          airport location - place
+          city place physobj - object)
+  (:predicates (in-city ?loc - place ?city - city)
+               (at ?obj - physobj ?loc - place)
+               (in ?pkg - package ?veh - vehicle))
+  (:action load-truck
+    :parameters (?pkg - package ?truck - truck ?loc - place)
+    :precondition (and (at ?truck ?loc) (at ?pkg ?loc))
+    :effect (and (not (at ?pkg ?loc)) (in ?pkg ?truck)))
+  (:action load-airplane
+    :parameters (?pkg - package ?airplane - airplane ?loc - place)
+    :precondition (and (at ?pkg ?loc) (at ?airplane ?loc))
+    :effect (and (not (at ?pkg ?loc)) (in ?pkg ?airplane)))
+  (:action unload-truck
+    :parameters (?pkg - package ?truck - truck ?loc - place)
+    :precondition (and (at ?truck ?loc) (in ?pkg ?truck))
+    :effect (and (not (in ?pkg ?truck)) (at ?pkg ?loc)))
+  (:action unload-airplane
+    :parameters (?pkg - package ?airplane - airplane ?loc - place)
+    :precondition (and (in ?pkg ?airplane) (at ?airplane ?loc))
+    :effect (and (not (in ?pkg ?airplane)) (at ?pkg ?loc)))
+  (:action drive-truck
+    :parameters (?truck - truck ?loc-from ?loc-to - place ?city - city)
+    :precondition (and (at ?truck ?loc-from) (in-city ?loc-from ?city)
+                       (in-city ?loc-to ?city))
+    :effect (and (not (at ?truck ?loc-from)) (at ?truck ?loc-to)))
+  (:action fly-airplane
+    :parameters (?airplane - airplane ?loc-from ?loc-to - airport)
+    :precondition (at ?airplane ?loc-from)
+    :effect (and (not (at ?airplane ?loc-from)) (at ?airplane ?loc-to))))
+"""
+
+
+def visitall_problem(size):
+    """Return a visitall task on a size x size grid."""
+    places = ["loc-x%d-y%d" % (x, y) for x in range(size) for y in range(size)]
+    init = ["(at-robot loc-x0-y0)", "(visited loc-x0-y0)"]
+    for x in range(size):
+        for y in range(size):
+            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    init.append("(connected loc-x%d-y%d loc-x%d-y%d)" %
+                                (x, y, x + dx, y + dy))
+    goal = ["(visited %s)" % place for place in places]
+    return ("(define (problem grid-%d) (:domain grid-visit-all)\n"
+            "  (:objects %s - place)\n  (:init %s)\n  (:goal (and %s)))\n" %
+            (size, " ".join(places), " ".join(init), " ".join(goal)))
+
+
+def logistics_problem(size):
+    """Return a logistics task with size cities (of size locations each),
+    size airplanes and 4 * size packages."""
+    objects, init, goal = [], [], []
+    for city in range(size):
+        objects.append("city%d - city" % city)
+        objects.append("truck%d - truck" % city)
+        objects.append("apt%d - airport" % city)
+        init.append("(in-city apt%d city%d)" % (city, city))
+        init.append("(at truck%d apt%d)" % (city, city))
+        for loc in range(size):
+            objects.append("pos%d-%d - location" % (city, loc))
+            init.append("(in-city pos%d-%d city%d)" % (city, loc, city))
+    for plane in range(size):
+        objects.append("plane%d - airplane" % plane)
+        init.append("(at plane%d apt%d)" % (plane, plane))
+    for pkg in range(4 * size):
+        objects.append("obj%d - package" % pkg)
+        init.append("(at obj%d pos%d-%d)" % (pkg, pkg % size, pkg % size))
+        goal.append("(at obj%d pos%d-%d)" %
+                    (pkg, (pkg + 1) % size, (pkg * 7) % size))
+    return ("(define (problem logistics-%d) (:domain logistics)\n"
+            "  (:objects %s)\n  (:init %s)\n  (:goal (and %s)))\n" %
+            (size, " ".join(objects), " ".join(init), " ".join(goal)))
+
+
+DOMAINS = [("visitall", VISITALL_DOMAIN, visitall_problem),
+           ("logistics", LOGISTICS_DOMAIN, logistics_problem)]
+
+
+def expand_group_by_objects(group, task, reachable_facts):
+    """Expand the group as the translator used to: every object is tried
+    in place of ?X."""
+    result = []
+    for fact in group:
+        try:
+            pos = list(fact.args).index("?X")
+        except ValueError:
+            result.append(fact)
+        else:
+            for obj in task.objects:
+                newargs = list(fact.args)
+                newargs[pos] = obj.name
+                atom = pddl.Atom(fact.predicate, newargs)
+                if atom in reachable_facts:
+                    result.append(atom)
+    return result
+
+
+def seconds(function, *args):
+    started = time.time()
+    result = function(*args)
+    return time.time() - started, result
+
+
+def measure(domain, problem, repetitions):
+    """Return the task size, the best times of the old and indexed
+    expansions and of collecting and choosing the groups."""
+    task = pddl.open(problem, domain)
+    normalize.normalize(task)
+    relaxed_reachable, atoms, actions, axioms, reachable_action_params = (
+        instantiate.explore(task))
+    groups = invariant_finder.get_groups(task, reachable_action_params)
+
+    old, indexed = [], []
+    for _ in range(repetitions):
+        elapsed, old_groups = seconds(
+            lambda: [expand_group_by_objects(group, task, atoms)
+                     for group in groups])
+        old.append(elapsed)
+        elapsed, new_groups = seconds(
+            fact_groups.instantiate_groups, groups, task, atoms)
+        indexed.append(elapsed)
+        assert old_groups == new_groups
+    new_groups = fact_groups.sort_groups(new_groups)
+    collecting, _ = seconds(fact_groups.collect_all_mutex_groups,
+                            new_groups, atoms)
+    choosing, _ = seconds(fact_groups.choose_groups, new_groups, atoms)
+    return (len(task.objects), len(atoms), len(groups), min(old),
+            min(indexed), collecting, choosing)
+
+
+def parse_options():
+    optparser = optparse.OptionParser(usage="Usage: %prog [options]")
+    optparser.add_option(
+        "--sizes", default="10,20,30",
+        help="comma-separated sizes of the tasks (default: %default)")
+    optparser.add_option(
+        "--domains", default=",".join(name for name, _, _ in DOMAINS),
+        help="comma-separated domains (default: %default)")
+    optparser.add_option(
+        "--repetitions", type="int", default=3,
+        help="runs per task; the best time is reported")
+    options, args = optparser.parse_args()
+    if args:
+        optparser.error("unexpected arguments")
+    return options
+
+
+def main():
+    options = parse_options()
+    sizes = [int(size) for size in options.sizes.split(",")]
+    domains = options.domains.split(",")
+    workdir = tempfile.mkdtemp(prefix="fact-groups-benchmark-")
+    print("%-16s %8s %8s %7s %10s %10s %8s %10s %10s" % (
+        "task", "objects", "atoms", "groups", "old s", "indexed s",
+        "speedup", "collect s", "choose s"))
+    try:
+        for name, domain_text, generate in DOMAINS:
+            if name not in domains:
+                continue
+            domain = os.path.join(workdir, "%s-domain.pddl" % name)
+            with open(domain, "w") as domain_file:
+                domain_file.write(domain_text)
+            for size in sizes:
+                problem = os.path.join(workdir, "%s-%d.pddl" % (name, size))
+                with open(problem, "w") as problem_file:
+                    problem_file.write(generate(size))
+                # the translator prints its progress
+                stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+                try:
+                    (objects, atoms, groups, old, indexed, collecting,
+                     choosing) = measure(domain, problem, options.repetitions)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                print("%-16s %8d %8d %7d %10.3f %10.3f %7.1fx %10.3f %10.3f" % (
+                    "%s-%d" % (name, size), objects, atoms, groups, old,
+                    indexed, old / max(indexed, 1e-6), collecting, choosing))
+                sys.stdout.flush()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Peak memory of the translator over a set of tasks.
+
+Each task is translated in its own scratch directory by a fresh process,
+and the peak resident set size of that process is reported. With
+--baseline, the same tasks are also translated by another copy of the
+translator (e.g. a checkout from before a change), and both columns are
+printed side by side.
+
+Usage: memory_benchmark.py [options] <domain.pddl> <task.pddl> [...]
+"""
+
+from __future__ import print_function
+
+import optparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+TRANSLATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def peak_rss_of_translation(translator_dir, domain, task):
+    """Translate the task in a forked process and return (exit code,
+    peak RSS in KB) of the translator."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if not pid:
+        os.close(read_fd)
+        workdir = tempfile.mkdtemp(prefix="translate-memory-")
+        try:
+            with open(os.devnull, "w") as devnull:
+                code = subprocess.call(
+                    [sys.executable,
+                     os.path.join(translator_dir, "translate.py"),
+                     domain, task],
+                    cwd=workdir, stdout=devnull, stderr=devnull)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        # ru_maxrss of the children of this fork is exactly the translator.
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        os.write(write_fd, ("%d %d" % (code, peak)).encode())
+        os._exit(0)
+    os.close(write_fd)
+    data = b""
+    while True:
+        chunk = os.read(read_fd, 64)
+        if not chunk:
+            break
+        data += chunk
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    code, peak = data.decode().split()
+    return int(code), int(peak)
+
+
+def measure(translator_dir, domain, task, repetitions):
+    results = [peak_rss_of_translation(translator_dir, domain, task)
+               for _ in range(repetitions)]
+    codes = set(code for code, _ in results)
+    return max(codes), min(peak for _, peak in results)
+
+
+def parse_options():
+    optparser = optparse.OptionParser(
+        usage="Usage: %prog [options] <domain.pddl> <task.pddl> [...]")
+    optparser.add_option(
+        "--baseline", metavar="DIR",
+        help="translator directory to compare against")
+    optparser.add_option(
+        "--tasks", metavar="FILE",
+        help="file with one '<domain.pddl> <task.pddl>' pair per line")
+    optparser.add_option(
+        "--repetitions", type="int", default=1,
+        help="runs per task; the smallest peak is reported")
+    options, args = optparser.parse_args()
+    if len(args) % 2:
+        optparser.error("domain and task files must come in pairs")
+    pairs = list(zip(args[::2], args[1::2]))
+    if options.tasks:
+        with open(options.tasks) as task_file:
+            for line in task_file:
+                if line.strip() and not line.startswith("#"):
+                    pairs.append(tuple(line.split()[:2]))
+    if not pairs:
+        optparser.error("no tasks given")
+    pairs = [(os.path.abspath(domain), os.path.abspath(task))
+             for domain, task in pairs]
+    return options, pairs
+
+
+def main():
+    options, pairs = parse_options()
+    translators = [("current", TRANSLATOR_DIR)]
+    if options.baseline:
+        translators.insert(0, ("baseline", os.path.abspath(options.baseline)))
+
+    header = "%-40s" % "task" + "".join(
+        "%15s" % ("%s KB" % name) for name, _ in translators)
+    if options.baseline:
+        header += "%10s" % "change"
+    print(header)
+    totals = [0] * len(translators)
+    for domain, task in pairs:
+        peaks = []
+        line = "%-40s" % os.path.basename(task)
+        for index, (name, directory) in enumerate(translators):
+            code, peak = measure(directory, domain, task, options.repetitions)
+            peaks.append(peak)
+            totals[index] += peak
+            line += "%15s" % (peak if code == 0 else "%d (rc %d)" % (peak, code))
+        if options.baseline and peaks[0]:
+            line += "%9.1f%%" % (100.0 * (peaks[1] - peaks[0]) / peaks[0])
+        print(line)
+        sys.stdout.flush()
+    line = "%-40s" % "total" + "".join("%15d" % total for total in totals)
+    if options.baseline and totals[0]:
+        line += "%9.1f%%" % (100.0 * (totals[1] - totals[0]) / totals[0])
+    print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resident translator service.
+
+The server imports the translator once and then forks one child per
+task, so each task pays neither the interpreter startup nor the imports
+of the pddl, normalize and invariants modules. Requests arrive through a
+local socket from translate_client.py, which takes the same arguments as
+translate.py.
+
+Usage: translate_server.py [<socket path>]
+"""
+
+from __future__ import print_function
+
+import os
+import resource
+import select
+import signal
+import socket
+import sys
+import traceback
+
+import translate
+import translate_service
+
+
+def _exit_code(status):
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def run_translator(request):
+    """Run one translation in the current (forked) process and return
+    its exit code."""
+    os.chdir(request["cwd"])
+    for name, (soft, hard) in request["limits"].items():
+        try:
+            resource.setrlimit(getattr(resource, name), (soft, hard))
+        except (ValueError, resource.error) as e:
+            print("Warning: could not set %s: %s" % (name, e), file=sys.stderr)
+    sys.argv = ["translate.py"] + request["argv"]
+    try:
+        translate.main()
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def handle_connection(conn):
+    """Serve one request: fork the translator, forward its output and
+    report its exit code. If the client goes away, the translator is
+    killed."""
+    kind, payload = translate_service.recv_message(conn)
+    if kind != translate_service.MSG_REQUEST:
+        return
+    request = translate_service.decode_request(payload)
+    mismatch = translate_service.get_mismatch(request)
+    if mismatch is not None:
+        translate_service.send_message(
+            conn, translate_service.MSG_MISMATCH, mismatch.encode("utf-8"))
+        return
+
+    out_read, out_write = os.pipe()
+    err_read, err_write = os.pipe()
+    pid = os.fork()
+    if not pid:
+        conn.close()
+        os.close(out_read)
+        os.close(err_read)
+        os.dup2(out_write, 1)
+        os.dup2(err_write, 2)
+        code = run_translator(request)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+    os.close(out_write)
+    os.close(err_write)
+
+    kinds = {out_read: translate_service.MSG_STDOUT,
+             err_read: translate_service.MSG_STDERR}
+    open_fds = set(kinds)
+    client_gone = False
+    while open_fds:
+        ready, _, _ = select.select(list(open_fds) + [conn], [], [])
+        if conn in ready:
+            # The client never sends anything after its request, so a
+            # readable socket means it hung up (e.g., it was killed).
+            client_gone = True
+            os.kill(pid, signal.SIGKILL)
+            break
+        for fd in ready:
+            data = os.read(fd, 65536)
+            if data:
+                translate_service.send_message(conn, kinds[fd], data)
+            else:
+                open_fds.remove(fd)
+    _, status = os.waitpid(pid, 0)
+    if not client_gone:
+        translate_service.send_message(
+            conn, translate_service.MSG_EXIT, str(_exit_code(status)).encode())
+
+
+def is_listening(path):
+    """Return whether a server still accepts connections on path."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except socket.error:
+        return False
+    finally:
+        conn.close()
+    return True
+
+
+def serve(path):
+    if os.path.exists(path):
+        if is_listening(path):
+            raise SystemExit("Error: a translator server is already "
+                             "listening on %s" % path)
+        # A stale socket left behind by a server that died.
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    # Only remove the socket on exit if it is still ours.
+    inode = os.stat(path).st_ino
+    server.listen(64)
+    # Handlers are never waited for; let the kernel reap them.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print("Translator server listening on %s" % path)
+    sys.stdout.flush()
+    try:
+        while True:
+            conn, _ = server.accept()
+            if not os.fork():
+                server.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                try:
+                    handle_connection(conn)
+                finally:
+                    os._exit(0)
+            conn.close()
+    finally:
+        server.close()
+        try:
+            if os.stat(path).st_ino == inode:
+                os.unlink(path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        raise SystemExit("Usage: %s [<socket path>]" % sys.argv[0])
+    if len(sys.argv) == 2:
+        serve(sys.argv[1])
+    else:
+        serve(translate_service.get_socket_path())
@@ -0,0 +1,376 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# benchmark.py
+# Description: benchmark of the stages of the portfolio before the planners
+# -----------------------------------------------------------------------------
+
+"""
+benchmark of the stages of the portfolio before the planners
+
+Runs the stages that solve.py goes through before the first planner starts
+(cleaning the PDDL files, the feature extractors, joinFile, the Weka models
+and VAL) over a corpus of tasks, one after the other so that they do not
+compete, and records the wall-clock time, CPU time and peak resident set
+size of every one. Every stage runs in a child process (the Python ones in a
+forked copy of this one), whose resources are those reported by wait4. As
+the child starts as a copy of this process, the peak memory of a stage is
+never below that of this process.
+
+Every task is a directory with a domain.pddl and a problem.pddl, and
+optionally a plan.txt for VAL. The tasks of benchmarks/ are used by default
+(see benchmarks/generate.py). Every repetition runs in a fresh scratch
+directory.
+
+The results can be saved as JSON and compared with a previous run: a stage
+regresses if its median wall-clock or CPU time, or its peak memory, exceeds
+that of the baseline by more than the tolerance. In that case the exit code
+is 1.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import json             # results
+import os               # path and process management
+import platform         # host information
+import shutil           # remove directories
+import signal           # process management
+import sys              # argv, exit
+import tempfile         # scratch directories
+import threading        # deadlines
+import time             # time mgmt
+import traceback        # errors of the Python stages
+
+import pddltools        # lazily cleaned variants of the PDDL files
+import solve            # the stages of the portfolio
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+ROOTPATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+STAGES = ["clean", "translate", "preprocess", "ff-learner", "heuristics", "joinFile", "weka", "validate"]
+
+REPETITIONS = 3
+TOLERANCE = 0.10             # relative increase that is a regression
+MIN_SECONDS = 0.05           # differences below these are noise
+MIN_KB = 1024
+
+# status of a stage
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"          # not available in this run
+
+DEADLINE = 300               # stages not run by the feature controller
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# measure
+#
+# runs 'target' (a shell command or a function) in a child process in the
+# directory 'cwd' and returns its status, wall-clock time, CPU time and peak
+# resident set size in KB. Its output is written to 'log'. It is killed after
+# 'deadline' seconds
+# -----------------------------------------------------------------------------
+def measure(target, cwd, log, deadline):
+    """
+    runs 'target' (a shell command or a function) in a child process in the
+    directory 'cwd' and returns its status, wall-clock time, CPU time and peak
+    resident set size in KB. Its output is written to 'log'
+    """
+
+    sys.stdout.flush()
+    started = time.time()
+    pid = os.fork()
+    if not pid:                                                  # child's code
+        code = 1
+        try:
+            os.setpgrp()
+            os.chdir(cwd)
+            output = os.open(log, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0644)
+            os.dup2(output, 1)
+            os.dup2(output, 2)
+            if isinstance(target, basestring):
+                os.execl("/bin/sh", "sh", "-c", target)
+            code = 0 if target() is not False else 1
+            sys.stdout.flush()
+        except Exception:
+            traceback.print_exc()
+        finally:
+            os._exit(code)
+
+    # the whole process group is killed once the deadline expires
+    expired = threading.Event()
+    def expire():
+        expired.set()
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    timer = threading.Timer(deadline, expire)
+    timer.start()
+    while True:
+        try:
+            (pid, status, usage) = os.wait4(pid, 0)
+            break
+        except OSError:
+            continue
+    elapsed = time.time() - started
+    timer.cancel()
+
+    if expired.is_set():
+        result = TIMEOUT
+    elif os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+        result = OK
+    else:
+        result = FAILED
+    return (result, elapsed, usage.ru_utime + usage.ru_stime, usage.ru_maxrss)
+
+
+# -----------------------------------------------------------------------------
+# stages
+#
+# returns the stages of the given task as a list of (name, target, deadline),
+# where target is a shell command or a function, in the order in which they
+# run. The stages that cannot run are given a target of None
+# -----------------------------------------------------------------------------
+def stages(task, scratch, dck_folder):
+    """
+    returns the stages of the given task as a list of (name, target,
+    deadline), where target is a shell command or a function, in the order in
+    which they run. The stages that cannot run are given a target of None
+    """
+
+    domain = os.path.join(task, "domain.pddl")
+    problem = os.path.join(task, "problem.pddl")
+    plan = os.path.join(task, "plan.txt")
+
+    # the cache is private to every repetition, so that the files are cleaned
+    def clean():
+        cleaned = pddltools.CleanedFiles(domain, problem, scratch, os.path.join(scratch, "cache"))
+        cleaned.without_action_costs()
+
+    def join():
+        return bool(joinFile.join_file(scratch))
+
+    result = [("clean", clean, DEADLINE)]
+    for extractor in solve.feature_extractors(ROOTPATH, domain, problem):
+        result.append((extractor.name, extractor.command, extractor.deadline))
+    result.append(("joinFile", join, DEADLINE))
+    if dck_folder:
+        commands = solve.weka_commands(ROOTPATH, dck_folder, solve.read_models(dck_folder), "classification")
+        result.append(("weka", " && ".join(commands), DEADLINE))
+    else:
+        result.append(("weka", None, DEADLINE))
+    if os.path.isfile(plan):
+        command = ROOTPATH + "/parser/VAL-4.2.08/validate -v " + domain + " " + problem + " " + plan
+        result.append(("validate", command, DEADLINE))
+    else:
+        result.append(("validate", None, DEADLINE))
+    return result
+
+
+# -----------------------------------------------------------------------------
+# run_task
+#
+# runs the selected stages of the given task 'repetitions' times and returns a
+# dictionary that maps every stage to its measures
+# -----------------------------------------------------------------------------
+def run_task(task, selected, repetitions, dck_folder, keep):
+    """
+    runs the selected stages of the given task 'repetitions' times and returns
+    a dictionary that maps every stage to its measures
+    """
+
+    results = dict()
+    for repetition in xrange(repetitions):
+        scratch = tempfile.mkdtemp(prefix="benchmark-")
+        try:
+            for (name, target, deadline) in stages(task, scratch, dck_folder):
+                measures = results.setdefault(name, {"status": [], "wall": [], "cpu": [], "rss": []})
+                if name not in selected or target is None:
+                    (status, wall, cpu, rss) = (SKIPPED, 0.0, 0.0, 0)
+                else:
+                    (status, wall, cpu, rss) = measure(target, scratch, os.path.join(scratch, name + ".log"),
+                                                       deadline)
+                measures["status"].append(status)
+                measures["wall"].append(round(wall, 4))
+                measures["cpu"].append(round(cpu, 4))
+                measures["rss"].append(rss)
+        finally:
+            if keep:
+                print " Scratch directory kept in " + scratch
+            else:
+                shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+# -----------------------------------------------------------------------------
+# median
+#
+# returns the median of the given values
+# -----------------------------------------------------------------------------
+def median(values):
+    """
+    returns the median of the given values
+    """
+
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+# -----------------------------------------------------------------------------
+# summary
+#
+# returns the status, median wall-clock and CPU time and maximum peak memory
+# of the measures of a stage. The status is that of the worst repetition
+# -----------------------------------------------------------------------------
+def summary(measures):
+    """
+    returns the status, median wall-clock and CPU time and maximum peak memory
+    of the measures of a stage. The status is that of the worst repetition
+    """
+
+    status = OK
+    for worse in (SKIPPED, FAILED, TIMEOUT):
+        if worse in measures["status"]:
+            status = worse
+    return (status, median(measures["wall"]), median(measures["cpu"]), max(measures["rss"]))
+
+
+# -----------------------------------------------------------------------------
+# compare
+#
+# returns the regressions of 'results' with respect to 'baseline' as a list of
+# (task, stage, measure, baseline value, current value)
+# -----------------------------------------------------------------------------
+def compare(results, baseline, tolerance):
+    """
+    returns the regressions of 'results' with respect to 'baseline' as a list
+    of (task, stage, measure, baseline value, current value)
+    """
+
+    regressions = []
+    for task in sorted(results):
+        for stage in STAGES:
+            if stage not in results[task] or stage not in baseline.get(task, {}):
+                continue
+            current = summary(results[task][stage])
+            previous = summary(baseline[task][stage])
+            if current[0] != OK or previous[0] != OK:
+                if previous[0] == OK and current[0] != SKIPPED:
+                    regressions.append((task, stage, "status", previous[0], current[0]))
+                continue
+            for (index, measure, noise) in [(1, "wall", MIN_SECONDS), (2, "cpu", MIN_SECONDS), (3, "rss", MIN_KB)]:
+                if (current[index] > previous[index] * (1 + tolerance) and
+                    current[index] - previous[index] > noise):
+                    regressions.append((task, stage, measure, previous[index], current[index]))
+    return regressions
+
+
+# -----------------------------------------------------------------------------
+# report
+#
+# prints the summary of every stage of every task, and the total time of
+# every task
+# -----------------------------------------------------------------------------
+def report(results):
+    """
+    prints the summary of every stage of every task, and the total time of
+    every task
+    """
+
+    print " %-10s %-12s %-8s %10s %10s %12s" % ("task", "stage", "status", "wall (s)", "cpu (s)", "peak (KB)")
+    for task in sorted(results):
+        (wall, cpu) = (0.0, 0.0)
+        for stage in STAGES:
+            if stage in results[task]:
+                (status, median_wall, median_cpu, rss) = summary(results[task][stage])
+                print " %-10s %-12s %-8s %10.3f %10.3f %12d" % (task, stage, status, median_wall, median_cpu, rss)
+                (wall, cpu) = (wall + median_wall, cpu + median_cpu)
+        print " %-10s %-12s %-8s %10.3f %10.3f" % (task, "total", "", wall, cpu)
+
+
+# -----------------------------------------------------------------------------
+# create_parser
+#
+# creates a command-line parser
+# -----------------------------------------------------------------------------
+def create_parser():
+    """
+    creates a command-line parser
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the stages of the portfolio before the planners")
+    parser.add_argument('tasks', nargs='*',
+                        help="directories with a domain.pddl, a problem.pddl and optionally a plan.txt "
+                        "(default: those in %s)" % CORPUS)
+    parser.add_argument('-s', '--stage', action='append', choices=STAGES, dest='stages',
+                        help="stage to run, may be given several times (default: all)")
+    parser.add_argument('-r', '--repetitions', type=int, default=REPETITIONS,
+                        help="times every stage is run (default: %(default)s)")
+    parser.add_argument('-k', '--dck', default=None,
+                        help="folder with the Weka models. Without it, the weka stage is skipped")
+    parser.add_argument('-o', '--output', default=None,
+                        help="file where the results are saved as JSON")
+    parser.add_argument('-b', '--baseline', default=None,
+                        help="results saved by a previous run to compare with")
+    parser.add_argument('-t', '--tolerance', type=float, default=TOLERANCE,
+                        help="relative increase flagged as a regression (default: %(default)s)")
+    parser.add_argument('--keep', action='store_true',
+                        help="keep the scratch directories")
+    return parser
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ARGS = create_parser().parse_args()
+
+    # the Python stages run in this interpreter, as in solve.py
+    sys.path.insert(0, ROOTPATH + "/models")
+    sys.path.insert(0, ROOTPATH + "/parser")
+    import joinFile
+
+    TASKS = ARGS.tasks or [os.path.join(CORPUS, NAME) for NAME in sorted(os.listdir(CORPUS))
+                           if os.path.isfile(os.path.join(CORPUS, NAME, "domain.pddl"))]
+    RESULTS = dict()
+    for TASK in TASKS:
+        print " Running %s..." % TASK
+        RESULTS[os.path.basename(os.path.normpath(TASK))] = run_task(os.path.abspath(TASK), ARGS.stages or STAGES,
+                                                                     ARGS.repetitions, ARGS.dck, ARGS.keep)
+    report(RESULTS)
+
+    if ARGS.output:
+        with open(ARGS.output, "w") as STREAM:
+            json.dump({"host": {"node": platform.node(), "machine": platform.machine(),
+                                "python": platform.python_version(), "date": time.ctime()},
+                       "repetitions": ARGS.repetitions,
+                       "results": RESULTS}, STREAM, indent=1, sort_keys=True)
+
+    if ARGS.baseline:
+        REGRESSIONS = compare(RESULTS, json.load(open(ARGS.baseline))["results"], ARGS.tolerance)
+        for (TASK, STAGE, MEASURE, BEFORE, AFTER) in REGRESSIONS:
+            print " Regression - %s/%s %s: %s -> %s" % (TASK, STAGE, MEASURE, BEFORE, AFTER)
+        if REGRESSIONS:
+            sys.exit(1)
+        print " No regressions with respect to " + ARGS.baseline
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
@@ -0,0 +1,195 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# generate.py
+# Description: generator of the benchmark corpus
+# -----------------------------------------------------------------------------
+
+"""
+generator of the benchmark corpus
+
+Every task of the corpus is a typed delivery problem with action costs: trucks
+drive along roads of different lengths to carry packages to their
+destinations. They are typed and have action costs so that the PDDL files
+also have to be cleaned. A valid plan is written along with every task, so
+that VAL can be benchmarked as well.
+
+The tasks are generated with a fixed seed, so running this script again
+writes the same files.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import collections      # deque
+import os               # path and process management
+import random           # random generator
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+# name: (locations, trucks, packages)
+SIZES = {"small": (6, 1, 3),
+         "medium": (20, 3, 20),
+         "large": (60, 8, 80)}
+
+SEED = 2014
+
+DOMAIN = """(define (domain delivery)
+  (:requirements :typing :action-costs)
+  (:types location locatable - object
+          truck package - locatable)
+  (:predicates (road ?from ?to - location)
+               (at ?x - locatable ?l - location)
+               (in ?p - package ?t - truck))
+  (:functions (road-length ?from ?to - location) - number
+              (total-cost) - number)
+
+  (:action drive
+    :parameters (?t - truck ?from ?to - location)
+    :precondition (and (at ?t ?from) (road ?from ?to))
+    :effect (and (not (at ?t ?from)) (at ?t ?to)
+                 (increase (total-cost) (road-length ?from ?to))))
+
+  (:action load
+    :parameters (?t - truck ?p - package ?l - location)
+    :precondition (and (at ?t ?l) (at ?p ?l))
+    :effect (and (not (at ?p ?l)) (in ?p ?t)
+                 (increase (total-cost) 1)))
+
+  (:action unload
+    :parameters (?t - truck ?p - package ?l - location)
+    :precondition (and (at ?t ?l) (in ?p ?t))
+    :effect (and (not (in ?p ?t)) (at ?p ?l)
+                 (increase (total-cost) 1))))
+"""
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# roads
+#
+# returns a connected road network among the given number of locations as a
+# dictionary that maps every road (from, to) to its length
+# -----------------------------------------------------------------------------
+def roads(generator, locations):
+    """
+    returns a connected road network among the given number of locations as a
+    dictionary that maps every road (from, to) to its length
+    """
+
+    lengths = dict()
+    # a ring makes it connected, and a few shortcuts make it interesting
+    pairs = [(i, (i + 1) % locations) for i in xrange(locations)]
+    pairs += [tuple(generator.sample(xrange(locations), 2)) for i in xrange(locations // 2)]
+    for (a, b) in pairs:
+        if a != b and (a, b) not in lengths:
+            lengths[(a, b)] = lengths[(b, a)] = generator.randint(1, 20)
+    return lengths
+
+
+# -----------------------------------------------------------------------------
+# path
+#
+# returns the locations visited from 'start' to 'goal' along the given roads
+# -----------------------------------------------------------------------------
+def path(lengths, start, goal):
+    """
+    returns the locations visited from 'start' to 'goal' along the given roads
+    """
+
+    parents = {start: None}
+    queue = collections.deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            break
+        for (a, b) in sorted(lengths):
+            if a == current and b not in parents:
+                parents[b] = a
+                queue.append(b)
+    visited = [goal]
+    while parents[visited[-1]] is not None:
+        visited.append(parents[visited[-1]])
+    return visited[::-1]
+
+
+# -----------------------------------------------------------------------------
+# generate
+#
+# writes the domain, problem and plan of a task of the given size into
+# 'directory'
+# -----------------------------------------------------------------------------
+def generate(directory, name, locations, trucks, packages, seed=SEED):
+    """
+    writes the domain, problem and plan of a task of the given size into
+    'directory'
+    """
+
+    generator = random.Random(seed + locations)
+    lengths = roads(generator, locations)
+    start = [generator.randrange(locations) for i in xrange(trucks)]
+    origin = [generator.randrange(locations) for i in xrange(packages)]
+    goal = [generator.randrange(locations) for i in xrange(packages)]
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(os.path.join(directory, "domain.pddl"), "w") as stream:
+        stream.write(DOMAIN)
+
+    with open(os.path.join(directory, "problem.pddl"), "w") as stream:
+        stream.write("(define (problem delivery-%s)\n" % name)
+        stream.write("  (:domain delivery)\n")
+        stream.write("  (:requirements :typing :action-costs)\n")
+        stream.write("  (:objects\n")
+        stream.write("    %s - location\n" % " ".join("l%d" % i for i in xrange(locations)))
+        stream.write("    %s - truck\n" % " ".join("t%d" % i for i in xrange(trucks)))
+        stream.write("    %s - package)\n" % " ".join("p%d" % i for i in xrange(packages)))
+        stream.write("  (:init\n")
+        for (a, b) in sorted(lengths):
+            stream.write("    (road l%d l%d) (= (road-length l%d l%d) %d)\n" % (a, b, a, b, lengths[(a, b)]))
+        for (i, location) in enumerate(start):
+            stream.write("    (at t%d l%d)\n" % (i, location))
+        for (i, location) in enumerate(origin):
+            stream.write("    (at p%d l%d)\n" % (i, location))
+        stream.write("    (= (total-cost) 0))\n")
+        stream.write("  (:goal (and\n")
+        for (i, location) in enumerate(goal):
+            stream.write("    (at p%d l%d)\n" % (i, location))
+        stream.write("  ))\n")
+        stream.write("  (:metric minimize (total-cost)))\n")
+
+    # the first truck carries every package, one at a time
+    with open(os.path.join(directory, "plan.txt"), "w") as stream:
+        truck = start[0]
+        for package in xrange(packages):
+            for (where, to) in [(origin[package], "load"), (goal[package], "unload")]:
+                visited = path(lengths, truck, where)
+                for (a, b) in zip(visited, visited[1:]):
+                    stream.write("(drive t0 l%d l%d)\n" % (a, b))
+                truck = where
+                stream.write("(%s t0 p%d l%d)\n" % (to, package, where))
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    PARSER = argparse.ArgumentParser(description="Generate the benchmark corpus")
+    PARSER.add_argument('-d', '--directory', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="where the tasks are written (default: next to this script)")
+    ARGS = PARSER.parse_args()
+    for NAME in sorted(SIZES):
+        generate(os.path.join(ARGS.directory, NAME), NAME, *SIZES[NAME])
+        print "%s written" % os.path.join(ARGS.directory, NAME)
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
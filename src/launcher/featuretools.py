@@ -0,0 +1,345 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# featuretools.py
+# Description: time-budgeted feature extraction
+# -----------------------------------------------------------------------------
+
+"""
+time-budgeted feature extraction
+
+The extractors form a small DAG (e.g., preprocess needs the output.sas of the
+translator). Each extractor runs in its own scratch directory as soon as the
+extractors it requires have succeeded, so independent extractors run
+concurrently. Once all of them are done, the join step moves their outputs
+into the working directory, where joinFile.py expects them.
+
+The deadlines are wall-clock by default, as a solve has to plan within its
+time limit. When the features of many problems are extracted at once (e.g., to
+train the models), the load of the host would decide which extractors make
+their wall-clock deadline, so that the deadlines can be limits of CPU time
+instead.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import os               # path and process management
+import resource         # process resources
+import shutil           # copy files and directories
+import signal           # process management
+import subprocess       # extractor processes
+import sys              # stdout
+import time             # time mgmt
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+CHECK_INTERVAL = 0.5         # how often we query the extractors
+KILL_DELAY = 2               # how long we wait between SIGTERM and SIGKILL
+WALL_FACTOR = 4              # wall-clock guard of CPU deadlines, as a multiple
+
+# status of an extractor once the controller is done with it
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"          # a required extractor did not succeed
+
+SCRATCH_PREFIX = "features-" # scratch directory of each extractor
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# kill_pgrp
+#
+# sends the signal sig to the process group pgrp
+# -----------------------------------------------------------------------------
+def kill_pgrp(pgrp, sig):
+    """
+    sends the signal sig to the process group pgrp
+    """
+
+    try:
+        os.killpg(pgrp, sig)
+    except OSError:
+        pass
+
+
+# -----------------------------------------------------------------------------
+# remove_files
+#
+# removes the given files, if they exist
+# -----------------------------------------------------------------------------
+def remove_files(names):
+    """
+    removes the given files, if they exist
+    """
+
+    for name in names:
+        if os.path.isfile(name):
+            os.remove(name)
+
+
+# -----------------------------------------------------------------------------
+# Extractor
+#
+# a feature extractor is a shell command that writes the files in 'outputs'
+# within 'deadline' seconds (wall-clock, or CPU time, see FeatureController). It
+# starts once the extractors in 'requires' have succeeded, with their files in
+# 'inputs' linked into its scratch directory
+# -----------------------------------------------------------------------------
+class Extractor(object):
+
+    """
+    a feature extractor is a shell command that writes the files in 'outputs'
+    within 'deadline' seconds (wall-clock, or CPU time, see
+    FeatureController). It starts once the extractors in 'requires' have
+    succeeded, with their files in 'inputs' linked into its scratch directory
+    """
+
+    def __init__(self, name, command, outputs, deadline, requires=(), inputs=()):
+        self.name = name
+        self.command = command
+        self.outputs = outputs
+        self.deadline = deadline
+        self.requires = list(requires)
+        self.inputs = list(inputs)
+        self.directory = None
+        self.process = None
+        self.started = None
+        self.elapsed = None
+        self.status = None
+
+    def start(self, cwd, required, cpu_limit=None):
+        """
+        creates a clean scratch directory, links the inputs produced by the
+        required extractors and starts the command in its own process group,
+        with every process limited to cpu_limit seconds of CPU time if given
+        """
+
+        self.directory = os.path.join(cwd, SCRATCH_PREFIX + self.name)
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        os.mkdir(self.directory)
+        for name in self.inputs:
+            for extractor in required:
+                source = os.path.join(extractor.directory, name)
+                if os.path.isfile(source):
+                    os.symlink(source, os.path.join(self.directory, name))
+                    break
+        print "Run command: " + str(self.command)
+        sys.stdout.flush()
+        self.started = time.time()
+        self.process = subprocess.Popen(self.command, shell=True,
+                                        cwd=self.directory,
+                                        preexec_fn=lambda: _child_setup(cpu_limit))
+
+    def finish(self, status):
+        """
+        records the status and elapsed time
+        """
+
+        self.status = status
+        if self.started is None:
+            self.elapsed = 0
+        else:
+            self.elapsed = time.time() - self.started
+
+    def join(self, cwd):
+        """
+        moves the outputs into the directory cwd. The outputs of unsuccessful
+        extractors are removed from cwd instead, so that their feature group
+        is imputed rather than read from a previous run
+        """
+
+        for name in self.outputs:
+            target = os.path.join(cwd, name)
+            remove_files([target])
+            if self.status == OK:
+                source = os.path.join(self.directory, name)
+                if os.path.isfile(source):
+                    os.rename(source, target)
+
+    def cleanup(self):
+        """
+        removes the scratch directory
+        """
+
+        if self.directory is not None and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+
+def _child_setup(cpu_limit=None):
+    os.setpgrp()
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if cpu_limit:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + KILL_DELAY))
+
+
+# -----------------------------------------------------------------------------
+# FeatureController
+#
+# runs the DAG of extractors within a global budget
+# -----------------------------------------------------------------------------
+class FeatureController(object):
+
+    """
+    runs the DAG of extractors within a global budget, every extractor as soon
+    as the ones it requires have succeeded. Extractors that exceed their own
+    deadline or the global budget are killed, and those depending on a
+    failed extractor are skipped, so that the feature vector is joined with
+    the missing groups imputed
+
+    If cpu_time is given, the deadlines limit the CPU time of every process
+    of the extractors (RLIMIT_CPU), so that the result does not depend on the
+    load of the host. The wall-clock deadlines and the budget are then
+    WALL_FACTOR times longer, and only catch extractors that hang
+    """
+
+    def __init__(self, budget, cwd=None, cpu_time=False):
+        self.budget = budget
+        self.cwd = os.path.abspath(cwd or os.getcwd())
+        self.cpu_time = cpu_time
+        self.wall_factor = WALL_FACTOR if cpu_time else 1
+        self.extractors = []
+        self.started = None
+        self.finished = None
+
+    def add(self, extractor):
+        names = [other.name for other in self.extractors]
+        assert extractor.name not in names, extractor.name
+        # requiring only extractors added before keeps the graph acyclic
+        for name in extractor.requires:
+            assert name in names, "unknown extractor %s" % name
+        self.extractors.append(extractor)
+
+    def get(self, name):
+        for extractor in self.extractors:
+            if extractor.name == name:
+                return extractor
+        raise KeyError(name)
+
+    def elapsed(self):
+        """
+        time spent so far (or in total, once run has returned)
+        """
+
+        end = self.finished if self.finished is not None else time.time()
+        return end - self.started
+
+    def remaining(self):
+        """
+        part of the budget that was not used
+        """
+
+        return max(0, self.budget - self.elapsed())
+
+    def _schedule(self, pending, running):
+        """
+        starts the pending extractors whose requirements are met and skips
+        those that can no longer run
+        """
+
+        for extractor in list(pending):
+            required = [self.get(name) for name in extractor.requires]
+            if any(other.status not in (None, OK) for other in required):
+                pending.remove(extractor)
+                extractor.finish(SKIPPED)
+            elif all(other.status == OK for other in required):
+                pending.remove(extractor)
+                extractor.start(self.cwd, required,
+                                extractor.deadline if self.cpu_time else None)
+                running.append(extractor)
+
+    def run(self):
+        """
+        runs all extractors and returns when every one of them has finished,
+        has been killed or has been skipped
+        """
+
+        self.started = time.time()
+        pending = list(self.extractors)
+        running = []
+        terminated = {}
+        self._schedule(pending, running)
+        while running:
+            time.sleep(CHECK_INTERVAL)
+            now = time.time()
+            for extractor in list(running):
+                if extractor.process.poll() is not None:
+                    running.remove(extractor)
+                    if extractor in terminated:
+                        extractor.finish(TIMEOUT)
+                    elif extractor.process.returncode == 0:
+                        extractor.finish(OK)
+                    elif extractor.process.returncode in (-signal.SIGXCPU, 128 + signal.SIGXCPU):
+                        # out of CPU time, either the shell or its command
+                        extractor.finish(TIMEOUT)
+                    else:
+                        extractor.finish(FAILED)
+                    continue
+
+                pgrp = extractor.process.pid
+                if extractor not in terminated:
+                    if (now - extractor.started >= extractor.deadline * self.wall_factor or
+                        now - self.started >= self.budget * self.wall_factor):
+                        print ("c extractor %s out of time: SIGTERM" % extractor.name)
+                        kill_pgrp(pgrp, signal.SIGTERM)
+                        terminated[extractor] = now
+                elif now - terminated[extractor] >= KILL_DELAY:
+                    print ("c extractor %s out of time: SIGKILL" % extractor.name)
+                    kill_pgrp(pgrp, signal.SIGKILL)
+            self._schedule(pending, running)
+
+        # the commands may have left children behind in their process groups
+        for extractor in self.extractors:
+            if extractor.process is not None:
+                kill_pgrp(extractor.process.pid, signal.SIGKILL)
+        self.finished = time.time()
+
+    def kill(self):
+        """
+        kills the extractors that are still running, e.g. when the features
+        are no longer needed
+        """
+
+        for extractor in self.extractors:
+            if extractor.process is not None and extractor.process.poll() is None:
+                kill_pgrp(extractor.process.pid, signal.SIGKILL)
+
+    def join(self, cleanup=True):
+        """
+        moves the outputs of every extractor into the working directory and,
+        unless told otherwise, removes the scratch directories
+        """
+
+        for extractor in self.extractors:
+            extractor.join(self.cwd)
+            if cleanup:
+                extractor.cleanup()
+
+    def report(self):
+        """
+        prints how each extractor ended and the budget left for planning
+        """
+
+        for extractor in self.extractors:
+            print "Extractor %s: %s in %.2f seconds" % (extractor.name, extractor.status, extractor.elapsed)
+        print "Feature extraction took %.2f seconds, %.2f seconds left of its budget" % (self.elapsed(), self.remaining())
+
+    def imputed(self):
+        """
+        returns the names of the extractors whose feature group is imputed
+        """
+
+        return [extractor.name for extractor in self.extractors if extractor.status != OK]
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
@@ -0,0 +1,266 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# pddltools.py
+# Description: lazily cleaned variants of the PDDL files
+# -----------------------------------------------------------------------------
+
+"""
+lazily cleaned variants of the PDDL files
+
+Most planners of the portfolio read the problem without the :typing
+requirement, and lpg and sgplan also read the domain and problem without
+action costs. Cleaning them parses the files with pyparsing, which takes a
+while on large problems, so the variants are only produced right before the
+first planner that needs them, and never if no such planner runs.
+
+A quick look at the text of the files tells whether they need cleaning at all:
+if the problem does not declare :typing, or neither file uses action costs
+(nor anything else clean_action_costs.py rewrites), the original files are
+used as they are. The cleaned files are cached by the contents of their inputs
+below $PORTFOLIO_CLEAN_CACHE (a directory next to the workspaces by default),
+so that solving the same problem again does not parse it again. The workspaces
+may live in a tmpfs, so the cache is pruned whenever a solve starts: files not
+used for a while are removed, and then the least recently used ones until the
+cache fits in its size cap.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import hashlib          # cache keys
+import os               # path and process management
+import re               # requirements sniffing
+import shutil           # copy files
+import tempfile         # unique filenames
+import time             # file ages
+
+import workspace        # per-solve scratch workspaces
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+CACHE_ENV = "PORTFOLIO_CLEAN_CACHE"
+CACHE_DIR = "pddl-cache"     # below the root of the workspaces
+CACHE_VERSION = "1"          # to be increased whenever the cleaning changes
+CACHE_MAX_AGE = 3 * 86400    # seconds a cleaned file is kept since last used
+CACHE_MAX_SIZE = 256 << 20   # bytes taken by the cache at most
+
+# a problem needs clean_typing.py if its requirements declare :typing
+TYPING = re.compile(r"\(\s*:requirements[^)]*:typing\b")
+
+# a domain needs clean_action_costs.py if it has action costs or numeric
+# fluents, or empty preconditions or effects, which are also rewritten
+DOMAIN_COSTS = re.compile(r":action-costs\b|:functions\b|\(\s*increase\b|total-cost"
+                          r"|:precondition\s*\(\s*\)|:effect\s*\(\s*\)")
+
+# and a problem if it has numeric fluents or a metric
+PROBLEM_COSTS = re.compile(r"\(\s*=|:metric\b|total-cost")
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# read_pddl
+#
+# returns the text of a PDDL file in lowercase and without comments, as the
+# cleaning scripts see it
+# -----------------------------------------------------------------------------
+def read_pddl(filename):
+    """
+    returns the text of a PDDL file in lowercase and without comments, as the
+    cleaning scripts see it
+    """
+
+    return "\n".join(line.split(";", 1)[0] for line in open(filename).read().lower().splitlines())
+
+
+# -----------------------------------------------------------------------------
+# digest
+#
+# returns the cache key of a variant computed from the given files
+# -----------------------------------------------------------------------------
+def digest(variant, *filenames):
+    """
+    returns the cache key of a variant computed from the given files
+    """
+
+    key = hashlib.sha1(CACHE_VERSION + variant)
+    for filename in filenames:
+        key.update("\0" + open(filename, "rb").read())
+    return key.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# default_cache
+#
+# returns the directory where the cleaned files are cached according to the
+# environment
+# -----------------------------------------------------------------------------
+def default_cache():
+    """
+    returns the directory where the cleaned files are cached according to the
+    environment
+    """
+
+    if os.environ.get(CACHE_ENV):
+        return os.path.abspath(os.environ[CACHE_ENV])
+    return os.path.join(workspace.default_root(), CACHE_DIR)
+
+
+# -----------------------------------------------------------------------------
+# prune_cache
+#
+# removes the cleaned files that were not used in the last max_age seconds and
+# then the least recently used ones until the rest take at most max_size
+# bytes. It returns the number of files removed
+# -----------------------------------------------------------------------------
+def prune_cache(cache=None, max_age=CACHE_MAX_AGE, max_size=CACHE_MAX_SIZE):
+    """
+    removes the cleaned files that were not used in the last max_age seconds
+    and then the least recently used ones until the rest take at most max_size
+    bytes. It returns the number of files removed
+    """
+
+    if cache is None:
+        cache = default_cache()
+    entries = []
+    for (dirpath, dirnames, filenames) in os.walk(cache):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+
+    # the most recently used files are kept first
+    entries.sort(reverse=True)
+    now = time.time()
+    size = 0
+    removed = 0
+    for (mtime, filesize, path) in entries:
+        size += filesize
+        if now - mtime > max_age or size > max_size:
+            # other solves may be pruning the same files
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+# -----------------------------------------------------------------------------
+# CleanedFiles
+#
+# the variants of a domain and problem that the planners read, produced when
+# they are first asked for
+# -----------------------------------------------------------------------------
+class CleanedFiles(object):
+
+    """
+    the variants of a domain and problem that the planners read, produced when
+    they are first asked for
+    """
+
+    def __init__(self, domain, problem, directory, cache=None):
+        self.domain = domain
+        self.problem = problem
+        # the cleaned files are written here when they cannot be cached
+        self.directory = directory
+        self.cache = cache if cache is not None else default_cache()
+        self.stem = {domain: self._stem(domain), problem: self._stem(problem)}
+        self.variants = dict()
+
+    def _stem(self, filename):
+        name = os.path.basename(filename)
+        return name[:name.rfind(".")] if "." in name else name
+
+    def problem_without_typing(self):
+        """
+        returns the problem without the :typing requirement
+        """
+
+        if "wtp" not in self.variants:
+            if TYPING.search(read_pddl(self.problem)):
+                import clean_typing
+                self.variants["wtp"] = self._clean("wtp", clean_typing.clean_problem_typing,
+                                                   self.problem, self.problem)
+            else:
+                print "Problem without :typing, it is used as it is"
+                self.variants["wtp"] = self.problem
+        return self.variants["wtp"]
+
+    def without_action_costs(self):
+        """
+        returns the domain without action costs and the problem without them
+        and without the :typing requirement
+        """
+
+        if "wac" not in self.variants:
+            problem = self.problem_without_typing()
+            if (DOMAIN_COSTS.search(read_pddl(self.domain)) or
+                PROBLEM_COSTS.search(read_pddl(problem))):
+                import clean_action_costs
+                domain = self._clean("wac", clean_action_costs.clean_domain_action_costs,
+                                     self.domain, self.domain)
+                # the problem declares the predicate added to the domain
+                if domain != self.domain:
+                    problem = self._clean("wtp_and_wac", clean_action_costs.clean_problem_action_costs,
+                                          problem, self.problem)
+                self.variants["wac"] = (domain, problem)
+            else:
+                print "No action costs, the files are used as they are"
+                self.variants["wac"] = (self.domain, problem)
+        return self.variants["wac"]
+
+    def _clean(self, variant, clean, source, original):
+        """
+        returns the file written by 'clean' from 'source', taking it from the
+        cache if it is there. 'original' names the file and is returned if the
+        cleaning fails, so that the planners still get a file to read
+        """
+
+        key = digest(variant, source)
+        name = "%s_%s.txt" % (self.stem[original], variant)
+        cached = os.path.join(self.cache, key[:2], key + "-" + name)
+        if os.path.isfile(cached):
+            print "Cleaned file %s taken from the cache" % name
+            # its modification time tells prune_cache when it was last used
+            try:
+                os.utime(cached, None)
+            except OSError:
+                pass
+            return cached
+
+        target = os.path.join(self.directory, name)
+        print "Run stage: %s" % clean.__name__
+        try:
+            clean(source, target)
+        except (Exception, SystemExit) as error:
+            print "Stage %s failed: %s" % (clean.__name__, error)
+            return original
+        if not os.path.isfile(target):
+            return original
+
+        # several solves may store the same file at once: the last one wins
+        try:
+            if not os.path.isdir(os.path.dirname(cached)):
+                os.makedirs(os.path.dirname(cached))
+            (handle, partial) = tempfile.mkstemp(dir=os.path.dirname(cached))
+            os.close(handle)
+            shutil.copyfile(target, partial)
+            os.rename(partial, cached)
+        except (IOError, OSError) as error:
+            print "Cleaned file %s not cached: %s" % (name, error)
+        return target
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
@@ -7,14 +7,19 @@ __email__ = "icenamor@inf.uc3m.es"
 # imports
 # -----------------------------------------------------------------------------
 import os               # path and process management
+import pickle           # predictions of the full tier
 import resource         # process resources
 import shutil           # copy files and directories
 import signal           # process management
 import sys              # argv, exit
 import time             # time mgmt
+import traceback        # errors of the full tier
 
+import featuretools     # time-budgeted feature extraction
+import pddltools        # lazily cleaned variants of the PDDL files
 import systools         # IPC process management
 import timetools        # IPC timing management
+import workspace        # per-solve scratch workspaces
 import math
 
 # -----------------------------------------------------------------------------
@@ -25,6 +30,22 @@ import math
 CHECK_INTERVAL = 5           # how often we query the process group status
 KILL_DELAY = 5               # how long we wait between SIGTERM and SIGKILL
 
+FEATURES_BUDGET = 300        # wall-clock seconds for the whole feature extraction
+TRANSLATE_DEADLINE = 180     # translate_client.py
+PREPROCESS_DEADLINE = 120    # preprocess, started once output.sas is ready
+FFLEARNER_DEADLINE = 120     # roller3.0
+HEURISTICS_DEADLINE = 180    # training.sh (its search is also limited to 100s CPU)
+
+MODELS_FILE = "models.txt"   # models selected by the learner (see createModel/selection.py)
+
+# kinds of models in the DCK. Those of the lifted features only need the parsed
+# task (see features/translate/lifted.py) and, if the learner selected them,
+# choose the first planners while the rest of the features are extracted
+KINDS = ["classification", "regression", "lifted-classification", "lifted-regression"]
+
+# attributes of the features removed before the models are applied
+ATTRIBUTES = "1-3,6,8,10-14,16-17,19-22,24,26-27,29-34,36-37,39,41-44,47-52,55-59,62-71,73-79,82-83,85,92-93"
+
 
 # -----------------------------------------------------------------------------
 
@@ -77,6 +98,9 @@ def kill_pgrp(pgrp, sig):
 #
 # Time is measured in seconds and memory in bytes
 #
+# Every plan is timestamped as soon as it appears in the plans folder with the
+# monotonic clock, relative to the start of the solve, and the times of the
+# plans kept are added to solution_times
 # -----------------------------------------------------------------------------
 def run (script, domain, problem, plan_sol, timeout, memory):
     global counter
@@ -84,6 +108,7 @@ def run (script, domain, problem, plan_sol, timeout, memory):
 
     # create a timer
     runtimer = timetools.Timer ()
+    events = timetools.PlanEvents (plans_folder, cleaned_plan_file + "*")
 
     # Now, a child is created which will host the planner execution while this
     # process simply monitors the resource comsumption. If any is exceeded the
@@ -100,7 +125,7 @@ def run (script, domain, problem, plan_sol, timeout, memory):
 
         real_time = 0
         while True:
-            time.sleep(CHECK_INTERVAL)
+            events.sleep(CHECK_INTERVAL)
             real_time += CHECK_INTERVAL
 
             data = os.system("ls -l " + plans_folder + "/" + cleaned_plan_file + "* > /dev/null 2>&1")
@@ -145,6 +170,9 @@ def run (script, domain, problem, plan_sol, timeout, memory):
                         elif((counter == 1) or (current_cost < best_cost)):
                             best_cost = current_cost
                             print "New best plan cost found: " + str(best_cost)
+                            solution_time = events.when(os.path.basename(name))
+                            print "Plan found at %.3f seconds" % solution_time
+                            solution_times.append(solution_time)
                             command = "mv " + name + " " + original_plan_file + "." + str(counter)
                             print "Run command: " + str(command)
                             os.system(command)
@@ -215,9 +243,6 @@ def run_portfolio (planners, timeouts, memory):
 
     print "\nOriginal_Domain: " + str(original_domain_file)
     print "Original_Problem: " + str(original_problem_file)
-    print "Domain_wac: " + str(domain_file_wac)
-    print "Problem_wtp: " + str(problem_file_wtp)
-    print "Problem_wtp_and_wac: " + str(problem_file_wtp_and_wac)
     print "Original_Plan_file: " + str(original_plan_file)
     print "Plans folder: " + str(plans_folder) + "\n"
 
@@ -231,16 +256,23 @@ def run_portfolio (planners, timeouts, memory):
         print "*** Planner_path: " + planner + " TimeOut: " + str(timeout) + " ***"
         print "****************************************************\n\n"
 
+        # the cleaned files are only produced once a planner needs them, and
+        # the time it takes is charged to that planner
+        started = time.time()
         result = plans_folder + "/" + cleaned_plan_file
         if((planner.find("lpg") >= 0) or (planner.find("sgplan") >= 0)):
-            executed_time = run (planner, domain_file_wac, problem_file_wtp_and_wac, result, timeout, memory)
-            print "Planner " + planner + " run " + str(executed_time) + " seconds\n"
-            accumulated_time += executed_time
-
+            (domain_file, problem_file) = cleaned_files.without_action_costs()
+            print "Domain_wac: " + str(domain_file)
+            print "Problem_wtp_and_wac: " + str(problem_file)
         else:
-            executed_time = run (planner, original_domain_file, problem_file_wtp, result, timeout, memory)
-            print "Planner " + planner + " run " + str(executed_time) + " seconds\n"
-            accumulated_time += executed_time
+            (domain_file, problem_file) = (original_domain_file, cleaned_files.problem_without_typing())
+            print "Problem_wtp: " + str(problem_file)
+        cleaning_time = time.time() - started
+        timeout = max(1, int(timeout - cleaning_time))
+
+        executed_time = run (planner, domain_file, problem_file, result, timeout, memory) + cleaning_time
+        print "Planner " + planner + " run " + str(executed_time) + " seconds\n"
+        accumulated_time += executed_time
 
 
         # If we are in optimal planning and the optimal solution was found, we finish the execution
@@ -249,14 +281,335 @@ def run_portfolio (planners, timeouts, memory):
 
     return accumulated_time
     
-def readFile(data, name):
-	fd = open(name,'r')
-	data2 = []
-	data2 = fd.readlines()
-	fd.close()
-	for i in data2:
-	    data.append(i[:-1])
-	return data
+# -----------------------------------------------------------------------------
+# run_stage
+#
+# runs a Python stage of the pipeline in this interpreter and returns its
+# result, or None if it failed. As when they ran as separate scripts, a failed
+# stage does not stop the solve: the next stages find its files missing
+# -----------------------------------------------------------------------------
+def run_stage(stage, *args):
+    """
+    runs a Python stage of the pipeline in this interpreter and returns its
+    result, or None if it failed. As when they ran as separate scripts, a failed
+    stage does not stop the solve: the next stages find its files missing
+    """
+
+    try:
+        result = stage(*args)
+    except (Exception, SystemExit) as error:
+        print "Stage %s failed: %s" % (stage.__name__, error)
+        return None
+    # some stages only write files
+    if result is None:
+        return True
+    return result
+
+
+# -----------------------------------------------------------------------------
+# feature_extractors
+#
+# returns the extractors of the features of the given domain and problem
+# -----------------------------------------------------------------------------
+def feature_extractors(rootpath, domain, problem):
+    """
+    returns the extractors of the features of the given domain and problem
+    """
+
+    extractors = []
+    # translate_client.py uses a resident translator server if one is
+    # listening on $TRANSLATE_SERVER_SOCKET and translates in-process otherwise
+    command = "python2.7 " + rootpath + "/features/translate/translate_client.py " + domain + " " + problem
+    extractors.append(featuretools.Extractor("translate", command, ["translateFile", "translateProfile", "output.sas"], TRANSLATE_DEADLINE))
+    command = rootpath + "/features/preprocess/preprocess < output.sas"
+    extractors.append(featuretools.Extractor("preprocess", command, ["features.arff", "output"], PREPROCESS_DEADLINE,
+                                             requires=["translate"], inputs=["output.sas"]))
+    command = rootpath + "/features/ff-learner/roller3.0 -o " + domain + " -f " + problem + " -S 28"
+    extractors.append(featuretools.Extractor("ff-learner", command, ["initfeature-info.txt"], FFLEARNER_DEADLINE))
+    command = rootpath + "/features/heuristics/training.sh "  + domain + " " + problem
+    extractors.append(featuretools.Extractor("heuristics", command, ["tmp_results"], HEURISTICS_DEADLINE))
+    return extractors
+
+
+# -----------------------------------------------------------------------------
+# weka_commands
+#
+# returns the commands that select the attributes of the features of the given
+# kind (see KINDS) and predict them with its model. The lifted features are
+# written with the attributes of their models (see joinFileLifted.py), so they
+# are not filtered
+# -----------------------------------------------------------------------------
+def weka_commands(rootpath, dck_folder, models, kind):
+    """
+    returns the commands that select the attributes of the features of the
+    given kind (see KINDS) and predict them with its model
+    """
+
+    output = {"classification": "outputModel", "regression": "outputModelRegression",
+              "lifted-classification": "outputModelLifted",
+              "lifted-regression": "outputModelLiftedRegression"}[kind]
+    if kind.startswith("lifted-"):
+        suffix = {"lifted-classification": "", "lifted-regression": "_regression"}[kind]
+        return ["java -Xmx1024M -cp "+ rootpath +"/models/weka.jar " + models[kind][0] + " -l "+ dck_folder +"/" + models[kind][1] + " -T global_features_lifted" + suffix + ".arff -p " + str(joinFileLifted.PLANNER_ATTRIBUTE) + " > " + output]
+    suffix = {"classification": "", "regression": "_regression"}[kind]
+    ##java -Xmx1024M -cp models/weka.jar weka.classifiers.trees.J48 -l models/generalJ48.model -T global_features_simply.arff -p 96 > models/outputModel
+    return ["java -cp "+ rootpath +"/models/weka.jar -Xmx2048M weka.filters.unsupervised.attribute.Remove -R " + ATTRIBUTES + " -i global_features" + suffix + ".arff -o global_features_simply" + suffix + ".arff",
+            "java -Xmx1024M -cp "+ rootpath +"/models/weka.jar " + models[kind][0] + " -l "+ dck_folder +"/" + models[kind][1] + " -T global_features_simply" + suffix + ".arff -p 35 > " + output]
+
+
+# -----------------------------------------------------------------------------
+# read_models
+#
+# returns the Weka class and model file of every kind of model in the DCK
+# folder, as described by the models file written by the learner. Without it,
+# the classification and regression models are the default ones. There are no
+# default lifted models: they are only used if the learner selected them
+# -----------------------------------------------------------------------------
+def read_models(dck_folder):
+    """
+    returns the Weka class and model file of every kind of model in the DCK
+    folder, as described by the models file written by the learner. Without
+    it, the classification and regression models are the default ones
+    """
+
+    models = {"classification": ("weka.classifiers.trees.RandomForest", "trees.RandomFores.model"),
+              "regression": ("weka.classifiers.rules.DecisionTable", "rules.DecisionTable.model")}
+    filename = os.path.join(dck_folder, MODELS_FILE)
+    if os.path.isfile(filename):
+        for line in open(filename):
+            fields = line.split()
+            if len(fields) >= 3 and fields[0] in KINDS:
+                models[fields[0]] = (fields[1], fields[2])
+    return models
+
+
+# -----------------------------------------------------------------------------
+# run_weka
+#
+# runs the Weka commands of the given kinds of models in the current directory
+# -----------------------------------------------------------------------------
+def run_weka(rootpath, dck_folder, models, kinds):
+    """
+    runs the Weka commands of the given kinds of models in the current directory
+    """
+
+    for kind in kinds:
+        for command in weka_commands(rootpath, dck_folder, models, kind):
+            print "Run command: " + str(command)
+            os.system(command)
+
+
+# -----------------------------------------------------------------------------
+# extract_features
+#
+# runs the feature extractors of the given domain and problem with the given
+# controller and moves their outputs into its directory
+# -----------------------------------------------------------------------------
+def extract_features(controller, rootpath, domain, problem):
+    """
+    runs the feature extractors of the given domain and problem with the given
+    controller and moves their outputs into its directory
+    """
+
+    # Only preprocess depends on another extractor (the output.sas of the
+    # translator); the rest run concurrently, each in its own scratch
+    # directory. Those that run out of time are killed, those depending
+    # on them skipped, and joinFile.py imputes their features with '?'
+    for extractor in feature_extractors(rootpath, domain, problem):
+        controller.add(extractor)
+    controller.run()
+    controller.join()
+    controller.report()
+
+
+# -----------------------------------------------------------------------------
+# full_predictions
+#
+# returns the probabilities and runtimes predicted by the models of the full
+# features, which have been extracted into the current directory
+# -----------------------------------------------------------------------------
+def full_predictions(rootpath, dck_folder, models):
+    """
+    returns the probabilities and runtimes predicted by the models of the full
+    features, which have been extracted into the current directory
+    """
+
+    print "Run stage: joinFile"
+    features = run_stage(joinFile.join_file, os.getcwd())
+    run_weka(rootpath, dck_folder, models, ["classification"])
+    print "Run stage: parseWekaOutputFile"
+    probabilities = run_stage(parseWekaOutputFile.predictions, "outputModel")
+    print "************ Start Regression **********************"
+    ##the runtime of every planner is predicted, so that the scheduler
+    ##can choose among all of them
+    print "Run stage: joinFileRegression"
+    if probabilities:
+        run_stage(joinFileRegression.join_file_regression, os.getcwd(), sorted(probabilities), features)
+    run_weka(rootpath, dck_folder, models, ["regression"])
+    print "Run stage: parseWekaOutputFileRegression"
+    runtimes = run_stage(parseWekaOutputFileRegression.predictions, "outputModelRegression")
+    return (probabilities, runtimes)
+
+
+# -----------------------------------------------------------------------------
+# lifted_predictions
+#
+# returns the probabilities and runtimes predicted by the models of the lifted
+# features, which only need the parsed task and are computed in this process
+# -----------------------------------------------------------------------------
+def lifted_predictions(rootpath, dck_folder, models, domain, problem):
+    """
+    returns the probabilities and runtimes predicted by the models of the
+    lifted features, which only need the parsed task and are computed in this
+    process
+    """
+
+    print "Run stage: lifted"
+    features = run_stage(lifted.lifted_features, domain, problem)
+    if not features:
+        return (None, None)
+    print "Run stage: joinFileLifted"
+    run_stage(joinFileLifted.join_file_lifted, os.getcwd(), features)
+    run_weka(rootpath, dck_folder, models, ["lifted-classification", "lifted-regression"])
+    print "Run stage: parseWekaOutputFile (lifted)"
+    probabilities = run_stage(parseWekaOutputFile.predictions, "outputModelLifted")
+    print "Run stage: parseWekaOutputFileRegression (lifted)"
+    runtimes = run_stage(parseWekaOutputFileRegression.predictions, "outputModelLiftedRegression")
+    return (probabilities, runtimes)
+
+
+# -----------------------------------------------------------------------------
+# FullTier
+#
+# extracts the full features and applies their models in a child process,
+# while the planners chosen by the lifted models run
+# -----------------------------------------------------------------------------
+class FullTier(object):
+
+    """
+    extracts the full features and applies their models in a child process in
+    'directory', while the planners chosen by the lifted models run. The
+    predictions are sent back through a pipe once the child is done
+    """
+
+    def __init__(self, rootpath, dck_folder, models, domain, problem, directory):
+        self.rootpath = rootpath
+        self.dck_folder = dck_folder
+        self.models = models
+        self.domain = domain
+        self.problem = problem
+        self.directory = directory
+        self.pid = None
+        self.pipe = None
+
+    def start(self):
+        """
+        forks the child that extracts the features in its own process group
+        """
+
+        (read_fd, write_fd) = os.pipe()
+        sys.stdout.flush()
+        self.pid = os.fork()
+        if not self.pid:                                         # child's code
+            code = 1
+            try:
+                os.close(read_fd)
+                os.setpgrp()
+                os.chdir(self.directory)
+                controller = featuretools.FeatureController(FEATURES_BUDGET, self.directory)
+                # the extractors run in process groups of their own
+                def terminate(signum, frame):
+                    controller.kill()
+                    os._exit(1)
+                signal.signal(signal.SIGTERM, terminate)
+                extract_features(controller, self.rootpath, self.domain, self.problem)
+                predictions = full_predictions(self.rootpath, self.dck_folder, self.models)
+                output = os.fdopen(write_fd, "w")
+                pickle.dump(predictions, output)
+                output.close()
+                code = 0
+            except Exception:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+        os.close(write_fd)
+        self.pipe = os.fdopen(read_fd)
+
+    def poll(self):
+        """
+        returns the probabilities and runtimes predicted by the child once it
+        is done (only once), and None otherwise
+        """
+
+        if self.pid is None:
+            return None
+        (pid, status) = os.waitpid(self.pid, os.WNOHANG)
+        if pid == 0:
+            return None
+        self.pid = None
+        try:
+            predictions = pickle.load(self.pipe)
+        except (EOFError, pickle.UnpicklingError):
+            predictions = (None, None)
+        self.pipe.close()
+        return predictions
+
+    def stop(self):
+        """
+        kills the child and its extractors if it is still running
+        """
+
+        if self.pid is None:
+            return
+        kill_pgrp(self.pid, signal.SIGTERM)
+        for i in xrange(KILL_DELAY):
+            if os.waitpid(self.pid, os.WNOHANG)[0] != 0:
+                break
+            time.sleep(1)
+        else:
+            kill_pgrp(self.pid, signal.SIGKILL)
+            os.waitpid(self.pid, 0)
+        self.pid = None
+        self.pipe.close()
+
+
+# -----------------------------------------------------------------------------
+# run_tiered_portfolio
+#
+# runs the planners in 'slices' one at a time. Once the full tier is done, the
+# planners that did not run are scheduled again with its predictions within the
+# time left until 'deadline'
+# -----------------------------------------------------------------------------
+def run_tiered_portfolio (slices, tier, memory, deadline):
+
+    accumulated_time = 0
+    done = []
+    slices = list(slices)
+    while slices:
+        (planner, timer) = slices.pop(0)
+        accumulated_time += run_portfolio ([planner], [int(timer)], memory)
+        done.append(planner)
+
+        # If we are in optimal planning and the optimal solution was found, we finish the execution
+        if((counter > 1) and (optimal_planning)):
+            break
+
+        predictions = tier.poll()
+        if predictions is not None:
+            (probabilities, runtimes) = predictions
+            if probabilities and runtimes:
+                probabilities = dict((p, probabilities[p]) for p in probabilities if p not in done)
+                slices = schedule.schedule(probabilities, runtimes, deadline - time.time())
+                print "\nFull features ready, portfolio configuration:"
+                for p, t in slices:
+                    print "planner,time", p + " " + str(int(t))
+            else:
+                print "\nFull features failed, keeping the portfolio of the lifted features"
+
+    tier.stop()
+    return accumulated_time
+
 
 # main
 # -----------------------------------------------------------------------------
@@ -266,6 +619,7 @@ if __name__ == '__main__':
     timelimit = 900
     best_cost = -1
     counter = 1
+    solution_times = []
     knowledge = False
     planners = []
     timeouts = []
@@ -301,7 +655,9 @@ if __name__ == '__main__':
                     sys.exit(-1)
 
             elif(sys.argv[i] == "-p"):
-                original_plan_file = sys.argv[i+1]
+                # the solve runs in its own workspace, so the plan file has
+                # to be resolved against the directory we were invoked from
+                original_plan_file = os.path.abspath(sys.argv[i+1])
 
             else:
                 print >> sys.stderr, "Error: unexpected parameter: " + sys.argv[i]
@@ -323,110 +679,104 @@ if __name__ == '__main__':
     pathname = os.path.dirname(sys.argv[0])
     currentpath = os.path.abspath(pathname)
     rootpath = os.path.abspath(os.path.join(currentpath,"..")) 
+
+    # The Python stages of the pipeline (cleaning the PDDL files, joining the
+    # features and parsing the Weka predictions) run in this interpreter. The
+    # cleaning scripts are only imported by pddltools if they are needed
+    sys.path.insert(0, rootpath + "/models")
+    sys.path.insert(0, rootpath + "/parser")
+    import joinFile
+    import joinFileLifted
+    import joinFileRegression
+    import parseWekaOutputFile
+    import parseWekaOutputFileRegression
+    import schedule
+
+    # Every intermediate file (features, models, cleaned PDDL files, plans) is
+    # written into a private workspace, so that several solves can share a
+    # host. It is removed when we exit
+    solve_workspace = workspace.Workspace()
+    os.chdir(solve_workspace.create())
+    print "Workspace: " + solve_workspace.directory + "\n"
+
     # Loading knowledge
+    tier = None
     if(knowledge):
-        print "Extract Features with original problem and domain"
-        command = "python2.7 " + rootpath + "/features/translate/translate.py " + original_domain_file + " " + original_problem_file
-        print "Run command: " + str(command)
-        os.system(command)
-        command =  rootpath + "/features/preprocess/preprocess < output.sas"
-        print "Run command: " + str(command)
-        os.system(command)
-        command = rootpath + "/features/ff-learner/roller3.0 -o " + original_domain_file + " -f " + original_problem_file + " -S 28"
-        print "Run command: " + str(command)
-        os.system(command)
-        command = rootpath + "/features/heuristics/training.sh "  + original_domain_file + " " + original_problem_file
-        print "Run command: " + str(command)
-        os.system(command)
-        actual_rootpath = rootpath + "/models"
-        command = "python2.7 "+ actual_rootpath + "/joinFile.py " + rootpath[:rootpath.rfind("/")+1] + " \n"
-        print "Run command: " + str(command)
-        
-        os.system(command)
-        command = "java -cp "+ rootpath +"/models/weka.jar -Xmx2048M weka.filters.unsupervised.attribute.Remove -R 1-3,6,8,10-14,16-17,19-22,24,26-27,29-34,36-37,39,41-44,47-52,55-59,62-71,73-79,82-83,85,92-93 -i global_features.arff -o global_features_simply.arff"
-        print "Run command: " + str(command)
-        os.system(command)
-        ##java -Xmx1024M -cp models/weka.jar weka.classifiers.trees.J48 -l models/generalJ48.model -T global_features_simply.arff -p 96 > models/outputModel
-        command = "java -Xmx1024M -cp "+ rootpath +"/models/weka.jar weka.classifiers.trees.RandomForest -l "+ dck_folder +"/trees.RandomFores.model -T global_features_simply.arff -p 35 > outputModel"
-        print "Run command: " + str(command)
-        os.system(command)
-        ## python models/parseWekaOutputFile.py models/outputModel models/listPlanner
-        command = "python2.7 "+ rootpath +"/models/parseWekaOutputFile.py outputModel listPlanner"
-        print "Run command: " + str(command)
-       	os.system(command)
-       	print "************ Start Regression **********************"
-       	##pass classification to regression
-       	actual_rootpath = rootpath + "/models"
-        command = "python2.7 "+ actual_rootpath + "/joinFileRegression.py " + rootpath[:rootpath.rfind("/")+1] +" listPlanner\n"
-        print "Run command: " + str(command)
-       	os.system(command)
-       	command = "java -cp "+ rootpath +"/models/weka.jar -Xmx2048M weka.filters.unsupervised.attribute.Remove -R 1-3,6,8,10-14,16-17,19-22,24,26-27,29-34,36-37,39,41-44,47-52,55-59,62-71,73-79,82-83,85,92-93 -i global_features_regression.arff -o global_features_simply_regression.arff"
-        print "Run command: " + str(command)
-       	os.system(command)
-       	command = "java -Xmx1024M -cp "+ rootpath +"/models/weka.jar/ weka.classifiers.rules.DecisionTable  -l "+ dck_folder +"/rules.DecisionTable.model -T global_features_simply_regression.arff -p 35 > outputModelRegression"
-        print "Run command: " + str(command)
-        os.system(command)
-        command = "python2.7 "+ rootpath +"/models/parseWekaOutputFileRegression.py outputModelRegression listPlannerRegression"
-        print "Run command: " + str(command)
-        os.system(command)
-        planners_time = []
-        planners_time = readFile(planners_time, "listPlannerRegression")
-        for i in planners_time:
-        	planner = i[:i.find(",")]
-        	timer =  i[i.find(",")+1:]
-        	planners.append(planner)
-        	timeouts.append(int(timer))
+        models = read_models(dck_folder)
+        if "lifted-classification" in models and "lifted-regression" in models:
+            # The planners are first chosen by the models of the lifted
+            # features, while the full features are extracted in the
+            # background in a directory of their own (the planners write
+            # into the workspace); they re-plan the rest of the portfolio
+            # once they are ready
+            print "Predict with the lifted features, extract the rest in the background"
+            sys.path.insert(0, rootpath + "/features/translate")
+            import lifted
+            tier = FullTier(rootpath, dck_folder, models, original_domain_file, original_problem_file,
+                            solve_workspace.mkdir("features"))
+            tier.start()
+            (probabilities, runtimes) = lifted_predictions(rootpath, dck_folder, models,
+                                                           original_domain_file, original_problem_file)
+            if not (probabilities and runtimes):
+                # nothing to start with: wait for the full features
+                print "Lifted predictions failed, waiting for the full features"
+                predictions = None
+                while predictions is None and tier.pid is not None:
+                    time.sleep(CHECK_INTERVAL)
+                    predictions = tier.poll()
+                (probabilities, runtimes) = predictions or (None, None)
+        else:
+            print "Extract Features with original problem and domain"
+            controller = featuretools.FeatureController(FEATURES_BUDGET)
+            extract_features(controller, rootpath, original_domain_file, original_problem_file)
+            print "Time left for planning: %.2f seconds\n" % (timelimit - (time.time() - begin))
+            (probabilities, runtimes) = full_predictions(rootpath, dck_folder, models)
+        # the slices maximize the expected coverage within the time left
+        if probabilities and runtimes:
+            budget = timelimit - (time.time() - begin)
+            slices = schedule.schedule(probabilities, runtimes, budget)
+            for planner, timer in slices:
+                planners.append(planner)
+                timeouts.append(int(timer))
     if(len(planners) == 0):
-       	for planner, timer in zip(planners_d, timeouts_d):
-       		planners.append(planner)
-        	timeouts.append(int(timer))
+        # the default portfolio is cut down to the time left: the planners
+        # that do not fit with their minimum slice are dropped from the end,
+        # and the slices of the rest are scaled down
+        budget = timelimit - (time.time() - begin)
+        ndefault = min(len(planners_d), int(budget // schedule.MIN_SLICE))
+        scale = min(1.0, budget / sum(timeouts_d[:ndefault])) if ndefault else 0.0
+        for planner, timer in zip(planners_d[:ndefault], timeouts_d[:ndefault]):
+            planners.append(planner)
+            timeouts.append(max(schedule.MIN_SLICE, int(timer * scale)))
         		
     print "\nPortfolio configuration:"
     for i in xrange(0, len(planners)):
         print "planner,time", planners[i] + " " + str(timeouts[i])
 
 
-    ## Getting modified paths
-    plans_folder = rootpath + "/plans_folder"
-    problem_file_wtp = original_problem_file[:original_problem_file.rfind(".")] + "_wtp.txt"
-    problem_file_wtp_and_wac = original_problem_file[:original_problem_file.rfind(".")] + "_wtp_and_wac.txt"
-    domain_file_wac = original_domain_file[:original_domain_file.rfind(".")] + "_wac.txt"
-
-
-    ## Checking if modified paths already exist. If so, we remove it
-    if (os.path.isfile(problem_file_wtp)):
-        print "\nThe temporal file " + problem_file_wtp + " already exists, so we remove it.\n"
-        command = "rm -rf " + problem_file_wtp
-        os.system(command)
-
-    if (os.path.isfile(problem_file_wtp_and_wac)):
-        print "\nThe temporal file " + problem_file_wtp_and_wac + " already exists, so we remove it.\n"
-        command = "rm -rf " + problem_file_wtp_and_wac
-        os.system(command)
-
-    if (os.path.isfile(domain_file_wac)):
-        print "\nThe temporal file " + domain_file_wac + " already exists, so we remove it.\n"
-        command = "rm -rf " + domain_file_wac
-        os.system(command)
-
-
-    print "\nParsing problems...\n"
-    ##os.chdir(rootpath + "/parser/")
-
-    command = "python2.7 "+ rootpath +"/parser/clean_typing.py " + original_problem_file + " " + problem_file_wtp
-    os.system(command)
-
-    command = "python2.7 "+ rootpath + "/parser/clean_action_costs.py " + original_domain_file + " " + domain_file_wac + " " + problem_file_wtp + " " + problem_file_wtp_and_wac
-    os.system(command)
+    ## Getting modified paths (the workspace is fresh, so none of them exists)
+    plans_folder = solve_workspace.mkdir("plans_folder")
+    # the PDDL files are cleaned when a planner first needs them. The files
+    # cleaned by former solves are pruned first, since the cache may be in RAM
+    pruned = pddltools.prune_cache()
+    if pruned:
+        print "Removed %i old cleaned files from the cache" % pruned
+    cleaned_files = pddltools.CleanedFiles(original_domain_file, original_problem_file,
+                                           solve_workspace.directory)
 
     end = time.time()
     accumulated_time = end - begin
     accumulated_time = int(accumulated_time) + 1
-    print "Parsers took " + str(accumulated_time) + " seconds\n"
+    print "Setup took " + str(accumulated_time) + " seconds\n"
 
 
     # run main portfolio
-    accumulated_time += run_portfolio (planners, timeouts, memory)
+    if tier is not None and tier.pid is not None and planners:
+        accumulated_time += run_tiered_portfolio (zip(planners, timeouts), tier, memory, begin + timelimit)
+    else:
+        if tier is not None:
+            tier.stop()
+        accumulated_time += run_portfolio (planners, timeouts, memory)
     print "Main portfolio runs " + str(accumulated_time) + " seconds\n"
 
     # some planner failed, therefore there is remaining time. Run default planner
@@ -444,6 +794,10 @@ if __name__ == '__main__':
             accumulated_time += run_portfolio (planners, timeouts, memory)
             print "Main portfolio plus default planner plus blind planner run " + str(accumulated_time) + " seconds (in total)\n"
 
+    # the times of the plans kept, as invokeplanner.py logs them
+    print "Number of solutions found: %i" % len(solution_times)
+    print "Time/solution            : [%s]" % ", ".join(["%.3f" % t for t in solution_times])
+
 
 # Local Variables:
 # mode:python2.7
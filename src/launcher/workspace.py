@@ -0,0 +1,146 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# workspace.py
+# Description: per-solve scratch workspaces
+# -----------------------------------------------------------------------------
+
+"""
+per-solve scratch workspaces
+
+Every stage of the launcher writes fixed filenames (output.sas, features.arff,
+listPlanner, ...) into its working directory, and the planners leave their
+plans in the plans folder. A workspace is a private scratch directory where
+all of them live during a single solve, so that several solves can share a
+host. It is removed when the solve exits, unless told otherwise.
+
+The workspaces are created below $PORTFOLIO_WORKSPACE_ROOT (the system
+temporary directory by default), or below /dev/shm if $PORTFOLIO_TMPFS is set
+and a tmpfs is mounted there. If $PORTFOLIO_KEEP_WORKSPACE is set they are not
+removed, which is useful to inspect the intermediate files.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import atexit           # cleanup on exit
+import os               # path and process management
+import shutil           # remove directories
+import signal           # termination signals
+import sys              # exit
+import tempfile         # unique directories
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+ROOT_ENV = "PORTFOLIO_WORKSPACE_ROOT"
+TMPFS_ENV = "PORTFOLIO_TMPFS"
+KEEP_ENV = "PORTFOLIO_KEEP_WORKSPACE"
+
+TMPFS_ROOT = "/dev/shm"
+PREFIX = "solve-"
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# default_root
+#
+# returns the directory where workspaces are created according to the
+# environment
+# -----------------------------------------------------------------------------
+def default_root():
+    """
+    returns the directory where workspaces are created according to the
+    environment
+    """
+
+    if os.environ.get(ROOT_ENV):
+        return os.path.abspath(os.environ[ROOT_ENV])
+    if (os.environ.get(TMPFS_ENV) and os.path.isdir(TMPFS_ROOT) and
+        os.access(TMPFS_ROOT, os.W_OK)):
+        return TMPFS_ROOT
+    return tempfile.gettempdir()
+
+
+# -----------------------------------------------------------------------------
+# Workspace
+#
+# a private scratch directory for a single solve
+# -----------------------------------------------------------------------------
+class Workspace(object):
+
+    """
+    a private scratch directory for a single solve
+    """
+
+    def __init__(self, root=None, keep=None):
+        self.root = root or default_root()
+        if keep is None:
+            keep = bool(os.environ.get(KEEP_ENV))
+        self.keep = keep
+        self.directory = None
+        self.owner = None
+
+    def create(self):
+        """
+        creates the directory and registers its removal when the process exits,
+        also when it is terminated with SIGTERM or SIGINT
+        """
+
+        if not os.path.isdir(self.root):
+            os.makedirs(self.root)
+        self.directory = tempfile.mkdtemp(prefix=PREFIX, dir=self.root)
+        # forked children (e.g., the planner monitor) must not remove it
+        self.owner = os.getpid()
+        atexit.register(self.cleanup)
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, _exit_on_signal)
+        return self.directory
+
+    def path(self, name):
+        """
+        returns the path of the file 'name' within the workspace
+        """
+
+        return os.path.join(self.directory, name)
+
+    def mkdir(self, name):
+        """
+        creates the directory 'name' within the workspace and returns its path
+        """
+
+        path = self.path(name)
+        if not os.path.isdir(path):
+            os.mkdir(path)
+        return path
+
+    def cleanup(self):
+        """
+        removes the directory, unless it has to be kept
+        """
+
+        if self.directory is None or os.getpid() != self.owner:
+            return
+        if self.keep:
+            print "Workspace kept in " + self.directory
+        elif os.path.isdir(self.directory):
+            # we cannot remove the directory while we are in it
+            if os.getcwd().startswith(self.directory):
+                os.chdir(self.root)
+            shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory = None
+
+
+def _exit_on_signal(signum, frame):
+    # raising SystemExit runs the handlers registered with atexit
+    sys.exit(128 + signum)
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
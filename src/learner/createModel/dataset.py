@@ -0,0 +1,476 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# dataset.py
+# Description: builds the training sets from the results of a sweep
+# -----------------------------------------------------------------------------
+
+"""
+builds the training sets from the results of a sweep
+
+The outcome of every run is read from the results tree created by
+invokeplanner.py (results/<planner>/<domain>/<problem>, parsed with reportl0),
+or queried from its outcome archive (see IPCarchive.py), and joined with the
+features of its problem by (domain, problem), as recorded in the features index
+written by the learner while extracting the features. Runs without features and
+problems without runs are reported instead of being silently misaligned.
+
+The classification (planner and whether it solved the problem) and regression
+(planner and the time of its last solution) training sets are emitted in a
+single pass over the results, either as ARFF files or in a binary columnar
+format (see write_columnar).
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import array            # numeric columns
+import math             # nan
+import os               # path and process management
+import struct           # binary encoding
+import sys              # argv, exit
+
+# the results are parsed with the report scripts or read from the archive of
+# invokeplanner.py, and the features header is the one written by joinFile.py
+sys.path.append (os.path.join (os.path.dirname (os.path.abspath (__file__)), '../report'))
+sys.path.append (os.path.join (os.path.dirname (os.path.abspath (__file__)), '../invoke-planner'))
+sys.path.append (os.path.join (os.path.dirname (os.path.abspath (__file__)), '../models'))
+
+import IPCarchive       # outcome archives
+import reportl0         # for handling depth0 directories
+from head import Head   # features header
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+FEATURES_INDEX = "global_features.index"
+
+PLANNERS = ["arvand", "dae_yahsp", "fd-autotune-1", "fd-autotune-2", "fdss-1", "fdss-2",
+            "lama-2008", "lama-2011", "lamar", "lpg", "madagascar", "probe", "randward",
+            "sgplan", "yahsp2-mt"]
+
+# attributes appended to the features by createFiles.py. The training sets
+# select columns of this layout with the same (1-based) ranges that were given
+# to weka.filters.unsupervised.attribute.Remove
+OUTCOME_ATTRIBUTES = ["@attribute planner {%s}\n" % ", ".join (PLANNERS),
+                      "@attribute domain_output string\n",
+                      "@attribute problem_output numeric\n",
+                      "@attribute value numeric\n",
+                      "@attribute time numeric\n",
+                      "@attribute class {True, False}\n"]
+
+CLASSIFICATION_REMOVE = "1,4,6,8-12,14-15,17-20,22,24-25,27-32,34-35,37,39-42,45-48,51-53,56-57,60-69,71-76,78-79,81,88-89,101-104"
+REGRESSION_REMOVE = "1-3,6,8,10-14,16-17,19-22,24,26-27,29-34,36-37,39,41-44,47-52,55-59,62-71,73-79,82-83,85,92-93,101-103,105"
+
+# the lifted training sets only keep the features that are computed from the
+# parsed PDDL task (requirements ... use_min_cost_metric, see
+# features/translate/lifted.py), so that the launcher can apply their models
+# before the rest of the features are extracted
+LIFTED_CLASSIFICATION_REMOVE = "1-2,13-99,101-104"
+LIFTED_REGRESSION_REMOVE = "1-2,13-99,101-103,105"
+
+COLUMNAR_MAGIC = b"PTDS"
+COLUMNAR_VERSION = 1
+NUMERIC = 0
+NOMINAL = 1
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# problem_ids
+#
+# returns the list of (problem file, problem id) of the training folder, where
+# the problem id is the name invokeplanner.py gives to the problem in the
+# results tree
+# -----------------------------------------------------------------------------
+def problem_ids (training_folder):
+    """
+    returns the list of (problem file, problem id) of the training folder, where
+    the problem id is the name invokeplanner.py gives to the problem in the
+    results tree
+    """
+
+    return [(problem, "%03i" % counter)
+            for counter, problem in enumerate (sorted (os.listdir (training_folder)))]
+
+
+# -----------------------------------------------------------------------------
+# append_features
+#
+# records the features line of the given domain/problem in the features index
+# -----------------------------------------------------------------------------
+def append_features (index, domain, problem, features):
+    """
+    records the features line of the given domain/problem in the features index
+    """
+
+    stream = open (index, 'a')
+    stream.write ("%s\t%s\t%s\n" % (domain, problem, features.strip ()))
+    stream.close ()
+
+
+# -----------------------------------------------------------------------------
+# read_features
+#
+# returns a dictionary with the features line of every (domain, problem) of the
+# features index. If a problem appears more than once, its last line is used
+# -----------------------------------------------------------------------------
+def read_features (index):
+    """
+    returns a dictionary with the features line of every (domain, problem) of
+    the features index. If a problem appears more than once, its last line is
+    used
+    """
+
+    features = dict ()
+    for line in open (index):
+        fields = line.rstrip ('\n').split ('\t')
+        if len (fields) == 3:
+            features [(fields [0], fields [1])] = fields [2]
+    return features
+
+
+# -----------------------------------------------------------------------------
+# trajectories
+#
+# generates the valid solutions of every run in the results tree as a tuple
+# (planner, domain, problem, solutions), where solutions is the list of the
+# (time, value) of its valid solutions in the order they were found. directory
+# can also be the outcome archive of the sweep
+# -----------------------------------------------------------------------------
+def trajectories (directory):
+    """
+    generates the valid solutions of every run in the results tree as a tuple
+    (planner, domain, problem, solutions), where solutions is the list of the
+    (time, value) of its valid solutions in the order they were found. directory
+    can also be the outcome archive of the sweep
+    """
+
+    if os.path.isfile (directory):
+        archive = IPCarchive.IPCarchive (directory)
+        for trajectory in archive.trajectories ():
+            yield trajectory
+        archive.close ()
+        return
+
+    for planner in sorted (os.listdir (directory)):
+        for domain in sorted (os.listdir (os.path.join (directory, planner))):
+            for problem in sorted (os.listdir (os.path.join (directory, planner, domain))):
+                rundir = os.path.join (directory, planner, domain, problem)
+                if not os.path.isdir (rundir):
+                    continue
+
+                # reportl0 exits when a log file is incomplete
+                try:
+                    (logfile, vallogfile, iplanner, idomain, iproblem) = \
+                        reportl0.checkdepth0 (rundir, False)
+                    timesols = reportl0.parselogdepth0 (rundir, logfile) [6]
+                    (valnumsols, oknumsols, plansoln, okplansoln, values, lengths) = \
+                        reportl0.parsevaldepth0 (rundir, vallogfile)
+                except (Exception, SystemExit):
+                    print " Warning - the run in '%s' could not be parsed" % rundir
+                    continue
+
+                oktimesols = [itimesol [1] for itimesol in zip (plansoln, timesols)
+                              if itimesol [0] in okplansoln]
+                found = [(float (time), float (value)) for value, time in zip (values, oktimesols)
+                         if value > -1]
+                yield (planner, domain, problem, found)
+
+
+# -----------------------------------------------------------------------------
+# outcomes
+#
+# generates the outcome of every run in the results tree as a tuple (planner,
+# domain, problem, value, time, solved), where value and time are those of the
+# last valid solution (-1 if there is none). directory can also be the outcome
+# archive of the sweep
+# -----------------------------------------------------------------------------
+def outcomes (directory):
+    """
+    generates the outcome of every run in the results tree as a tuple (planner,
+    domain, problem, value, time, solved), where value and time are those of the
+    last valid solution (-1 if there is none). directory can also be the outcome
+    archive of the sweep
+    """
+
+    for (planner, domain, problem, found) in trajectories (directory):
+        (time, value) = found [-1] if found else (-1.0, -1.0)
+        yield (planner, domain, problem, value, time, value > -1)
+
+
+# -----------------------------------------------------------------------------
+# parse_range
+#
+# returns the set of 0-based indices given in 'ranges' with the syntax of the
+# Weka filters, e.g., "1,4,6-8"
+# -----------------------------------------------------------------------------
+def parse_range (ranges):
+    """
+    returns the set of 0-based indices given in 'ranges' with the syntax of the
+    Weka filters, e.g., "1,4,6-8"
+    """
+
+    indices = set ()
+    for item in ranges.split (','):
+        if '-' in item:
+            (first, last) = item.split ('-')
+            indices.update (range (int (first) - 1, int (last)))
+        else:
+            indices.add (int (item) - 1)
+    return indices
+
+
+# -----------------------------------------------------------------------------
+# TrainingSet
+#
+# a training set with the columns of the createFiles.py layout which are not
+# removed. Rows are written as they are added (ARFF) or once all of them have
+# been added (columnar)
+# -----------------------------------------------------------------------------
+class TrainingSet (object):
+
+    """
+    a training set with the columns of the createFiles.py layout which are not
+    removed. Rows are written as they are added (ARFF) or once all of them have
+    been added (columnar)
+    """
+
+    def __init__ (self, filename, attributes, remove, binary=False):
+        self.filename = filename
+        self.binary = binary
+        self.columns = [index for index in range (len (attributes))
+                        if index not in parse_range (remove)]
+        self.attributes = [attributes [index] for index in self.columns]
+        self.rows = 0
+        if binary:
+            self.data = [list () for index in self.columns]
+        else:
+            self.stream = open (filename, 'w')
+            self.stream.write ("@relation problem\n\n")
+            for attribute in self.attributes:
+                self.stream.write (attribute)
+            self.stream.write ("@data\n")
+
+    def add (self, row):
+        """
+        adds a row given as the list of values of the whole layout
+        """
+
+        self.rows += 1
+        if self.binary:
+            for data, index in zip (self.data, self.columns):
+                data.append (row [index])
+        else:
+            self.stream.write (",".join ([row [index] for index in self.columns]) + "\n")
+
+    def close (self):
+        if self.binary:
+            write_columnar (self.filename, self.attributes, self.data)
+        else:
+            self.stream.close ()
+
+
+# -----------------------------------------------------------------------------
+# write_columnar
+#
+# writes the given columns in the binary columnar format: the magic string
+# "PTDS" and the version, the number of columns and rows, and then every
+# column with its name and kind. Numeric columns are arrays of doubles (NaN
+# stands for a missing value) and the rest are a table of distinct values
+# followed by the index of every row (-1 stands for a missing value). Integers
+# are little-endian int32 and strings are prefixed with their length
+# -----------------------------------------------------------------------------
+def write_columnar (filename, attributes, data):
+    """
+    writes the given columns in the binary columnar format
+    """
+
+    def write_int (value):
+        stream.write (struct.pack ("<i", value))
+
+    def write_string (value):
+        write_int (len (value))
+        stream.write (value)
+
+    stream = open (filename, 'wb')
+    stream.write (COLUMNAR_MAGIC)
+    write_int (COLUMNAR_VERSION)
+    write_int (len (attributes))
+    write_int (len (data [0]) if data else 0)
+    for attribute, values in zip (attributes, data):
+        (name, kind) = attribute.split () [1:3]
+        write_string (name)
+        if kind == "numeric":
+            write_int (NUMERIC)
+            column = array.array ('d', [float ('nan') if ivalue == '?' else float (ivalue)
+                                        for ivalue in values])
+            if sys.byteorder != 'little':
+                column.byteswap ()
+            stream.write (column.tostring ())
+        else:
+            write_int (NOMINAL)
+            table = sorted (set (values) - set (['?']))
+            codes = dict ((ivalue, icode) for icode, ivalue in enumerate (table))
+            write_int (len (table))
+            for ivalue in table:
+                write_string (ivalue)
+            stream.write (struct.pack ("<%di" % len (values),
+                                       *[codes.get (ivalue, -1) for ivalue in values]))
+    stream.close ()
+
+
+# -----------------------------------------------------------------------------
+# read_columnar
+#
+# reads a file written by write_columnar and returns the list of (name, values)
+# of its columns, with None for the missing values
+# -----------------------------------------------------------------------------
+def read_columnar (filename):
+    """
+    reads a file written by write_columnar and returns the list of (name,
+    values) of its columns, with None for the missing values
+    """
+
+    def read_int ():
+        return struct.unpack ("<i", stream.read (4)) [0]
+
+    def read_string ():
+        return stream.read (read_int ())
+
+    stream = open (filename, 'rb')
+    if stream.read (len (COLUMNAR_MAGIC)) != COLUMNAR_MAGIC or read_int () != COLUMNAR_VERSION:
+        raise ValueError ("%s is not a training set in columnar format" % filename)
+    (ncolumns, nrows) = (read_int (), read_int ())
+    columns = list ()
+    for icolumn in range (ncolumns):
+        name = read_string ()
+        if read_int () == NUMERIC:
+            column = array.array ('d')
+            column.fromstring (stream.read (8 * nrows))
+            if sys.byteorder != 'little':
+                column.byteswap ()
+            values = [None if math.isnan (ivalue) else ivalue for ivalue in column]
+        else:
+            table = [read_string () for ivalue in range (read_int ())]
+            codes = struct.unpack ("<%di" % nrows, stream.read (4 * nrows))
+            values = [table [icode] if icode >= 0 else None for icode in codes]
+        columns.append ((name, values))
+    stream.close ()
+    return columns
+
+
+# -----------------------------------------------------------------------------
+# layout
+#
+# returns the attributes of the createFiles.py layout: the features followed by
+# the outcome of a run
+# -----------------------------------------------------------------------------
+def layout ():
+    """
+    returns the attributes of the createFiles.py layout: the features followed
+    by the outcome of a run
+    """
+
+    attributes = [iline for iline in Head ([]).head if iline.startswith ("@attribute")]
+    return attributes + OUTCOME_ATTRIBUTES
+
+
+# -----------------------------------------------------------------------------
+# rows
+#
+# generates the outcome of every run in the results directory joined with the
+# features of its problem in the features index as a tuple (outcome, row),
+# where row has the createFiles.py layout
+# -----------------------------------------------------------------------------
+def rows (directory, index):
+    """
+    generates the outcome of every run in the results directory joined with the
+    features of its problem in the features index as a tuple (outcome, row),
+    where row has the createFiles.py layout
+    """
+
+    features = read_features (index)
+    seen = set ()
+    for outcome in outcomes (directory):
+        (planner, domain, problem, value, time, solved) = outcome
+        if (domain, problem) not in features:
+            print " Warning - no features for %s/%s: run of %s ignored" % (domain, problem, planner)
+            continue
+        seen.add ((domain, problem))
+        row = features [(domain, problem)].split (',')
+        row += [planner, domain, str (int (problem)), str (value), str (time), str (solved)]
+        yield (outcome, row)
+
+    for key in sorted (set (features) - seen):
+        print " Warning - no runs for %s/%s" % key
+
+
+# -----------------------------------------------------------------------------
+# build
+#
+# joins the outcome of every run in the results directory with the features of
+# its problem in the features index and writes the classification and
+# regression training sets. Returns the number of rows written
+# -----------------------------------------------------------------------------
+def build (directory, index, classification, regression, binary=False):
+    """
+    joins the outcome of every run in the results directory with the features
+    of its problem in the features index and writes the classification and
+    regression training sets. Returns the number of rows written
+    """
+
+    attributes = layout ()
+    trainingsets = [TrainingSet (classification, attributes, CLASSIFICATION_REMOVE, binary),
+                    TrainingSet (regression, attributes, REGRESSION_REMOVE, binary)]
+    for (outcome, row) in rows (directory, index):
+        for trainingset in trainingsets:
+            trainingset.add (row)
+
+    for trainingset in trainingsets:
+        trainingset.close ()
+    return trainingsets [0].rows
+
+
+# -----------------------------------------------------------------------------
+# create_parser
+#
+# creates a command-line parser
+# -----------------------------------------------------------------------------
+def create_parser ():
+    """
+    creates a command-line parser
+    """
+
+    parser = argparse.ArgumentParser (description="Build the training sets from the results of a sweep")
+    parser.add_argument ('-d', '--directory', required=True,
+                         help="results directory created by invokeplanner.py, or its outcome archive")
+    parser.add_argument ('-i', '--index', default=FEATURES_INDEX,
+                         help="features index written by the learner (default: %(default)s)")
+    parser.add_argument ('-c', '--classification', required=True,
+                         help="classification training set")
+    parser.add_argument ('-r', '--regression', required=True,
+                         help="regression training set")
+    parser.add_argument ('-b', '--binary', action='store_true',
+                         help="write the training sets in binary columnar format instead of ARFF")
+    return parser
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ARGS = create_parser ().parse_args ()
+    INSTANCES = build (ARGS.directory, ARGS.index, ARGS.classification, ARGS.regression, ARGS.binary)
+    print " %d rows written to %s and %s" % (INSTANCES, ARGS.classification, ARGS.regression)
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
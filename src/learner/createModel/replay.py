@@ -0,0 +1,272 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# replay.py
+# Description: offline evaluation of the portfolio schedules
+# -----------------------------------------------------------------------------
+
+"""
+offline evaluation of the portfolio schedules
+
+Every problem of a sweep is solved again on paper: the schedule of the
+portfolio is computed from the predictions for the problem and then replayed
+against the recorded runs. A planner solves the problem if its run found a
+valid plan within its slice. The coverage, IPC quality score and the time to
+the first solution of the schedules of schedule.py are compared with those of
+the previous policy (the STRATEGY most likely planners with slices
+proportional to their predicted runtimes) and with the best planner of every
+problem.
+
+The predictions are read from a file with a line 'domain problem planner
+probability runtime' per run or, by default, estimated from the other problems
+of the same domain: the probability is the (Laplace-smoothed) fraction of them
+solved by the planner, and the runtime the mean time it took.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import os               # path and process management
+import sys              # argv, exit
+import time             # time mgmt
+
+sys.path.append (os.path.join (os.path.dirname (os.path.abspath (__file__)), '../models'))
+
+import dataset          # results of a sweep
+import schedule         # time slices of the portfolio
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+BUDGET = 900
+STRATEGY = 5                 # planners run by the previous policy
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# read_runs
+#
+# returns a dictionary that maps every (domain, problem) of the results tree to
+# the runs of the planners, as dictionaries of planner to (value, time, solved)
+# -----------------------------------------------------------------------------
+def read_runs (directory):
+    """
+    returns a dictionary that maps every (domain, problem) of the results tree
+    to the runs of the planners, as dictionaries of planner to (value, time,
+    solved)
+    """
+
+    runs = dict ()
+    for (planner, domain, problem, value, runtime, solved) in dataset.outcomes (directory):
+        runs.setdefault ((domain, problem), dict ()) [planner] = (value, runtime, solved)
+    return runs
+
+
+# -----------------------------------------------------------------------------
+# read_predictions
+#
+# reads the predictions file and returns a dictionary that maps every (domain,
+# problem) to the dictionaries of the probability and runtime of every planner
+# -----------------------------------------------------------------------------
+def read_predictions (filename):
+    """
+    reads the predictions file and returns a dictionary that maps every
+    (domain, problem) to the dictionaries of the probability and runtime of
+    every planner
+    """
+
+    predictions = dict ()
+    for line in open (filename):
+        fields = line.split ()
+        if len (fields) != 5:
+            continue
+        (probabilities, runtimes) = predictions.setdefault ((fields [0], fields [1]), (dict (), dict ()))
+        probabilities [fields [2]] = float (fields [3])
+        runtimes [fields [2]] = float (fields [4])
+    return predictions
+
+
+# -----------------------------------------------------------------------------
+# estimate
+#
+# returns the probability, runtime and quality of every planner for 'key'
+# estimated from the runs of the other problems of the same domain
+# -----------------------------------------------------------------------------
+def estimate (runs, key, budget):
+    """
+    returns the probability, runtime and quality of every planner for 'key'
+    estimated from the runs of the other problems of the same domain
+    """
+
+    others = [other for other in runs if other [0] == key [0] and other != key]
+    (probabilities, runtimes, quality) = (dict (), dict (), dict ())
+    for planner in runs [key]:
+        solved = [runs [other][planner] for other in others
+                  if planner in runs [other] and runs [other][planner][2]]
+        probabilities [planner] = (len (solved) + 1.0) / (len (others) + 2.0)
+        if solved:
+            runtimes [planner] = sum (run [1] for run in solved) / len (solved)
+        else:
+            runtimes [planner] = budget
+        ratios = list ()
+        for other in others:
+            if planner in runs [other] and runs [other][planner][2]:
+                ratios.append (best_value (runs [other]) / runs [other][planner][0]
+                               if runs [other][planner][0] > 0 else 1.0)
+        quality [planner] = sum (ratios) / len (ratios) if ratios else 1.0
+    return (probabilities, runtimes, quality)
+
+
+# -----------------------------------------------------------------------------
+# best_value
+#
+# returns the best value found by any planner in the given runs
+# -----------------------------------------------------------------------------
+def best_value (runs):
+    """
+    returns the best value found by any planner in the given runs
+    """
+
+    return min ([run [0] for run in runs.values () if run [2]] or [-1.0])
+
+
+# -----------------------------------------------------------------------------
+# legacy
+#
+# returns the schedule of the previous policy: the STRATEGY most likely
+# planners, with slices proportional to their predicted runtimes
+# -----------------------------------------------------------------------------
+def legacy (probabilities, runtimes, budget):
+    """
+    returns the schedule of the previous policy: the STRATEGY most likely
+    planners, with slices proportional to their predicted runtimes
+    """
+
+    planners = sorted (probabilities, key=lambda planner: (-probabilities [planner], planner)) [:STRATEGY]
+    weights = [runtimes.get (planner, budget) for planner in planners]
+    weights = [weight if weight > 1 else schedule.MIN_RUNTIME for weight in weights]
+    return [(planner, int (budget * weight / sum (weights))) for planner, weight in zip (planners, weights)]
+
+
+# -----------------------------------------------------------------------------
+# replay
+#
+# replays a schedule against the recorded runs of a problem and returns
+# whether it is solved, its IPC quality score and the time of the first
+# solution (None if there is none)
+# -----------------------------------------------------------------------------
+def replay (slices, runs):
+    """
+    replays a schedule against the recorded runs of a problem and returns
+    whether it is solved, its IPC quality score and the time of the first
+    solution (None if there is none)
+    """
+
+    (start, found, first) = (0, None, None)
+    for (planner, seconds) in slices:
+        if planner in runs:
+            (value, runtime, solved) = runs [planner]
+            if solved and 0 <= runtime <= seconds:
+                found = value if found is None else min (found, value)
+                if first is None:
+                    first = start + runtime
+        start += seconds
+    if found is None:
+        return (False, 0.0, None)
+    return (True, best_value (runs) / found if found > 0 else 1.0, first)
+
+
+# -----------------------------------------------------------------------------
+# evaluate
+#
+# replays the schedules of every policy over all the problems and returns a
+# dictionary that maps every policy to its (coverage, quality, mean time to the
+# first solution, time spent scheduling)
+# -----------------------------------------------------------------------------
+def evaluate (runs, predictions, budget, objective):
+    """
+    replays the schedules of every policy over all the problems and returns a
+    dictionary that maps every policy to its (coverage, quality, mean time to
+    the first solution, time spent scheduling)
+    """
+
+    totals = dict ()
+    for key in sorted (runs):
+        (probabilities, runtimes, quality) = estimate (runs, key, budget)
+        if predictions is not None:
+            if key not in predictions:
+                print " Warning - no predictions for %s/%s" % key
+                continue
+            (probabilities, runtimes) = predictions [key]
+        best = sorted (runs [key], key=lambda planner: (runs [key][planner][1] if runs [key][planner][2] else budget + 1, planner))
+
+        policies = list ()
+        started = time.time ()
+        policies.append (("schedule", schedule.schedule (probabilities, runtimes, budget,
+                                                         quality if objective == "quality" else None)))
+        elapsed = time.time () - started
+        policies.append (("legacy", legacy (probabilities, runtimes, budget)))
+        policies.append (("virtual best", [(best [0], budget)]))
+
+        for (policy, slices) in policies:
+            (solved, score, first) = replay (slices, runs [key])
+            total = totals.setdefault (policy, [0, 0.0, 0.0, 0.0])
+            total [0] += solved
+            total [1] += score
+            total [2] += first if first is not None else 0.0
+            if policy == "schedule":
+                total [3] += elapsed
+    return dict ((policy, (total [0], total [1], total [2] / total [0] if total [0] else 0.0, total [3]))
+                 for policy, total in totals.items ())
+
+
+# -----------------------------------------------------------------------------
+# create_parser
+#
+# creates a command-line parser
+# -----------------------------------------------------------------------------
+def create_parser ():
+    """
+    creates a command-line parser
+    """
+
+    parser = argparse.ArgumentParser (description="Replay the portfolio schedules against the results of a sweep")
+    parser.add_argument ('-d', '--directory', required=True,
+                         help="results directory created by invokeplanner.py, or its outcome archive")
+    parser.add_argument ('-p', '--predictions', default=None,
+                         help="file with a line 'domain problem planner probability runtime' per run "
+                         "(default: estimated from the other problems of the domain)")
+    parser.add_argument ('-b', '--budget', type=int, default=BUDGET,
+                         help="time of the portfolio in seconds (default: %(default)s)")
+    parser.add_argument ('-o', '--objective', choices=["coverage", "quality"], default="coverage",
+                         help="what the schedules maximize (default: %(default)s)")
+    return parser
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ARGS = create_parser ().parse_args ()
+    RUNS = read_runs (ARGS.directory)
+    PREDICTIONS = read_predictions (ARGS.predictions) if ARGS.predictions else None
+    RESULTS = evaluate (RUNS, PREDICTIONS, ARGS.budget, ARGS.objective)
+    print " %d problems" % len (RUNS)
+    print " %-14s %10s %10s %16s" % ("policy", "coverage", "quality", "first solution")
+    for POLICY in ("schedule", "legacy", "virtual best"):
+        if POLICY in RESULTS:
+            (COVERAGE, QUALITY, FIRST, ELAPSED) = RESULTS [POLICY]
+            print " %-14s %10d %10.2f %15.2fs" % (POLICY, COVERAGE, QUALITY, FIRST)
+    if RUNS and "schedule" in RESULTS:
+        print " Scheduling took %.2f ms per problem" % (1000 * RESULTS ["schedule"][3] / len (RUNS))
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
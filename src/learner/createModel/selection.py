@@ -0,0 +1,564 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# selection.py
+# Description: model selection for the portfolio
+# -----------------------------------------------------------------------------
+
+"""
+model selection for the portfolio
+
+Every candidate learner, with every setting of its hyperparameter grid, is
+evaluated with k-fold cross-validation. The folds split the training problems
+(never the runs of a problem) and are cached on disk, so that later sweeps over
+the same results reuse them. All the Weka runs are independent, so they are
+spread over a pool of workers.
+
+Candidates are not ranked by the accuracy of the model but by how the portfolio
+would do with it in the 900 seconds of a solve: the classifier picks the
+planners of every test problem (as parseWekaOutputFile.py does) and the
+regression model splits the time among them (as
+parseWekaOutputFileRegression.py does). The simulated coverage breaks ties
+with the IPC quality score. The best classifier and regression model are then
+trained on all the problems and written into the DCK folder, along with a
+description (MODELS_FILE) that tells the launcher how to load them.
+
+The same is done for the lifted features alone (those of the parsed PDDL task,
+see dataset.py). The launcher picks the first planners with these models,
+which only take milliseconds to feed, while the other features are extracted.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import hashlib          # fold cache keys
+import multiprocessing  # number of cores
+import multiprocessing.pool # pool of Weka runs
+import os               # path and process management
+import random           # fold assignment
+import shutil           # copy files and directories
+import subprocess       # Weka runs
+import sys              # argv, exit
+
+import dataset          # training sets
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+TIME_LIMIT = 900             # time of a solve
+STRATEGY = 5                 # number of planners picked by the classifier
+MIN_PREDICTION = 10          # predicted times up to 1 second are taken as this
+
+FOLDS = 10
+SEED = 1
+JAVA_MEMORY = "-Xmx1024M"
+
+MODELS_FILE = "models.txt"   # description of the models in the DCK folder
+
+# training sets of every fold: the models of the lifted sets only use the
+# features of the parsed PDDL task, and are applied by the launcher while the
+# rest of the features are extracted
+KINDS = ["classification", "regression", "lifted-classification", "lifted-regression"]
+
+# candidate learners: (name, Weka class, hyperparameter grid)
+CLASSIFIERS = [
+    ("trees.RandomForest", "weka.classifiers.trees.RandomForest",
+     [["-I", trees, "-K", features, "-S", "1"]
+      for trees in ("10", "50", "100") for features in ("0", "10", "20")]),
+    ("trees.J48", "weka.classifiers.trees.J48",
+     [["-C", confidence, "-M", leaves]
+      for confidence in ("0.1", "0.25") for leaves in ("2", "5")]),
+    ("lazy.IBk", "weka.classifiers.lazy.IBk",
+     [["-K", neighbours] for neighbours in ("1", "5", "10")]),
+    ]
+
+REGRESSORS = [
+    ("rules.DecisionTable", "weka.classifiers.rules.DecisionTable",
+     [[], ["-X", "5"], ["-I"]]),
+    ("trees.REPTree", "weka.classifiers.trees.REPTree",
+     [["-M", leaves] for leaves in ("2", "10")]),
+    ("trees.M5P", "weka.classifiers.trees.M5P",
+     [["-M", leaves] for leaves in ("4", "10")]),
+    ]
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# masks
+#
+# returns a dictionary with the columns removed from the training sets of every
+# kind in KINDS. String attributes are removed too, since Weka learners cannot
+# use them
+# -----------------------------------------------------------------------------
+def masks (attributes):
+    """
+    returns a dictionary with the columns removed from the training sets of
+    every kind in KINDS. String attributes are removed too, since Weka learners
+    cannot use them
+    """
+
+    strings = [str (index + 1) for index, attribute in enumerate (attributes)
+               if attribute.split () [2] == "string"]
+    return {"classification": ",".join ([dataset.CLASSIFICATION_REMOVE] + strings),
+            "regression": ",".join ([dataset.REGRESSION_REMOVE] + strings),
+            "lifted-classification": ",".join ([dataset.LIFTED_CLASSIFICATION_REMOVE] + strings),
+            "lifted-regression": ",".join ([dataset.LIFTED_REGRESSION_REMOVE] + strings)}
+
+
+# -----------------------------------------------------------------------------
+# make_folds
+#
+# writes the training and test sets of every fold into 'cache' and returns the
+# list of fold directories. The problems are shuffled with 'seed' and dealt
+# into 'k' folds. If the folds of the very same rows were written before, they
+# are reused
+# -----------------------------------------------------------------------------
+def make_folds (rows, attributes, k, seed, cache):
+    """
+    writes the training and test sets of every fold into 'cache' and returns
+    the list of fold directories. The problems are shuffled with 'seed' and
+    dealt into 'k' folds. If the folds of the very same rows were written
+    before, they are reused
+    """
+
+    removed = masks (attributes)
+    digest = hashlib.sha1 ("%d %d %s\n" % (k, seed, " ".join ([removed [kind] for kind in KINDS])))
+    for (outcome, row) in rows:
+        digest.update (",".join (row) + "\n")
+    directory = os.path.join (cache, "folds-" + digest.hexdigest () [:16])
+    folds = [os.path.join (directory, "fold-%d" % ifold) for ifold in range (k)]
+    if os.path.isfile (os.path.join (directory, "complete")):
+        print " Reusing the folds in %s" % directory
+        return folds
+
+    if os.path.isdir (directory):
+        shutil.rmtree (directory)
+    os.makedirs (directory)
+    problems = sorted (set ((outcome [1], outcome [2]) for (outcome, row) in rows))
+    random.Random (seed).shuffle (problems)
+    fold = dict ((problem, index % k) for index, problem in enumerate (problems))
+    write_set (os.path.join (directory, "all"), rows, attributes)
+    for ifold in range (k):
+        os.mkdir (folds [ifold])
+        write_set (os.path.join (folds [ifold], "train"),
+                   [(outcome, row) for (outcome, row) in rows
+                    if fold [(outcome [1], outcome [2])] != ifold], attributes)
+        write_set (os.path.join (folds [ifold], "test"),
+                   [(outcome, row) for (outcome, row) in rows
+                    if fold [(outcome [1], outcome [2])] == ifold], attributes)
+    open (os.path.join (directory, "complete"), 'w').close ()
+    return folds
+
+
+# -----------------------------------------------------------------------------
+# write_set
+#
+# writes the training sets of every kind of the given rows as prefix-kind.arff
+# (e.g. prefix-classification.arff), and the outcome of every row in
+# prefix.outcomes
+# -----------------------------------------------------------------------------
+def write_set (prefix, rows, attributes):
+    """
+    writes the training sets of every kind of the given rows as
+    prefix-kind.arff (e.g. prefix-classification.arff), and the outcome of
+    every row in prefix.outcomes
+    """
+
+    removed = masks (attributes)
+    trainingsets = [dataset.TrainingSet ("%s-%s.arff" % (prefix, kind), attributes, removed [kind])
+                    for kind in KINDS]
+    stream = open (prefix + ".outcomes", 'w')
+    for (outcome, row) in rows:
+        for trainingset in trainingsets:
+            trainingset.add (row)
+        stream.write ("%s %s %s %s %s %s\n" % outcome)
+    stream.close ()
+    for trainingset in trainingsets:
+        trainingset.close ()
+
+
+# -----------------------------------------------------------------------------
+# read_outcomes
+#
+# reads a file written by write_set and returns the list of outcomes
+# -----------------------------------------------------------------------------
+def read_outcomes (filename):
+    """
+    reads a file written by write_set and returns the list of outcomes
+    """
+
+    outcomes = list ()
+    for line in open (filename):
+        (planner, domain, problem, value, time, solved) = line.split ()
+        outcomes.append ((planner, domain, problem, float (value), float (time), solved == "True"))
+    return outcomes
+
+
+# -----------------------------------------------------------------------------
+# weka
+#
+# runs a Weka learner and returns its output. If 'test' is given, the
+# predictions on it are returned, otherwise the model trained on 'train' is
+# saved in 'model'
+# -----------------------------------------------------------------------------
+def weka (jar, classname, options, train, test=None, model=None):
+    """
+    runs a Weka learner and returns its output. If 'test' is given, the
+    predictions on it are returned, otherwise the model trained on 'train' is
+    saved in 'model'
+    """
+
+    command = ["java", JAVA_MEMORY, "-cp", jar, classname] + list (options) + ["-t", train]
+    if test:
+        command += ["-T", test, "-p", "0"]
+    else:
+        command += ["-no-cv", "-d", model]
+    process = subprocess.Popen (command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    (output, error) = process.communicate ()
+    if process.returncode != 0:
+        raise RuntimeError ("%s failed: %s" % (" ".join (command), error.strip ()))
+    return output
+
+
+# -----------------------------------------------------------------------------
+# parse_predictions
+#
+# returns the predictions in the output of 'weka -p 0': the probability of the
+# class True of every instance for classifiers, and the predicted value for
+# regression models
+# -----------------------------------------------------------------------------
+def parse_predictions (output, regression=False):
+    """
+    returns the predictions in the output of 'weka -p 0': the probability of the
+    class True of every instance for classifiers, and the predicted value for
+    regression models
+    """
+
+    predictions = list ()
+    started = False
+    for line in output.splitlines ():
+        fields = line.split ()
+        if not started:
+            started = (len (fields) > 0 and fields [0] == "inst#")
+            continue
+        if not fields:
+            continue
+        if regression:
+            predictions.append (float (fields [2]))
+        else:
+            # inst# actual predicted [+] probability of the predicted class
+            probability = float (fields [-1].strip ('*'))
+            if fields [2].endswith (":True"):
+                predictions.append (probability)
+            else:
+                predictions.append (1 - probability)
+    return predictions
+
+
+# -----------------------------------------------------------------------------
+# select_planners
+#
+# returns the planners picked for every problem: those with the largest
+# probability of solving it
+# -----------------------------------------------------------------------------
+def select_planners (outcomes, probabilities):
+    """
+    returns the planners picked for every problem: those with the largest
+    probability of solving it
+    """
+
+    ranking = dict ()
+    for outcome, probability in zip (outcomes, probabilities):
+        ranking.setdefault ((outcome [1], outcome [2]), list ()).append ((-probability, outcome [0]))
+    return dict ((problem, [planner for (probability, planner) in sorted (planners) [:STRATEGY]])
+                 for problem, planners in ranking.items ())
+
+
+# -----------------------------------------------------------------------------
+# allocate_time
+#
+# returns the time slice of every selected planner, proportional to its
+# predicted time if predictions are given and evenly split otherwise
+# -----------------------------------------------------------------------------
+def allocate_time (selected, predictions=None):
+    """
+    returns the time slice of every selected planner, proportional to its
+    predicted time if predictions are given and evenly split otherwise
+    """
+
+    slices = dict ()
+    for problem, planners in selected.items ():
+        if predictions is None:
+            weights = [1.0 for planner in planners]
+        else:
+            weights = [predictions.get ((problem, planner), MIN_PREDICTION) for planner in planners]
+            weights = [weight if weight > 1 else MIN_PREDICTION for weight in weights]
+        total = sum (weights)
+        for planner, weight in zip (planners, weights):
+            slices [(problem, planner)] = TIME_LIMIT * weight / total
+    return slices
+
+
+# -----------------------------------------------------------------------------
+# score
+#
+# simulates the portfolio on the test problems and returns its coverage and IPC
+# quality score. 'trajectories' maps every run to the (time, value) of its valid
+# solutions, as given by dataset.trajectories. A planner solves a problem if its
+# first valid solution was found within its slice, and the value it reaches is
+# the best one found within the slice; the quality of a problem is the best
+# value found by any planner over the best value reached by the portfolio
+# -----------------------------------------------------------------------------
+def score (outcomes, slices, trajectories):
+    """
+    simulates the portfolio on the test problems and returns its coverage and
+    IPC quality score
+    """
+
+    # runs missing from the trajectories only have their last solution
+    def solutions (planner, domain, problem, value, time, solved):
+        if (planner, domain, problem) in trajectories:
+            return trajectories [(planner, domain, problem)]
+        return [(time, value)] if solved else []
+
+    best = dict ()
+    found = dict ()
+    for outcome in outcomes:
+        (planner, domain, problem) = outcome [:3]
+        limit = slices.get (((domain, problem), planner), -1)
+        for (time, value) in solutions (*outcome):
+            best [(domain, problem)] = min (value, best.get ((domain, problem), value))
+            if 0 <= time <= limit:
+                found [(domain, problem)] = min (value, found.get ((domain, problem), value))
+
+    quality = 0.0
+    for problem, value in found.items ():
+        quality += best [problem] / value if value > 0 else 1.0
+    return (len (found), quality)
+
+
+# -----------------------------------------------------------------------------
+# evaluate
+#
+# runs a task of the cross-validation: (kind, name, classname, options, fold)
+# and returns it along with its predictions, or None if Weka failed
+# -----------------------------------------------------------------------------
+def evaluate (task, jar):
+    """
+    runs a task of the cross-validation: (kind, name, classname, options, fold)
+    and returns it along with its predictions, or None if Weka failed
+    """
+
+    (kind, name, classname, options, fold) = task
+    try:
+        output = weka (jar, classname, options,
+                       os.path.join (fold, "train-%s.arff" % kind),
+                       os.path.join (fold, "test-%s.arff" % kind))
+    except Exception, message:
+        # a single write, since the runs share stdout
+        sys.stdout.write (" Warning - %s\n" % message)
+        return (task, None)
+    return (task, parse_predictions (output, kind.endswith ("regression")))
+
+
+# -----------------------------------------------------------------------------
+# cross_validate
+#
+# evaluates all the candidates of the given kind on all the folds in parallel
+# and returns a dictionary with the predictions of every (candidate, fold)
+# -----------------------------------------------------------------------------
+def cross_validate (kind, candidates, folds, jar, pool):
+    """
+    evaluates all the candidates of the given kind on all the folds in parallel
+    and returns a dictionary with the predictions of every (candidate, fold)
+    """
+
+    tasks = [(kind, name, classname, tuple (options), fold)
+             for (name, classname, grid) in candidates
+             for options in grid
+             for fold in folds]
+    print " Cross-validating %d %s runs" % (len (tasks), kind)
+    sys.stdout.flush ()
+    results = pool.map (lambda task: evaluate (task, jar), tasks)
+    return dict ((((task [1], task [2], task [3]), task [4]), predictions)
+                 for (task, predictions) in results)
+
+
+# -----------------------------------------------------------------------------
+# rank
+#
+# returns the candidates of the given kind sorted by the coverage and quality
+# of the portfolio over all the folds, best first, as tuples (coverage,
+# quality, candidate). Candidates that failed in any fold are discarded.
+# 'slicer' returns the slices of a candidate in a fold, and 'trajectories' the
+# valid solutions of every run (see score)
+# -----------------------------------------------------------------------------
+def rank (candidates, folds, slicer, trajectories):
+    """
+    returns the candidates sorted by the coverage and quality of the portfolio
+    over all the folds, best first
+    """
+
+    ranking = list ()
+    for (name, classname, grid) in candidates:
+        for options in grid:
+            candidate = (name, classname, tuple (options))
+            (coverage, quality) = (0, 0.0)
+            try:
+                for fold in folds:
+                    outcomes = read_outcomes (os.path.join (fold, "test.outcomes"))
+                    (icoverage, iquality) = score (outcomes, slicer (candidate, fold, outcomes), trajectories)
+                    coverage += icoverage
+                    quality += iquality
+            except (KeyError, TypeError, ValueError):
+                continue
+            print " %s %s: coverage %d, quality %.2f" % (name, " ".join (options), coverage, quality)
+            ranking.append ((coverage, quality, candidate))
+    ranking.sort (key=lambda item: (-item [0], -item [1]))
+    return ranking
+
+
+# -----------------------------------------------------------------------------
+# choose
+#
+# evaluates all the candidates on the training sets of the folds whose kinds
+# start with 'prefix' ("" for the full features, "lifted-" for the lifted
+# ones) and returns the best (classifier, regression model). 'trajectories' are
+# the valid solutions of every run (see score)
+# -----------------------------------------------------------------------------
+def choose (prefix, folds, jar, pool, trajectories):
+    """
+    evaluates all the candidates on the training sets of the folds whose kinds
+    start with 'prefix' and returns the best (classifier, regression model)
+    """
+
+    # first, the classifiers, with the time evenly split among the planners
+    # they pick
+    classifications = cross_validate (prefix + "classification", CLASSIFIERS, folds, jar, pool)
+    def selected (candidate, fold, outcomes):
+        return select_planners (outcomes, classifications [(candidate, fold)])
+    ranking = rank (CLASSIFIERS, folds,
+                    lambda candidate, fold, outcomes: allocate_time (selected (candidate, fold, outcomes)),
+                    trajectories)
+    if not ranking:
+        raise RuntimeError ("no classifier could be evaluated")
+    classifier = ranking [0][2]
+
+    # then, the regression models split the time among the planners picked by
+    # the best classifier
+    regressions = cross_validate (prefix + "regression", REGRESSORS, folds, jar, pool)
+    def predicted (candidate, fold, outcomes):
+        return dict ((((outcome [1], outcome [2]), outcome [0]), prediction)
+                     for outcome, prediction in zip (outcomes, regressions [(candidate, fold)]))
+    ranking = rank (REGRESSORS, folds,
+                    lambda candidate, fold, outcomes: allocate_time (selected (classifier, fold, outcomes),
+                                                                     predicted (candidate, fold, outcomes)),
+                    trajectories)
+    if not ranking:
+        raise RuntimeError ("no regression model could be evaluated")
+    return (classifier, ranking [0][2])
+
+
+# -----------------------------------------------------------------------------
+# select
+#
+# evaluates all the candidates over the results of a sweep, trains the best
+# classifier and regression model on all the problems and writes them into the
+# DCK folder. Unless 'lifted' is False, the best models of the lifted features
+# are selected and written too. Returns the best (classifier, regression model)
+# of the full features
+# -----------------------------------------------------------------------------
+def select (directory, index, jar, dck, k=FOLDS, seed=SEED, jobs=None, cache=None, lifted=True):
+    """
+    evaluates all the candidates over the results of a sweep, trains the best
+    classifier and regression model on all the problems and writes them into
+    the DCK folder. Unless 'lifted' is False, the best models of the lifted
+    features are selected and written too. Returns the best (classifier,
+    regression model) of the full features
+    """
+
+    attributes = dataset.layout ()
+    rows = list (dataset.rows (directory, index))
+    folds = make_folds (rows, attributes, k, seed, cache or os.getcwd ())
+    # the slices are scored with every valid solution of the runs, and not
+    # only with the last one, which anytime planners often find late
+    trajectories = dict (((planner, domain, problem), found)
+                         for (planner, domain, problem, found) in dataset.trajectories (directory))
+    pool = multiprocessing.pool.ThreadPool (jobs or multiprocessing.cpu_count ())
+
+    (classifier, regressor) = choose ("", folds, jar, pool, trajectories)
+    best = [("classification", classifier), ("regression", regressor)]
+    if lifted:
+        print " Selecting the models of the lifted features"
+        (lifted_classifier, lifted_regressor) = choose ("lifted-", folds, jar, pool, trajectories)
+        best += [("lifted-classification", lifted_classifier), ("lifted-regression", lifted_regressor)]
+
+    # finally, train them on all the problems
+    if not os.path.isdir (dck):
+        os.makedirs (dck)
+    allsets = os.path.join (os.path.dirname (folds [0]), "all")
+    pool.map (lambda (kind, (name, classname, options)):
+                  weka (jar, classname, options, "%s-%s.arff" % (allsets, kind),
+                        model=os.path.join (dck, "%s.%s.model" % (name, kind))), best)
+    pool.close ()
+    stream = open (os.path.join (dck, MODELS_FILE), 'w')
+    for (kind, (name, classname, options)) in best:
+        stream.write ("%s %s %s.%s.model %s\n" % (kind, classname, name, kind, " ".join (options)))
+        shutil.copy ("%s-%s.arff" % (allsets, kind), dck)
+    stream.close ()
+    return (classifier, regressor)
+
+
+# -----------------------------------------------------------------------------
+# create_parser
+#
+# creates a command-line parser
+# -----------------------------------------------------------------------------
+def create_parser ():
+    """
+    creates a command-line parser
+    """
+
+    parser = argparse.ArgumentParser (description="Select the models of the portfolio by cross-validation")
+    parser.add_argument ('-d', '--directory', required=True,
+                         help="results directory created by invokeplanner.py, or its outcome archive")
+    parser.add_argument ('-i', '--index', default=dataset.FEATURES_INDEX,
+                         help="features index written by the learner (default: %(default)s)")
+    parser.add_argument ('-w', '--weka', required=True,
+                         help="path to weka.jar")
+    parser.add_argument ('-k', '--dck', required=True,
+                         help="DCK folder where the best models are written")
+    parser.add_argument ('-f', '--folds', type=int, default=FOLDS,
+                         help="number of folds (default: %(default)s)")
+    parser.add_argument ('-s', '--seed', type=int, default=SEED,
+                         help="seed used to deal the problems into folds (default: %(default)s)")
+    parser.add_argument ('-j', '--jobs', type=int, default=None,
+                         help="number of concurrent Weka runs (default: number of cores)")
+    parser.add_argument ('-c', '--cache', default=None,
+                         help="directory where the folds are cached (default: current directory)")
+    parser.add_argument ('-n', '--no-lifted', action='store_true',
+                         help="do not select the models of the lifted features")
+    return parser
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ARGS = create_parser ().parse_args ()
+    (classifier, regressor) = select (ARGS.directory, ARGS.index, ARGS.weka, ARGS.dck,
+                                      ARGS.folds, ARGS.seed, ARGS.jobs, ARGS.cache,
+                                      not ARGS.no_lifted)
+    print " Classifier: %s %s" % (classifier [0], " ".join (classifier [2]))
+    print " Regression model: %s %s" % (regressor [0], " ".join (regressor [2]))
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
@@ -0,0 +1,42 @@
+from maxone import *
+from PyEO import eoParallelPopEval
+import unittest
+
+class RandomEvalFunc(eoEvalFunc):
+    def __call__(self, eo):
+        eo.fitness = reduce(lambda x,y: x+y, eo.genome, 0) + rng().random(1000)
+
+class TestParallelEval(unittest.TestCase):
+    def fitness(self, processes, seed):
+        rng().reseed(seed)
+        pop = eoPop(50, Init(20))
+        evaluate = eoParallelPopEval(RandomEvalFunc(), processes, batch_size=7)
+        evaluate.evaluate(pop)
+        evaluate.close()
+        return [indy.fitness for indy in pop], rng().rand()
+
+    def testSameFitness(self):
+        serial = self.fitness(0, 42)
+        self.failUnlessEqual(serial, self.fitness(1, 42))
+        self.failUnlessEqual(serial, self.fitness(4, 42))
+
+    def testValidNotEvaluated(self):
+        pop = eoPop(10, Init(20))
+        for indy in pop:
+            indy.fitness = -1
+        evaluate = eoParallelPopEval(EvalFunc(), 2)
+        evaluate.evaluate(pop)
+        evaluate.close()
+        for indy in pop:
+            self.failUnlessEqual(indy.fitness, -1)
+
+    def testOffspring(self):
+        pop = eoPop(20, Init(20))
+        evaluate = eoParallelPopEval(EvalFunc(), 2)
+        evaluate(eoPop(), pop)
+        evaluate.close()
+        for indy in pop:
+            self.failUnlessEqual(indy.fitness, sum(indy.genome))
+
+if __name__=='__main__':
+    unittest.main()
@@ -1,31 +0,0 @@
-from .pddl_file import open
-
-from .parser import ParseError
-
-from .pddl_types import Type
-from .pddl_types import TypedObject
-
-from .tasks import Task
-from .tasks import Requirements
-
-from .predicates import Predicate
-
-from .actions import Action
-from .actions import PropositionalAction
-
-from .axioms import Axiom
-from .axioms import PropositionalAxiom
-
-from .conditions import Literal
-from .conditions import Atom
-from .conditions import NegatedAtom
-from .conditions import Falsity
-from .conditions import Truth
-from .conditions import Conjunction
-from .conditions import Disjunction
-from .conditions import UniversalCondition
-from .conditions import ExistentialCondition
-
-from .effects import Effect
-
-from .f_expression import Assign
@@ -17,6 +17,7 @@ class AdditiveHeuristic : public RelaxationHeuristic {
 
     AdaptiveQueue<Proposition *> queue;
     bool did_write_overflow_warning;
+    int additive_value;
 
     void setup_exploration_queue();
     void setup_exploration_queue_state(const State &state);
@@ -53,6 +54,12 @@ protected:
 public:
     AdditiveHeuristic(const Options &options);
     ~AdditiveHeuristic();
+
+    // h^add of the last evaluated state, also when this is an h^FF
+    // heuristic (whose relaxed plan comes from the same exploration)
+    int get_additive_value() const {
+        return additive_value;
+    }
 };
 
 #endif
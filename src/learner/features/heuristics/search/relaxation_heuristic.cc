@@ -2,6 +2,7 @@
 
 #include "globals.h"
 #include "operator.h"
+#include "priority_queue.h"
 #include "state.h"
 
 #include <cassert>
@@ -85,6 +86,67 @@ void RelaxationHeuristic::build_unary_operators(const Operator &op, int op_no) {
     }
 }
 
+// h^max on the relaxed task built by initialize(), as in max_heuristic.cc
+int RelaxationHeuristic::compute_hmax(const State &state) {
+    AdaptiveQueue<Proposition *> queue;
+    for (int var = 0; var < propositions.size(); var++) {
+        for (int value = 0; value < propositions[var].size(); value++)
+            propositions[var][value].cost = -1;
+    }
+    for (int i = 0; i < unary_operators.size(); i++) {
+        UnaryOperator &op = unary_operators[i];
+        op.unsatisfied_preconditions = op.precondition.size();
+        op.cost = op.base_cost;
+        if (op.unsatisfied_preconditions == 0 &&
+            (op.effect->cost == -1 || op.effect->cost > op.base_cost)) {
+            op.effect->cost = op.base_cost;
+            queue.push(op.base_cost, op.effect);
+        }
+    }
+    for (int var = 0; var < propositions.size(); var++) {
+        Proposition *init_prop = &propositions[var][state[var]];
+        if (init_prop->cost == -1 || init_prop->cost > 0) {
+            init_prop->cost = 0;
+            queue.push(0, init_prop);
+        }
+    }
+
+    int unsolved_goals = goal_propositions.size();
+    while (!queue.empty() && unsolved_goals > 0) {
+        pair<int, Proposition *> top_pair = queue.pop();
+        Proposition *prop = top_pair.second;
+        int prop_cost = prop->cost;
+        if (prop_cost < top_pair.first)
+            continue;
+        if (prop->is_goal && --unsolved_goals == 0)
+            break;
+        const vector<UnaryOperator *> &triggered_operators =
+            prop->precondition_of;
+        for (int i = 0; i < triggered_operators.size(); i++) {
+            UnaryOperator *unary_op = triggered_operators[i];
+            unary_op->unsatisfied_preconditions--;
+            unary_op->cost = max(unary_op->cost,
+                                 unary_op->base_cost + prop_cost);
+            if (unary_op->unsatisfied_preconditions == 0) {
+                Proposition *effect = unary_op->effect;
+                if (effect->cost == -1 || effect->cost > unary_op->cost) {
+                    effect->cost = unary_op->cost;
+                    queue.push(unary_op->cost, effect);
+                }
+            }
+        }
+    }
+
+    int total_cost = 0;
+    for (int i = 0; i < goal_propositions.size(); i++) {
+        int prop_cost = goal_propositions[i]->cost;
+        if (prop_cost == -1)
+            return DEAD_END;
+        total_cost = max(total_cost, prop_cost);
+    }
+    return total_cost;
+}
+
 class hash_unary_operator {
 public:
     size_t operator()(const pair<vector<Proposition *>, Proposition *> &key) const {
@@ -57,6 +57,11 @@ protected:
 public:
     RelaxationHeuristic(const Options &options);
     virtual ~RelaxationHeuristic();
+
+    // h^max of the state on the relaxed task of this heuristic, which must
+    // have been evaluated before (so that the task is built). The probe in
+    // training_tasks.cc uses it so that h^max does not build it again.
+    int compute_hmax(const State &state);
 };
 
 #endif
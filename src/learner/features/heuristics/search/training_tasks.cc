@@ -2,79 +2,197 @@
 
 #include "option_parser.h"
 
+#include <cerrno>
 #include <fstream>
+#include <sstream>
 #include <string>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+// position of every heuristic in tmp_results
+enum {ADD, BLIND, CG, CEA, FF, GOALCOUNT, LMCOUNT, LMCUT, HMAX, NUM_HEURISTICS};
+
+// order in which the heuristics are computed. h^FF and h^add come from the
+// same exploration, and h^max is computed on the same relaxed task
+enum {FF_ADD_STEP, HMAX_STEP, BLIND_STEP, GOALCOUNT_STEP, CG_STEP, CEA_STEP,
+      LMCUT_STEP, LMCOUNT_STEP, NUM_STEPS};
+
+static void report(int output, const string &kind, int first, int second = 0) {
+    ostringstream line;
+    line << kind << " " << first << " " << second << endl;
+    string data = line.str();
+    // lines are shorter than PIPE_BUF, so they are written at once
+    while (write(output, data.c_str(), data.size()) == -1 && errno == EINTR) {
+    }
+}
+
+static int evaluate(Heuristic *heuristic, const State &state) {
+    heuristic->evaluate(state);
+    int value = heuristic->get_heuristic();
+    delete heuristic;
+    return value;
+}
+
+// Computes the heuristics from first_step on and writes "step <step>" to
+// output when a step starts and "value <heuristic> <value>" for every value.
+// Every step runs with its own CPU time limit: once it expires, SIGPROF
+// kills the process, so the values written so far are kept.
+void TrainingTasks::compute_heuristics(const State &state, const int cost_type,
+                                       int first_step, int output) {
+    Options default_opt;
+    default_opt.set<int>("cost_type", cost_type);
+
+    // the relaxed task of h^FF, h^add and h^max, if built by this process
+    FFHeuristic *relaxation = 0;
+
+    for (int step = first_step; step < NUM_STEPS; step++) {
+        report(output, "step", step);
+        struct itimerval limit;
+        limit.it_interval.tv_sec = 0;
+        limit.it_interval.tv_usec = 0;
+        limit.it_value.tv_sec = HEURISTIC_TIME_LIMIT;
+        limit.it_value.tv_usec = 0;
+        setitimer(ITIMER_PROF, &limit, 0);
+
+        switch (step) {
+        case FF_ADD_STEP:
+            relaxation = new FFHeuristic(default_opt);
+            relaxation->evaluate(state);
+            report(output, "value", FF, relaxation->get_heuristic());
+            report(output, "value", ADD, relaxation->get_additive_value());
+            break;
+        case HMAX_STEP:
+            if (relaxation)
+                report(output, "value", HMAX, relaxation->compute_hmax(state));
+            else
+                report(output, "value", HMAX, evaluate(new HSPMaxHeuristic(default_opt), state));
+            break;
+        case BLIND_STEP:
+            report(output, "value", BLIND, evaluate(new BlindSearchHeuristic(default_opt), state));
+            break;
+        case GOALCOUNT_STEP:
+            report(output, "value", GOALCOUNT, evaluate(new GoalCountHeuristic(default_opt), state));
+            break;
+        case CG_STEP:
+            report(output, "value", CG, evaluate(new CGHeuristic(default_opt), state));
+            break;
+        case CEA_STEP:
+            report(output, "value", CEA, evaluate(new cea_heuristic::ContextEnhancedAdditiveHeuristic(default_opt), state));
+            break;
+        case LMCUT_STEP:
+            report(output, "value", LMCUT, evaluate(new LandmarkCutHeuristic(default_opt), state));
+            break;
+        case LMCOUNT_STEP: {
+            Options lm_opt;
+            lm_opt.set("cost_type", cost_type);
+            lm_opt.set("lm_cost_type", cost_type);
+            lm_opt.set("reasonable_orders", true);
+            lm_opt.set("only_causal_landmarks", false);
+            lm_opt.set("disjunctive_landmarks", true);
+            lm_opt.set("conjunctive_landmarks", false);
+            lm_opt.set("no_orders", false);
+
+            Exploration *explor = new Exploration(lm_opt);
+
+            lm_opt.set<Exploration *>("explor", explor);
+            LandmarkFactoryRpgSasp lm_graph_factory(lm_opt);
+            LandmarkGraph *graph = lm_graph_factory.compute_lm_graph();
+
+            Options lmcount_opt;
+            lmcount_opt.set("cost_type", cost_type);
+            lmcount_opt.set("admissible", false);
+            lmcount_opt.set("optimal", false);
+            lmcount_opt.set("pref", false);
+            lmcount_opt.set("alm", true);
+            lmcount_opt.set("lm_graph", graph);
+
+            report(output, "value", LMCOUNT, evaluate(new LandmarkCountHeuristic(lmcount_opt), state));
+            delete explor;
+            break;
+        }
+        }
+    }
+    delete relaxation;
+}
 
 void TrainingTasks::solution_path_data_collection(const State &g_initial_state, const int cost_type) {
 
-	std::cout << "-------------------------------------------------- TrainingTasks begin" << std::endl;
+    std::cout << "-------------------------------------------------- TrainingTasks begin" << std::endl;
 
     SearchSpace search_space(((cost_type==0)?NORMAL:((cost_type==1)?ONE:PLUSONE)));
+    SearchNode node = search_space.get_node(g_initial_state);
+    State s = node.get_state();
+
+    vector<string> values(NUM_HEURISTICS, "?");
+
+    // The heuristics are computed in a child process. If it dies (out of
+    // time or memory), the values of the step it was computing are left
+    // as '?' and a new child goes on with the next step.
+    int next_step = 0;
+    while (next_step < NUM_STEPS) {
+        int fds[2];
+        if (pipe(fds) == -1)
+            break;
+        std::cout.flush();
+        pid_t pid = fork();
+        if (pid == -1) {
+            close(fds[0]);
+            close(fds[1]);
+            break;
+        }
+        if (pid == 0) {
+            close(fds[0]);
+            compute_heuristics(s, cost_type, next_step, fds[1]);
+            std::cout.flush();
+            _exit(0);
+        }
+        close(fds[1]);
+
+        string data;
+        char buffer[256];
+        while (true) {
+            ssize_t count = read(fds[0], buffer, sizeof(buffer));
+            if (count > 0)
+                data.append(buffer, count);
+            else if (count == 0 || errno != EINTR)
+                break;
+        }
+        close(fds[0]);
+        int status;
+        while (waitpid(pid, &status, 0) == -1 && errno == EINTR) {
+        }
 
-        vector<Heuristic *> heuristics(9);
-
-        Options default_opt;
-        default_opt.set<int>("cost_type", cost_type);
-
-        Options lm_opt;
-        lm_opt.set("cost_type", cost_type);
-        lm_opt.set("lm_cost_type", cost_type);
-        lm_opt.set("reasonable_orders", true);
-        lm_opt.set("only_causal_landmarks", false);
-        lm_opt.set("disjunctive_landmarks", true);
-        lm_opt.set("conjunctive_landmarks", false);
-        lm_opt.set("no_orders", false);
-
-        Exploration* explor = new Exploration(lm_opt);
-
-        lm_opt.set<Exploration *>("explor", explor);
-        LandmarkFactoryRpgSasp lm_graph_factory(lm_opt);
-        LandmarkGraph *graph = lm_graph_factory.compute_lm_graph();
-
-        Options lmcount_opt;
-        lmcount_opt.set("cost_type", cost_type);
-        lmcount_opt.set("admissible", false);
-        lmcount_opt.set("optimal", false);
-        lmcount_opt.set("pref", false);
-        lmcount_opt.set("alm", true);
-        lmcount_opt.set("lm_graph", graph);
-
-        heuristics[0] = new AdditiveHeuristic(default_opt);
-        heuristics[1] = new BlindSearchHeuristic(default_opt);
-        heuristics[2] = new CGHeuristic(default_opt);
-        heuristics[3] = new cea_heuristic::ContextEnhancedAdditiveHeuristic(default_opt);
-        heuristics[4] = new FFHeuristic(default_opt);
-        heuristics[5] = new GoalCountHeuristic(default_opt);
-        heuristics[6] = new LandmarkCountHeuristic(lmcount_opt);
-        heuristics[7] = new LandmarkCutHeuristic(default_opt);
-        heuristics[8] = new HSPMaxHeuristic(default_opt);
-
-        ofstream results;
-//        results.open("tmp_results", ofstream::app);
-        results.open("tmp_results", ofstream::trunc);
-//results << "--- path_data_collection ---" << std::endl;
-        SearchNode node = search_space.get_node(g_initial_state);
-        State s = node.get_state();
-        
-//////////////////////////////////
-
-    for (int h = 0; h < heuristics.size(); h++) {
-        heuristics[h]->evaluate(s);
-        results << heuristics[h]->get_heuristic();
-        if (h < heuristics.size() - 1) {
-	    results << ",";
-	}
+        int last_step = next_step - 1;
+        istringstream lines(data);
+        string kind;
+        int first, second;
+        while (lines >> kind >> first >> second) {
+            if (kind == "step") {
+                last_step = first;
+            } else {
+                ostringstream value;
+                value << second;
+                values[first] = value.str();
+            }
+        }
+        if (WIFEXITED(status) && WEXITSTATUS(status) == 0)
+            break;
+        std::cout << "TrainingTasks: step " << last_step
+                  << " ran out of time or memory" << std::endl;
+        next_step = max(last_step, next_step) + 1;
     }
-    results << std::endl;
 
-//////////////////////////////////
-        
-        results.close();
-
-        for (int h = 0; h < heuristics.size(); h++) {
-            delete heuristics[h];
-        }
-        delete explor;
+    ofstream results;
+    results.open("tmp_results", ofstream::trunc);
+    for (int h = 0; h < NUM_HEURISTICS; h++) {
+        results << values[h];
+        if (h < NUM_HEURISTICS - 1)
+            results << ",";
+    }
+    results << std::endl;
+    results.close();
 
-	std::cout << "-------------------------------------------------- TrainingTasks end" << std::endl;
+    std::cout << "-------------------------------------------------- TrainingTasks end" << std::endl;
 }
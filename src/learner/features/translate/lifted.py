@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Lifted features of a task.
+
+The first features of translateFile (the names of the domain and task and
+the number of requirements, types, objects, predicates, functions, initial
+facts, goals, actions and axioms, and whether the task has action costs)
+only need the parsed and normalized PDDL task, not its grounding. They are
+computed here in milliseconds, so that the launcher can pick the first
+planner with a model trained on them alone while the rest of the features
+are extracted.
+
+Usage: lifted.py <domain.pddl> <task.pddl>
+"""
+
+from __future__ import print_function
+
+import sys
+
+import translate
+
+# imported by translate from the shared translator
+import normalize
+import pddl
+
+LIFTED_FILE = "liftedFile"
+
+# number of features computed here, as laid out in translateFile
+LIFTED_FEATURES = 12
+
+
+def lifted_features(domain, problem):
+    """Return the lifted features of the task as a line of comma-separated
+    values, in the order of translateFile."""
+    task = pddl.open(problem, domain)
+    normalize.normalize(task)
+    hook = translate.PddlFileHook()
+    hook.task_normalized(task)
+    pddlFile = hook.pddlFile
+    values = [pddlFile.domain_name, pddlFile.task_name,
+              pddlFile.requirements, pddlFile.types, pddlFile.objects,
+              pddlFile.predicates, pddlFile.functions, pddlFile.init,
+              pddlFile.goal, pddlFile.actions, pddlFile.axioms,
+              pddlFile.use_min_cost_metric]
+    assert len(values) == LIFTED_FEATURES
+    return ",".join(str(value) for value in values)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: %s <domain.pddl> <task.pddl>" % sys.argv[0])
+    with open(LIFTED_FILE, "w") as lifted_file:
+        lifted_file.write(lifted_features(sys.argv[1], sys.argv[2]))
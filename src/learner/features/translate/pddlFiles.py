@@ -27,7 +27,7 @@ class PddlFile(object):
 		self.auxiliary_atoms  = -1
 		self.final_queue_length  = -1
 		self.total_queue_pushes = -1 
-		## simplify.apply_to_task. simplify.apply_to_operators(self.operators)
+		## relevance.prune(goal_list, atoms, actions, axioms), only with --relevance-analysis
 		self.operators_removed = -1 ##NO
 		self.propositions_removed = -1 ##NO
 		
@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Where the translator spends its time, over many runs.
+
+Reads the profiles written by the translator (translateProfile, or the
+file given to its --profile option) and reports, for every domain and
+phase, the number of runs, the mean and largest wall-clock time, the
+largest change of resident memory and the task on which the phase took
+longest. The rows are sorted by the largest time, so the phases that
+explode on some domains come first.
+
+Usage: profile_report.py [options] <profile or directory> [...]
+"""
+
+from __future__ import print_function
+
+import json
+import optparse
+import os
+import sys
+
+
+PROFILE_FILE = "translateProfile"
+
+
+def find_profiles(paths, name):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                if name in filenames:
+                    yield os.path.join(dirpath, name)
+        else:
+            yield path
+
+
+def read_profile(filename):
+    try:
+        with open(filename) as profile_file:
+            return json.load(profile_file)
+    except (IOError, ValueError) as error:
+        print("%s: %s" % (filename, error), file=sys.stderr)
+        return None
+
+
+def aggregate(profiles, depth):
+    """Return a dictionary mapping (domain, phase) to a list of
+    (wall, rss_delta, task) over all runs."""
+    rows = {}
+    for profile in profiles:
+        for phase in profile["phases"]:
+            if phase["depth"] <= depth:
+                key = (profile.get("domain"), phase["phase"])
+                rows.setdefault(key, []).append(
+                    (phase["wall"], phase["rss_delta"], profile.get("task")))
+    return rows
+
+
+def parse_options():
+    optparser = optparse.OptionParser(
+        usage="Usage: %prog [options] <profile or directory> [...]")
+    optparser.add_option(
+        "--name", default=PROFILE_FILE,
+        help="name of the profiles in the directories (default: %default)")
+    optparser.add_option(
+        "--depth", type="int", default=0,
+        help="deepest nested phases to report (default: %default)")
+    optparser.add_option(
+        "--top", type="int", default=None,
+        help="only report the slowest phases")
+    optparser.add_option(
+        "--csv", action="store_true",
+        help="print comma-separated values")
+    options, args = optparser.parse_args()
+    if not args:
+        optparser.error("no profiles given")
+    return options, args
+
+
+def main():
+    options, args = parse_options()
+    profiles = [read_profile(filename)
+                for filename in find_profiles(args, options.name)]
+    profiles = [profile for profile in profiles if profile is not None]
+    rows = aggregate(profiles, options.depth)
+
+    lines = []
+    for (domain, phase), runs in rows.items():
+        wall, _, task = max(runs)
+        memory = [delta for _, delta, _ in runs if delta is not None]
+        lines.append((wall, domain, phase, len(runs),
+                      sum(run[0] for run in runs) / len(runs),
+                      max(memory) if memory else None, task))
+    lines.sort(key=lambda line: (-line[0], line[1], line[2]))
+    if options.top is not None:
+        lines = lines[:options.top]
+
+    if options.csv:
+        print("domain,phase,runs,mean_wall,max_wall,max_rss_delta,slowest_task")
+        for wall, domain, phase, runs, mean, memory, task in lines:
+            print(",".join(str(value) for value in
+                           [domain, phase, runs, mean, wall,
+                            "" if memory is None else memory, task]))
+        return
+    print("%d profiles" % len(profiles))
+    print("%-20s %-40s %5s %10s %10s %12s  %s" % (
+        "domain", "phase", "runs", "mean s", "max s", "max RSS KB",
+        "slowest task"))
+    for wall, domain, phase, runs, mean, memory, task in lines:
+        print("%-20s %-40s %5d %10.3f %10.3f %12s  %s" % (
+            domain, phase, runs, mean, wall,
+            "?" if memory is None else memory, task))
+
+
+if __name__ == "__main__":
+    main()
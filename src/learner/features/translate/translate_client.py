@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Thin front end for translate_server.py with the same arguments as
+translate.py. If no server is listening on the socket given by
+$TRANSLATE_SERVER_SOCKET (or the default path), or if that server runs
+another translator, the translator is run in this process instead, so
+the shim can always replace translate.py.
+"""
+
+import os
+import resource
+import socket
+import sys
+
+import translate_service
+
+
+def connect(path):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except socket.error:
+        conn.close()
+        return None
+    return conn
+
+
+def run_remote(conn, argv):
+    """Return the exit code of the translator run by the server, or None
+    if the server refused to run it."""
+    limits = dict((name, resource.getrlimit(getattr(resource, name)))
+                  for name in translate_service.FORWARDED_LIMITS)
+    translate_service.send_message(
+        conn, translate_service.MSG_REQUEST,
+        translate_service.encode_request(os.getcwd(), argv, limits))
+    streams = {translate_service.MSG_STDOUT: sys.stdout,
+               translate_service.MSG_STDERR: sys.stderr}
+    answered = False
+    while True:
+        kind, payload = translate_service.recv_message(conn)
+        if kind is None:
+            if not answered:
+                # Servers older than the handshake drop the request.
+                return None
+            sys.stderr.write("Error: translator server closed the connection\n")
+            return 1
+        answered = True
+        if kind == translate_service.MSG_MISMATCH:
+            sys.stderr.write("Warning: ignoring the translator server (%s)\n"
+                             % payload.decode("utf-8", "replace"))
+            return None
+        if kind == translate_service.MSG_EXIT:
+            return int(payload)
+        stream = streams[kind]
+        stream.write(payload.decode("utf-8", "replace"))
+        stream.flush()
+
+
+def run_local():
+    import translate
+    translate.main()
+    return 0
+
+
+if __name__ == "__main__":
+    conn = connect(translate_service.get_socket_path())
+    if conn is None:
+        sys.exit(run_local())
+    try:
+        code = run_remote(conn, sys.argv[1:])
+    finally:
+        conn.close()
+    if code is None:
+        code = run_local()
+    sys.exit(code)
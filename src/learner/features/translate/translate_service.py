@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Wire protocol shared by translate_server.py and translate_client.py.
+
+Every message is a one-byte kind, a four-byte payload length and the
+payload. The client sends a single request message; the server answers
+with any number of output messages and a final exit message. This
+module must stay free of translator imports so that the client starts
+quickly.
+
+Every request carries the protocol version and the directory of this
+module. A server started from another checkout, or speaking another
+version of the protocol, answers with a mismatch message instead of
+translating, and the client then translates the task itself.
+"""
+
+import json
+import os
+import struct
+
+PROTOCOL_VERSION = 2
+
+## The translator that serves a request must be the one the client would
+## run itself, i.e., the one next to this module.
+ROOT = os.path.dirname(os.path.realpath(os.path.abspath(__file__)))
+
+SOCKET_ENV = "TRANSLATE_SERVER_SOCKET"
+DEFAULT_SOCKET = "/tmp/translate-server-%d.sock" % os.getuid()
+
+## Version 1 requests were b"r"; servers that old drop this kind.
+MSG_REQUEST = b"q"
+MSG_MISMATCH = b"m"
+MSG_STDOUT = b"o"
+MSG_STDERR = b"e"
+MSG_EXIT = b"x"
+
+## Resource limits of the client that the forked translator inherits.
+FORWARDED_LIMITS = ["RLIMIT_AS", "RLIMIT_CPU", "RLIMIT_CORE"]
+
+_HEADER = struct.Struct("!cI")
+
+
+def get_socket_path():
+    return os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+
+def send_message(conn, kind, payload):
+    conn.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exactly(conn, size):
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(conn):
+    """Return (kind, payload), or (None, None) if the peer hung up."""
+    header = _recv_exactly(conn, _HEADER.size)
+    if header is None:
+        return None, None
+    kind, length = _HEADER.unpack(header)
+    payload = _recv_exactly(conn, length)
+    if payload is None:
+        return None, None
+    return kind, payload
+
+
+def encode_request(cwd, argv, limits):
+    return json.dumps({"version": PROTOCOL_VERSION, "root": ROOT,
+                       "cwd": cwd, "argv": argv,
+                       "limits": limits}).encode("utf-8")
+
+
+def decode_request(payload):
+    return json.loads(payload.decode("utf-8"))
+
+
+def get_mismatch(request):
+    """Return why this process must not serve the request, or None."""
+    if request.get("version") != PROTOCOL_VERSION:
+        return "protocol version %s, expected %s" % (
+            request.get("version"), PROTOCOL_VERSION)
+    if request.get("root") != ROOT:
+        return "translator in %s, expected %s" % (request.get("root"), ROOT)
+    return None
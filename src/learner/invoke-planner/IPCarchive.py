@@ -0,0 +1,431 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# IPCarchive.py
+# Description: archive with the outcome of all the runs of a sweep
+# -----------------------------------------------------------------------------
+
+"""
+archive with the outcome of all the runs of a sweep
+
+invokeplanner.py records every run in a single sqlite file when it completes:
+the planner, domain and problem, the time and memory bounds, the runtime and
+memory used, and every solution file with the time it was generated, its plan
+length and its contents. The files that the legacy results tree keeps for every
+run (pddl files, planner output and logs) are stored as well. All contents are
+compressed with zlib and stored once, no matter how many runs share them (e.g.,
+the domain file or the build log of a planner).
+
+The archive is append-only: validating the solutions with VAL (see
+validate.py) adds their status, final value and step length without modifying
+the runs. Reports and training sets (see createModel/dataset.py) are queries
+over the archive, and the legacy results tree can be exported back from it:
+
+    IPCarchive.py --export results outcomes.sqlite
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import argparse         # parser for command-line options
+import hashlib          # digests of the contents
+import os               # path and process management
+import shutil           # rmtree
+import sqlite3          # the archive itself
+import tempfile         # temporary directories for VAL
+import time             # time mgmt
+import zlib             # compression of the contents
+
+import IPClog           # IPC log files
+import validatel0       # validation of solution files
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    planner TEXT, domain TEXT, problem TEXT,
+    timeout INTEGER, memory INTEGER,
+    runtime REAL, memend REAL, memmax REAL,
+    numsols INTEGER, completed REAL);
+CREATE TABLE IF NOT EXISTS solutions (
+    run INTEGER, name TEXT, time REAL, size INTEGER, length INTEGER,
+    digest TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    run INTEGER, name TEXT, digest TEXT);
+CREATE TABLE IF NOT EXISTS contents (
+    digest TEXT PRIMARY KEY, data BLOB);
+CREATE TABLE IF NOT EXISTS validations (
+    run INTEGER, name TEXT, status INTEGER, value NUMERIC, length INTEGER,
+    returncode INTEGER, stderr TEXT);
+CREATE TABLE IF NOT EXISTS validated (
+    run INTEGER PRIMARY KEY, completed REAL);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (planner, domain, problem);
+CREATE INDEX IF NOT EXISTS solutions_run ON solutions (run);
+CREATE INDEX IF NOT EXISTS files_run ON files (run);
+CREATE INDEX IF NOT EXISTS validations_run ON validations (run, name);
+"""
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# planlength
+#
+# returns the number of actions in the given plan, i.e., the number of lines
+# with an action once comments are removed
+# -----------------------------------------------------------------------------
+def planlength (plan):
+    """
+    returns the number of actions in the given plan, i.e., the number of lines
+    with an action once comments are removed
+    """
+
+    return len ([line for line in plan.splitlines ()
+                 if '(' in line.split (';') [0]])
+
+
+# -----------------------------------------------------------------------------
+# IPCarchive
+#
+# archive with the outcome of all the runs of a sweep
+# -----------------------------------------------------------------------------
+class IPCarchive (object):
+    """
+    archive with the outcome of all the runs of a sweep
+    """
+
+    # constructor
+    def __init__ (self, filename):
+        """
+        opens the given archive, which is created if it does not exist
+        """
+
+        self._filename = filename
+        self._db = sqlite3.connect (filename)
+        self._db.text_factory = str
+        self._db.executescript (SCHEMA)
+        self._db.commit ()
+
+
+    # close the archive
+    def close (self):
+        """
+        close the archive
+        """
+
+        self._db.close ()
+
+
+    # stores the given contents once and returns their digest
+    def _store (self, data):
+        """
+        stores the given contents once and returns their digest
+        """
+
+        digest = hashlib.sha1 (data).hexdigest ()
+        self._db.execute ("INSERT OR IGNORE INTO contents VALUES (?, ?)",
+                          (digest, sqlite3.Binary (zlib.compress (data, 9))))
+        return digest
+
+
+    # returns the contents with the given digest
+    def _load (self, digest):
+        """
+        returns the contents with the given digest
+        """
+
+        (data,) = self._db.execute ("SELECT data FROM contents WHERE digest = ?",
+                                    (digest,)).fetchone ()
+        return zlib.decompress (data)
+
+
+    # records a run
+    def add_run (self, planner, domain, problem, timeout, memory, runtime,
+                 memend, memmax, files, solutions):
+        """
+        records a run and returns its id. files is a list of (name, path) with
+        the files of the run as they are named in the results tree and
+        solutions is the list of (name, path, time) of its solution files.
+        Files that do not exist are ignored
+        """
+
+        with self._db:
+            cursor = self._db.execute (
+                "INSERT INTO runs VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (planner, domain, problem, timeout, memory, runtime, memend,
+                 memmax, len (solutions), time.time ()))
+            run = cursor.lastrowid
+
+            for (name, path) in files:
+                if os.access (path, os.R_OK):
+                    self._db.execute ("INSERT INTO files VALUES (?, ?, ?)",
+                                      (run, name, self._store (open (path, 'rb').read ())))
+
+            for (name, path, soltime) in solutions:
+                plan = open (path, 'rb').read ()
+                self._db.execute ("INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?)",
+                                  (run, name, soltime, len (plan),
+                                   planlength (plan), self._store (plan)))
+        return run
+
+
+    # records the validation of a solution file
+    def add_validation (self, run, name, status, value, length, returncode, stderr):
+        """
+        records the validation of a solution file. A solution file that is
+        validated again keeps its last validation
+        """
+
+        with self._db:
+            self._db.execute ("INSERT INTO validations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (run, name, status, value, length, returncode, repr (stderr)))
+
+
+    # returns all the runs
+    def runs (self, planner=None, domain=None, problem=None):
+        """
+        returns the list of runs as tuples (id, planner, domain, problem,
+        timeout, memory, runtime, memend, memmax, numsols), optionally only
+        those of the given planner, domain and/or problem
+        """
+
+        (conditions, values) = ([], [])
+        for (column, value) in [('planner', planner), ('domain', domain), ('problem', problem)]:
+            if value is not None:
+                conditions.append (column + " = ?")
+                values.append (value)
+        query = "SELECT id, planner, domain, problem, timeout, memory, runtime, memend, memmax, numsols FROM runs"
+        if conditions:
+            query += " WHERE " + " AND ".join (conditions)
+        return self._db.execute (query + " ORDER BY planner, domain, problem, id", values).fetchall ()
+
+
+    # returns the solution files of a run
+    def solutions (self, run):
+        """
+        returns the solution files of the given run, in the order they are
+        validated, as tuples (name, time, size, length, status, value,
+        vallength). The last three are None if the solution file has not been
+        validated
+        """
+
+        # solution files are sorted as validatel0 does: shorter names first,
+        # so that plan.soln.2 comes before plan.soln.10
+        return self._db.execute (
+            "SELECT s.name, s.time, s.size, s.length, v.status, v.value, v.length "
+            "FROM solutions s LEFT JOIN validations v ON v.rowid = "
+            "(SELECT max (rowid) FROM validations WHERE run = s.run AND name = s.name) "
+            "WHERE s.run = ? ORDER BY length (s.name), s.name", (run,)).fetchall ()
+
+
+    # returns whether the solution files of a run have been validated
+    def validated (self, run):
+        """
+        returns whether the solution files of the given run have been validated
+        """
+
+        return self._db.execute ("SELECT 1 FROM validated WHERE run = ?",
+                                 (run,)).fetchone () is not None
+
+
+    # returns the contents of a solution file
+    def plan (self, run, name):
+        """
+        returns the contents of the given solution file of a run
+        """
+
+        (digest,) = self._db.execute ("SELECT digest FROM solutions WHERE run = ? AND name = ?",
+                                      (run, name)).fetchone ()
+        return self._load (digest)
+
+
+    # returns the contents of a file
+    def file (self, run, name):
+        """
+        returns the contents of the given file of a run, or None if it was not
+        recorded
+        """
+
+        row = self._db.execute ("SELECT digest FROM files WHERE run = ? AND name = ?",
+                                (run, name)).fetchone ()
+        if row is None:
+            return None
+        return self._load (row [0])
+
+
+    # returns the valid solutions of every run
+    def trajectories (self):
+        """
+        generates the valid solutions of every run as a tuple (planner, domain,
+        problem, solutions), where solutions is the list of the (time, value) of
+        its valid solutions in the order they were found. Runs that have not
+        been validated yet are skipped, as their outcome is not known
+        """
+
+        for (run, planner, domain, problem) in [row [:4] for row in self.runs ()]:
+            if not self.validated (run):
+                print " Warning - the run of %s in %s/%s has not been validated" % (planner, domain, problem)
+                continue
+
+            found = [(float (itime), float (ivalue))
+                     for (name, itime, size, length, status, ivalue, vallength) in self.solutions (run)
+                     if status == validatel0.SUCCESS]
+            yield (planner, domain, problem, found)
+
+
+    # returns the outcome of every run
+    def outcomes (self):
+        """
+        generates the outcome of every run as a tuple (planner, domain, problem,
+        value, time, solved), where value and time are those of the last valid
+        solution (-1 if there is none). Runs that have not been validated yet are
+        skipped, as their outcome is not known
+        """
+
+        for (planner, domain, problem, found) in self.trajectories ():
+            (soltime, value) = found [-1] if found else (-1.0, -1.0)
+            yield (planner, domain, problem, value, soltime, value > -1)
+
+
+    # validates the solution files with VAL
+    def validate (self, verbose=False):
+        """
+        validates with VAL the non-empty solution files of all the runs that
+        have not been validated yet. It returns the number of runs validated,
+        the number of them with correct solutions, the number of solution files
+        validated and the number of them that were found successful
+        """
+
+        nbruns = nbsolved = nbfiles = nbsuccessful = 0
+        workdir = tempfile.mkdtemp (prefix="ipcarchive-")
+        try:
+            for (run, planner, domain, problem) in [row [:4] for row in self.runs ()]:
+                if self.validated (run):
+                    continue
+                if verbose:
+                    print " Validating the run of %s in %s/%s" % (planner, domain, problem)
+
+                for name in ['domain.pddl', 'problem.pddl']:
+                    open (os.path.join (workdir, name), 'wb').write (self.file (run, name) or '')
+                correct = 0
+                for (name, soltime, size) in [solution [:3] for solution in self.solutions (run)]:
+                    if size == 0:
+                        continue
+                    solfile = os.path.join (workdir, name)
+                    open (solfile, 'wb').write (self.plan (run, name))
+                    (status, value, length, returncode, stderr) = \
+                        validatel0.runval (os.path.join (workdir, 'domain.pddl'),
+                                           os.path.join (workdir, 'problem.pddl'), solfile)
+                    self.add_validation (run, name, status, value, length, returncode, stderr)
+                    os.remove (solfile)
+                    nbfiles += 1
+                    correct += int (status == validatel0.SUCCESS)
+
+                with self._db:
+                    self._db.execute ("INSERT INTO validated VALUES (?, ?)", (run, time.time ()))
+                nbruns += 1
+                nbsolved += int (correct > 0)
+                nbsuccessful += correct
+        finally:
+            shutil.rmtree (workdir, ignore_errors=True)
+
+        return (nbruns, nbsolved, nbfiles, nbsuccessful)
+
+
+    # exports the archive to the legacy results tree
+    def export (self, directory):
+        """
+        writes the results tree that invokeplanner.py would have written for
+        all the runs in the given directory, i.e., directory/planner/domain/
+        problem. The VAL log file is written if the solutions of a run have been
+        validated. Runs that already exist in the directory are not overwritten.
+        It returns the number of runs exported
+        """
+
+        nbruns = 0
+        for (run, planner, domain, problem) in [row [:4] for row in self.runs ()]:
+            resultsdir = os.path.join (directory, planner, domain, problem)
+            if os.access (resultsdir, os.F_OK):
+                print " Warning - '%s' already exists and it is skipped" % resultsdir
+                continue
+            os.makedirs (resultsdir)
+
+            for (name, digest) in self._db.execute ("SELECT name, digest FROM files WHERE run = ?",
+                                                    (run,)).fetchall ():
+                open (os.path.join (resultsdir, name), 'wb').write (self._load (digest))
+
+            solutions = self.solutions (run)
+            for solution in solutions:
+                open (os.path.join (resultsdir, solution [0]), 'wb').write (self.plan (run, solution [0]))
+
+            nbruns += 1
+            if not self.validated (run):
+                continue
+
+            # and the VAL log file, as validatel0 writes it
+            vallog = IPClog.IPClog (os.path.join (resultsdir, '_' + planner + '-' + domain + '.' + problem + '-val'))
+            vallog.write ("\n\n")
+            if not solutions:
+                vallog.write ("\n\n")
+            (nbsolfiles, correct) = (0, 0)
+            for (name, soltime, size, length, status, value, vallength) in solutions:
+                if size == 0:
+                    validatel0.logsolution (vallog, name, size)
+                    continue
+                (returncode, stderr) = self._db.execute (
+                    "SELECT returncode, stderr FROM validations WHERE run = ? AND name = ? "
+                    "ORDER BY rowid DESC", (run, name)).fetchone ()
+                validatel0.logsolution (vallog, name, size, status, value, vallength,
+                                        returncode, stderr)
+                nbsolfiles += 1
+                correct += int (status == validatel0.SUCCESS)
+            validatel0.logtotals (vallog, nbsolfiles, correct)
+            vallog.close ()
+
+        return nbruns
+
+
+# -----------------------------------------------------------------------------
+# create_parser
+#
+# creates a command-line parser
+# -----------------------------------------------------------------------------
+def create_parser ():
+    """
+    creates a command-line parser
+    """
+
+    parser = argparse.ArgumentParser (description="Show or export the outcome archive of a sweep")
+    parser.add_argument ('archive',
+                         help="outcome archive written by invokeplanner.py")
+    parser.add_argument ('-x', '--export',
+                         metavar='DIRECTORY',
+                         help="write the legacy results tree of all the runs beneath DIRECTORY")
+    return parser
+
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    ARGS = create_parser ().parse_args ()
+    ARCHIVE = IPCarchive (ARGS.archive)
+
+    if ARGS.export:
+        print " %d runs exported to %s" % (ARCHIVE.export (ARGS.export), ARGS.export)
+    else:
+        for (run, planner, domain, problem, timeout, memory, runtime, memend, memmax, numsols) in ARCHIVE.runs ():
+            print " %-16s %-16s %-8s %8.2f s %10.2f Mb %3d solution(s)%s" % \
+                (planner, domain, problem, runtime, memmax, numsols,
+                 {False: '', True: ' [validated]'} [ARCHIVE.validated (run)])
+    ARCHIVE.close ()
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
@@ -39,12 +39,24 @@
 
 """
 Simple class which redirects the output to a given log file according to a very simple format
+
+It also records the information of the host once per sweep (see hostinfo) and
+the samples taken while a planner runs in a buffered, optionally compressed
+stream (see IPCsamples). readlines reads a log file expanding its samples as
+they used to be written in it
 """
 
 __version__  = '1.2'
 __revision__ = '$Revision: 306 $'
 
 import datetime         # date/time
+import gzip             # compressed samples
+import hashlib          # host ids
+import os               # path management
+import re               # regular expressions
+
+# line of the log files that refers to the samples of the run
+SAMPLESREGEXP = '^ Samples: (?P<samples>[^ \n]+)'
 
 # -----------------------------------------------------------------------------
 # IPClog
@@ -115,6 +127,171 @@ class IPClog(object):
         self.close ()
 
 
+# -----------------------------------------------------------------------------
+# hostinfo
+#
+# writes the version of linux, the cpu and the memory of this host in the file
+# host-<id> of the given directory, unless it exists already, and returns its
+# id, which is given by its contents
+# -----------------------------------------------------------------------------
+def hostinfo (directory='.'):
+    """
+    writes the version of linux, the cpu and the memory of this host in the file
+    host-<id> of the given directory, unless it exists already, and returns its
+    id, which is given by its contents
+    """
+
+    sysdata = (open ('/proc/version', 'r').readlines (), 
+               open ('/proc/cpuinfo', 'r').readlines (), 
+               open ('/proc/meminfo', 'r').readlines ())
+
+    contents = "\n\n * Version: %s\n\n" % sysdata [0]
+    contents += "\n\n * CPUinfo:\n\n" + ''.join ([' ' + iline for iline in sysdata [1]])
+    contents += "\n\n * MEMinfo:\n\n" + ''.join ([' ' + iline for iline in sysdata [2]]) + '\n'
+
+    # the amount of free memory changes all the time, so that only the total
+    # amounts identify the host. Likewise, the clock of every cpu (and the
+    # bogomips computed from it) changes with frequency scaling
+    cpus = [iline for iline in sysdata [1]
+            if not iline.lower ().startswith (('cpu mhz', 'bogomips'))]
+    static = [iline for iline in sysdata [2] if 'Total:' in iline]
+    hostid = hashlib.sha1 (''.join (sysdata [0] + cpus + static)).hexdigest () [:12]
+
+    hostfile = os.path.join (directory, 'host-' + hostid)
+    if (not os.access (hostfile, os.F_OK)):
+        stream = open (hostfile, 'w')
+        stream.write (contents)
+        stream.close ()
+    return hostid
+
+
+# -----------------------------------------------------------------------------
+# IPCsamples
+#
+# buffered stream of the samples taken while a planner runs. Every sample is
+# written as a line with its values separated by blanks, and lines are written
+# in batches. If compress is given, the stream is compressed with gzip and '.gz'
+# is appended to the filename
+# -----------------------------------------------------------------------------
+class IPCsamples(object):
+    """
+    buffered stream of the samples taken while a planner runs. Every sample is
+    written as a line with its values separated by blanks, and lines are written
+    in batches. If compress is given, the stream is compressed with gzip and
+    '.gz' is appended to the filename
+    """
+
+    # format of every sample: real time, total time, total vsize, number of
+    # processes and number of threads
+    FIELDS = "real_time total_time total_vsize num_processes num_threads"
+    FORMAT = "%d %.2f %.2f %d %d\n"
+
+    # constructor
+    def __init__ (self, filename, compress=False, batch=12):
+        """
+        the constructor creates the stream. Samples are written every batch
+        samples
+        """
+
+        if (compress):
+            self.name = filename + '.gz'
+            self._file = gzip.open (self.name, 'wb')
+        else:
+            self.name = filename
+            self._file = open (self.name, 'w')
+        self._batch = batch
+        self._buffer = ["# " + self.FIELDS + "\n"]
+
+
+    # add a new sample
+    def write (self, real_time, total_time, total_vsize, num_processes, num_threads):
+        """
+        add a new sample
+        """
+
+        self._buffer.append (self.FORMAT % (real_time, total_time, total_vsize,
+                                            num_processes, num_threads))
+        if (len (self._buffer) >= self._batch):
+            self.flush ()
+
+
+    # write the samples taken so far
+    def flush (self):
+        """
+        write the samples taken so far
+        """
+
+        self._file.write (''.join (self._buffer))
+        self._file.flush ()
+        self._buffer = []
+
+
+    # write the remaining samples and close the stream
+    def close (self):
+        """
+        write the remaining samples and close the stream
+        """
+
+        self.flush ()
+        self._file.close ()
+
+
+# -----------------------------------------------------------------------------
+# readsamples
+#
+# returns the list of samples in the given file, compressed or not, as tuples
+# of strings in the order given in IPCsamples.FIELDS
+# -----------------------------------------------------------------------------
+def readsamples (filename):
+    """
+    returns the list of samples in the given file, compressed or not, as tuples
+    of strings in the order given in IPCsamples.FIELDS
+    """
+
+    if (filename.endswith ('.gz')):
+        stream = gzip.open (filename, 'rb')
+    else:
+        stream = open (filename, 'r')
+    samples = [tuple (line.split ()) for line in stream.readlines ()
+               if line.strip () and not line.startswith ('#')]
+    stream.close ()
+    return samples
+
+
+# -----------------------------------------------------------------------------
+# readlines
+#
+# returns the lines of the given log file. The samples stream it refers to, if
+# any, is expanded in place as the lines the samples were written with before
+# they were written separately, so that the readers of the log files need not
+# know where the samples are
+# -----------------------------------------------------------------------------
+def readlines (logfile):
+    """
+    returns the lines of the given log file. The samples stream it refers to, if
+    any, is expanded in place as the lines the samples were written with before
+    they were written separately, so that the readers of the log files need not
+    know where the samples are
+    """
+
+    lines = list ()
+    for iline in open (logfile, 'r').readlines ():
+        m = re.match (SAMPLESREGEXP, iline)
+        if (not m):
+            lines.append (iline)
+            continue
+
+        samplesfile = os.path.join (os.path.dirname (logfile), m.group ('samples'))
+        if (not os.access (samplesfile, os.F_OK)):
+            continue
+        for (real_time, total_time, total_vsize, num_processes, num_threads) in readsamples (samplesfile):
+            lines.append (" [real-time %s] total_time: %s\n"  % (real_time, total_time))
+            lines.append (" [real-time %s] total_vsize: %s\n" % (real_time, total_vsize))
+            lines.append (" [real-time %s] num_processes: %s\n" % (real_time, num_processes))
+            lines.append (" [real-time %s] num_threads: %s\n"   % (real_time, num_threads))
+    return lines
+
+
 # Local Variables:
 # mode:python
 # fill-column:80
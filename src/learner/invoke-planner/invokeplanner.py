@@ -26,6 +26,7 @@ import time             # time mgmt
 
 from string import Template     # to use placeholders in the logfile
 
+import IPCarchive       # outcome archive of the sweep
 import IPClog           # for handling IPC log files
 import IPCstat          # sampling facilities
 import argtools         # new argparse actions
@@ -38,6 +39,13 @@ import timetools        # IPC timing management
 # -----------------------------------------------------------------------------
 CHECK_INTERVAL = 5           # how often we query the process group status
 KILL_DELAY = 5               # how long we wait between SIGTERM and SIGKILL
+EVENTSFILE = 'plan.events'   # when every solution file was generated
+
+# the translator shared by the fast-downward planners. Their plan scripts run
+# it from $FD_TRANSLATE, since they are copied to a working directory where
+# their relative path to it no longer holds
+TRANSLATE = os.path.join (os.path.dirname (os.path.abspath (__file__)),
+                          '..', '..', 'fast-downward', 'src', 'translate', 'translate.py')
 
 # create the (rather simple) stats recorded during the execution phase
 RUNTIME = IPCstat.IPCstat ("Overall running time (seconds)") 
@@ -96,6 +104,18 @@ def create_parser ():
     logging = parser.add_argument_group ('Logging', 'The following arguments specify various logging settings')
     logging.add_argument ('-l', '--logfile',
                           help = "name of the logfile where the output of the whole process is recorded. The following placeholders are automatically replaced by their values: $track, $subtrack, $planner and $domain. The current date and time is appended at the end. It is left at the target directory specified with --directory")
+    logging.add_argument ('-z', '--compress',
+                          action = 'store_true',
+                          help = "compress with gzip the samples of time and memory taken while every planner runs")
+
+    # Group of results
+    results = parser.add_argument_group ('Results', 'The following arguments specify where the outcome of every run is recorded')
+    results.add_argument ('-a', '--archive',
+                          help = "name of the sqlite archive where the outcome of every run is recorded as soon as it completes (see IPCarchive.py). If the archive exists, the runs are appended to it. By default, 'outcomes' followed by the current date and time is used")
+    results.add_argument ('-n', '--no-tree',
+                          dest = 'tree',
+                          action = 'store_false',
+                          help = "do not write the results tree (results/<planner>/<domain>/<problem>): the outcome of every run is only recorded in the archive, from which the tree can be exported with IPCarchive.py --export")
 
     # and return the parser
     return parser
@@ -253,69 +273,62 @@ def kill_pgrp(pgrp, sig):
 
 
 # -----------------------------------------------------------------------------
-# get_solutiontimes
+# get_solutionfiles
 #
-# return the solution time which is assumed to be equal to the time elapsed
-# since the generation of the file problem.pddl until the generation of a new
-# solution file
+# return the list of (name, time) of the solution files in the given directory,
+# where the solution time is the time elapsed since the planner was started
+# until the solution file was generated, in seconds with millisecond resolution,
+# as recorded by run in EVENTSFILE. Solution files which were not recorded there
+# get the time elapsed since the generation of the file problem.pddl until the
+# generation of the solution file, in whole seconds
 # -----------------------------------------------------------------------------
-def get_solutiontimes ():
+def get_solutionfiles (directory='.'):
 
     """
-    return the solution time which is assumed to be equal to the time elapsed
-    since the generation of the file problem.pddl until the generation of a new
-    solution file
+    return the list of (name, time) of the solution files in the given
+    directory, where the solution time is the time elapsed since the planner
+    was started until the solution file was generated, in seconds with
+    millisecond resolution, as recorded by run in EVENTSFILE. Solution files
+    which were not recorded there get the time elapsed since the generation of
+    the file problem.pddl until the generation of the solution file, in whole
+    seconds
     """
 
-    # initialization
-    soltimes = []
-
     # Look for any solution file 
-    solfiles = sorted (filter (lambda x : (fnmatch.fnmatch (x, 'plan.soln*')), os.listdir ('.')))
+    solfiles = sorted (filter (lambda x : (fnmatch.fnmatch (x, 'plan.soln*')), os.listdir (directory)))
 
     # in case it has found any
-    if (len (solfiles) != 0):
-        startime = os.stat ('./problem.pddl') [stat.ST_CTIME]
-        soltimes = [os.stat (isolfile) [stat.ST_CTIME] - startime for isolfile in solfiles]
+    if (len (solfiles) == 0):
+        return []
+
+    # retrieve the times recorded while the planner was running
+    soltimes = dict ()
+    eventsfile = os.path.join (directory, EVENTSFILE)
+    if (os.access (eventsfile, os.R_OK)):
+        for line in open (eventsfile):
+            (isolfile, soltime) = line.split ()
+            soltimes [isolfile] = float (soltime)
 
-    # and return the solution times computed so far
-    return soltimes
+    startime = os.stat (os.path.join (directory, 'problem.pddl')) [stat.ST_CTIME]
+    return [(isolfile, soltimes.get (isolfile,
+                                     os.stat (os.path.join (directory, isolfile)) [stat.ST_CTIME] - startime))
+            for isolfile in solfiles]
 
 
 # -----------------------------------------------------------------------------
-# fetch
+# get_solutiontimes
 #
-# gather admin info to be shown up as log files for a particular run
+# return the time when every solution file in the current directory was
+# generated (see get_solutionfiles)
 # -----------------------------------------------------------------------------
-def fetch (logprefix):
+def get_solutiontimes ():
 
     """
-    gather admin info to be shown up as log files for a particular run
+    return the time when every solution file in the current directory was
+    generated (see get_solutionfiles)
     """
 
-    # and now other log files for the sys info
-    logver = IPClog.IPClog (logprefix + '-ver')
-    logcpu = IPClog.IPClog (logprefix + '-cpu')
-    logmem = IPClog.IPClog (logprefix + '-mem')
-
-    sysdata = (open ('/proc/version', 'r').readlines (), 
-               open ('/proc/cpuinfo', 'r').readlines (), 
-               open ('/proc/meminfo', 'r').readlines ())
-
-    logver.write ("\n\n * Version: %s\n\n" % sysdata [0])
-    logcpu.write ("\n\n * CPUinfo:\n\n")
-    for iline in sysdata [1]:
-        logcpu.write (' ' + iline,)
-    
-    logmem.write ("\n\n * MEMinfo:\n\n")
-    for iline in sysdata [2]:
-        logmem.write (' ' + iline,)
-    logmem.write ('\n')
-
-    # close the log files
-    logver.close ()
-    logcpu.close ()
-    logmem.close ()
+    return [soltime for (solfile, soltime) in get_solutionfiles ()]
 
 
 # -----------------------------------------------------------------------------
@@ -332,10 +345,21 @@ def fetch (logprefix):
 # the default computational resources are 15 minutes and 4 Gigabytes. Time is
 # measured in seconds and memory in bytes
 #
-# note that logfile is here an IPClog file and not a standard python logger
+# note that logfile is here an IPClog file and not a standard python logger. It
+# refers to the information of the host, given by its id (see IPClog.hostinfo),
+# and to the samples taken every CHECK_INTERVAL seconds, which are written in
+# batches to their own stream, compressed if compress is given
+#
+# while the planner runs, its solution files are timestamped as soon as they
+# appear with the monotonic clock, relative to the start of the planner, and
+# these times are recorded in EVENTSFILE
+#
+# it returns the overall runtime, the memory at the end and the maximum memory
+# (in Mbytes)
 # -----------------------------------------------------------------------------
 def run (script, iplanner, idomain, directory, domain, problem, output, logfile, 
-         timeout=900, memory=4294967296, multicore=False, dck=False):
+         timeout=900, memory=4294967296, multicore=False, dck=False, host=None,
+         compress=False):
 
     """
     executes the specified 'script' in the current directory to read the
@@ -349,7 +373,18 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
     the default computational resources are 15 minutes and 4 Gigabytes. Time is
     measured in seconds and memory in bytes
     
-    note that logfile is here an IPClog file and not a standard python logger
+    note that logfile is here an IPClog file and not a standard python
+    logger. It refers to the information of the host, given by its id (see
+    IPClog.hostinfo), and to the samples taken every CHECK_INTERVAL seconds,
+    which are written in batches to their own stream, compressed if compress is
+    given
+
+    while the planner runs, its solution files are timestamped as soon as they
+    appear with the monotonic clock, relative to the start of the planner, and
+    these times are recorded in EVENTSFILE
+
+    it returns the overall runtime, the memory at the end and the maximum memory
+    (in Mbytes)
     """
 
     # logger settings
@@ -366,8 +401,15 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
     logstream.write ("\n Timeout: %i seconds" % timeout)
     logstream.write ("\n Memory : %i bytes\n" % memory)
 
-    # write info on the linux version, cpu and mem available
-    sysdata = fetch (logfile)
+    # refer to the info on the linux version, cpu and mem available, which is
+    # only written once
+    if (not host):
+        host = IPClog.hostinfo ()
+    logstream.write ("\n Host: host-%s" % host)
+
+    # and to the samples of this run
+    samples = IPClog.IPCsamples (logfile + '-samples', compress)
+    logstream.write ("\n Samples: %s\n" % os.path.basename (samples.name))
 
     # Initialization
     total_vsize = 0
@@ -385,6 +427,9 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
     # whole process group is killed
     with runtimer:
 
+        # the solution files are timestamped relative to the start of the planner
+        events = timetools.PlanEvents ('.', 'plan.soln*', timetools.monotonic ())
+
         child_pid = os.fork()
         if not child_pid:                                            # child's code
             os.setpgrp()
@@ -409,7 +454,7 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
         max_mem   = 0
         real_time = 0
         while True:
-            time.sleep(CHECK_INTERVAL)
+            events.sleep(CHECK_INTERVAL)
             real_time += CHECK_INTERVAL
 
             group = systools.ProcessGroup(child_pid)
@@ -425,10 +470,7 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
             total_vsize = group.total_vsize()
             num_processes = group.total_processes ()
             num_threads = group.total_threads ()
-            logstream.write ("\n [real-time %d] total_time: %.2f"  % (real_time, total_time))
-            logstream.write ("\n [real-time %d] total_vsize: %.2f" % (real_time, total_vsize))
-            logstream.write ("\n [real-time %d] num_processes: %d" % (real_time, num_processes))
-            logstream.write ("\n [real-time %d] num_threads: %d"   % (real_time, num_threads))
+            samples.write (real_time, total_time, total_vsize, num_processes, num_threads)
 
             # update the maximum memory usage
             max_mem = max (max_mem, total_vsize)
@@ -476,6 +518,15 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
         # emptiness test.
         kill_pgrp(child_pid, signal.SIGKILL)
 
+        samples.close ()
+
+        # look for the solution files written since the last poll and record
+        # the time when every solution was generated
+        events.poll ()
+        with open (EVENTSFILE, 'w') as stream:
+            for (isolfile, soltime) in events.events:
+                stream.write ("%s %.3f\n" % (isolfile, soltime))
+
         # check whether the planner actually found solutions or not
         solutiontimes = get_solutiontimes ()
 
@@ -483,7 +534,8 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
             logstream.write ("\n No solutions found!")
         else:
             logstream.write ("\n Number of solutions found: %i" % len (solutiontimes))
-            logstream.write ("\n Time/solution            : %s" % solutiontimes)
+            logstream.write ("\n Time/solution            : [%s]" %
+                             ", ".join (["%.3f" % soltime for soltime in solutiontimes]))
 
         # return to the previous directory
         os.chdir (cwd)
@@ -501,8 +553,10 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
     
     # close the log file
     logstream.close ()
-    
-    
+
+    return (runtimer.elapsed (), total_vsize, max_mem)
+
+
 # -----------------------------------------------------------------------------
 # collect
 #
@@ -511,8 +565,14 @@ def run (script, iplanner, idomain, directory, domain, problem, output, logfile,
 # output in a directory which results from the given planner/domain
 #
 # logfile is the compilation log file
+#
+# if an archive is given, the run is recorded in it along with its outcome, a
+# tuple (timeout, memory, runtime, memend, memmax), and the information of the
+# host it was run on, given by its id. Unless tree is False, the files are also
+# moved to the results tree
 # -----------------------------------------------------------------------------
-def collect (workingdir, planner, domain, problem):
+def collect (workingdir, planner, domain, problem, archive=None, outcome=None, tree=True,
+             host=None):
 
     """
     it goes to the given directory and extracts all files that are expected to
@@ -520,6 +580,11 @@ def collect (workingdir, planner, domain, problem):
     the output in a directory which results from the given planner/domain
 
     logfile is the compilation log file
+
+    if an archive is given, the run is recorded in it along with its outcome, a
+    tuple (timeout, memory, runtime, memend, memmax), and the information of
+    the host it was run on, given by its id. Unless tree is False, the files are
+    also moved to the results tree
     """
 
     def movedata (file, src, dst):
@@ -541,6 +606,29 @@ def collect (workingdir, planner, domain, problem):
     # logger settings
     logger = logging.getLogger('invokeplanner::collect')
 
+    prefix = '_' + planner + '-' + domain + '.' + problem
+    samples = fnmatch.filter (os.listdir (workingdir), prefix + '-samples*')
+
+    # record the run in the archive with the same files the results tree keeps
+    if (archive):
+        logger.info (" Recording the run of %s in %s/%s" % (planner, domain, problem), extra=LOGDICT)
+        files = [('build-' + planner + '.log', workingdir + '/../build-' + planner + '.log'),
+                 ('domain.pddl', workingdir + '/original-domain.pddl'),
+                 ('problem.pddl', workingdir + '/original-problem.pddl'),
+                 ('planner.err', workingdir + '/planner.err'),
+                 ('planner.log', workingdir + '/planner.log')]
+        files += [(name, workingdir + '/' + name) for name in [prefix + '-log'] + samples]
+        if (host):
+            files.append (('host-' + host, './host-' + host))
+        solutions = [(isolfile, workingdir + '/' + isolfile, soltime)
+                     for (isolfile, soltime) in get_solutionfiles (workingdir)]
+        (timeout, memory, runtime, memend, memmax) = outcome
+        archive.add_run (planner, domain, problem, timeout, memory, runtime,
+                         memend, memmax, files, solutions)
+
+    if (not tree):
+        return
+
     # compute the name of the results directory for this case
     resultsdir = workingdir + '/../results/' + planner + '/' + domain + '/' + problem
 
@@ -568,11 +656,9 @@ def collect (workingdir, planner, domain, problem):
     movedata ('planner.err' , workingdir, resultsdir)
     movedata ('planner.log' , workingdir, resultsdir)
 
-    prefix = '_' + planner + '-' + domain + '.' + problem
     movedata (prefix + '-log', workingdir, resultsdir)
-    movedata (prefix + '-cpu', workingdir, resultsdir)
-    movedata (prefix + '-mem', workingdir, resultsdir)
-    movedata (prefix + '-ver', workingdir, resultsdir)
+    for isamples in samples:
+        movedata (isamples, workingdir, resultsdir)
 
     # get all the solution files
     files = os.listdir (workingdir)
@@ -587,12 +673,21 @@ def collect (workingdir, planner, domain, problem):
 #
 # takes the specified planner/domain from the src folder and sets up the
 # environment to run the experiment.
+#
+# the outcome of every run is recorded in the archive, if any, and in the
+# results tree unless tree is False. The samples taken while every planner runs
+# are compressed if compress is given
 # -----------------------------------------------------------------------------
 
-def setup (planner, domain, problems, timeout=900, memory=4294967296):
+def setup (planner, domain, problems, timeout=900, memory=4294967296, archive=None, tree=True,
+           compress=False):
     """
     takes the specified planner/domain from the src folder
     and sets up the environment to run the experiment.
+
+    the outcome of every run is recorded in the archive, if any, and in the
+    results tree unless tree is False. The samples taken while every planner
+    runs are compressed if compress is given
     """
 
     # logger settings
@@ -600,6 +695,9 @@ def setup (planner, domain, problems, timeout=900, memory=4294967296):
     logger.info (" Building planners ...", extra=LOGDICT)
     builtplanner = []
 
+    # every planner run below inherits the absolute path to the translator
+    os.environ.setdefault ('FD_TRANSLATE', os.path.normpath (TRANSLATE))
+
     # first, copy and compile each planner
     for current_planner in planner:
         planner_name = current_planner[current_planner.rfind("/") + 1:]
@@ -664,6 +762,9 @@ def setup (planner, domain, problems, timeout=900, memory=4294967296):
     os.system(command)
 
 
+    # the information of this host is recorded only once for all the runs
+    host = IPClog.hostinfo ()
+
     print "\nRunning each candidate planner with every training problem...\n"
     # now, for every built planner
     for iplanner in builtplanner:
@@ -720,9 +821,11 @@ def setup (planner, domain, problems, timeout=900, memory=4294967296):
                 # allow the run script to use clock wall time instead of the
                 # accumulated time of its children
                 logname = workingdir + '/_' + iplanner + '-' + domain_name + '.' + suffix
-                run ('plan', iplanner, domain_name, workingdir, 'domain.pddl', 'problem.pddl', 'output', 
-                     logname, timeout, memory, False, False)
-                collect (workingdir, iplanner, domain_name, suffix)
+                (runtime, memend, memmax) = \
+                    run ('plan', iplanner, domain_name, workingdir, 'domain.pddl', 'problem.pddl', 'output', 
+                         logname, timeout, memory, False, False, host, compress)
+                collect (workingdir, iplanner, domain_name, suffix, archive,
+                         (timeout, memory, runtime, memend, memmax), tree, host)
 
                 # now, delete the working dir
                 shutil.rmtree (workingdir)
@@ -774,14 +877,16 @@ class dispatcher (object):
     """
 
     # Default constructor
-    def __init__ (self, planner, domain, problems, logfile, timeout, memory):
+    def __init__ (self, planner, domain, problems, logfile, timeout, memory,
+                  archive=None, tree=True, compress=False):
         """
         Default constructor
         """
         
         # copy the private attributes
-        (self._planner, self._domain, self._problems, self._logfile, self._timeout, self._memory) = \
-         (planner, domain, problems, logfile, timeout, memory)
+        (self._planner, self._domain, self._problems, self._logfile, self._timeout, self._memory,
+         self._archive, self._tree, self._compress) = \
+         (planner, domain, problems, logfile, timeout, memory, archive, tree, compress)
 
 
     # Execute the following body when building plannerss
@@ -813,9 +918,18 @@ class dispatcher (object):
         # show the current params
         show_switches (self._planner, self._domain, self._problems, self._timeout, self._memory)
 
+        # open the outcome archive of this sweep
+        if (self._archive):
+            archivename = self._archive
+        else:
+            archivename = 'outcomes.' + datetime.datetime.now ().strftime ("%y-%m-%d.%H:%M:%S") + '.sqlite'
+        logger.info (" Recording the outcome of every run in %s" % os.path.abspath (archivename), extra=LOGDICT)
+        archive = IPCarchive.IPCarchive (archivename)
+
         # finally, run the experiments
         try:
-            setup (self._planner, self._domain, self._problems, timeout=self._timeout, memory=self._memory)
+            setup (self._planner, self._domain, self._problems, timeout=self._timeout, memory=self._memory,
+                   archive=archive, tree=self._tree, compress=self._compress)
 
             # and show the overall running time consumed per planner/domain and the
             # overall totals
@@ -825,6 +939,8 @@ class dispatcher (object):
             logger.critical (" An exception was caught. Exiting ... ", extra=LOGDICT)
             logger.critical (" %s" % msg, extra=LOGDICT)
 
+        archive.close ()
+
 
     # Make sure that the automated e-mail notification is invoked everytime the
     # dispatcher is about to exit ---to whatever reason happens
@@ -854,12 +970,14 @@ if __name__ == '__main__':
     print "Problems: " + str(ARGS.problems)
     print "Log file: " + str(ARGS.logfile)
     print "Timeout: " + str(ARGS.timeout)
-    print "Memory: " + str(ARGS.memory) + "\n"
+    print "Memory: " + str(ARGS.memory)
+    print "Archive: " + str(ARGS.archive) + "\n"
 
     # Now, enclose all the process in a with statement so that the automated
     # e-mail facility is called whatever happens inside this body
     DISPATCHER = dispatcher (ARGS.planner, ARGS.domain, ARGS.problems,
-                             ARGS.logfile, ARGS.timeout, ARGS.memory)
+                             ARGS.logfile, ARGS.timeout, ARGS.memory,
+                             ARGS.archive, ARGS.tree, ARGS.compress)
 
     with DISPATCHER:
         
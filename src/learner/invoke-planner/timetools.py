@@ -47,32 +47,158 @@ __revision__ = '$Revision: 306 $'
 
 # imports
 # -----------------------------------------------------------------------------
+import ctypes                   # clock_gettime
+import ctypes.util              # find_library
+import fnmatch                  # Unix filename matching
+import os                       # listdir
 import time                     # time management
 
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+CLOCK_MONOTONIC = 1             # see <linux/time.h>
+POLL_INTERVAL = 0.01            # how often PlanEvents looks for new plans
+
+# -----------------------------------------------------------------------------
+# _clock
+#
+# returns the monotonic clock of the system, in seconds, as a function. If
+# clock_gettime is not available, the elapsed real time given by os.times is
+# used instead, which is also monotonic though its resolution is coarser
+# -----------------------------------------------------------------------------
+def _clock ():
+
+    """
+    returns the monotonic clock of the system, in seconds, as a function. If
+    clock_gettime is not available, the elapsed real time given by os.times is
+    used instead, which is also monotonic though its resolution is coarser
+    """
+
+    class timespec (ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+    try:
+        librt = ctypes.CDLL (ctypes.util.find_library ('rt') or
+                             ctypes.util.find_library ('c'), use_errno=True)
+        clock_gettime = librt.clock_gettime
+        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER (timespec)]
+    except (OSError, AttributeError):
+        return lambda : os.times () [4]
+
+    def monotonic ():
+        t = timespec ()
+        if clock_gettime (CLOCK_MONOTONIC, ctypes.pointer (t)):
+            raise OSError (ctypes.get_errno (), os.strerror (ctypes.get_errno ()))
+        return t.tv_sec + t.tv_nsec * 1e-9
+
+    return monotonic
+
+# the time, in seconds, of a clock which can not go backwards. Only differences
+# of its readings are meaningful
+monotonic = _clock ()
+
+# the reading of the monotonic clock when this process started
+START = monotonic ()
+
+
 # -----------------------------------------------------------------------------
 # Timer
 #
 # this class creates a block to be used within a with statement. It
 # exactly measures the time between the entry and exit points of the
-# with block
+# with block with the monotonic clock
 # -----------------------------------------------------------------------------
 class Timer(object):
 
     """
     this class creates a block to be used within a with statement. It exactly
-    measures the time between the entry and exit points of the with block
+    measures the time between the entry and exit points of the with block with
+    the monotonic clock
     """
 
     def __enter__(self):
-        self.__start = time.time()
+        self.__start = monotonic ()
 
     def __exit__(self, type, value, traceback):
-        self.__finish = time.time()
+        self.__finish = monotonic ()
 
     def elapsed (self):
         return self.__finish - self.__start
 
 
+# -----------------------------------------------------------------------------
+# PlanEvents
+#
+# this class records the time when every plan file matching the given pattern
+# appears in directory. Times are taken with the monotonic clock, relative to
+# origin (by default, the start of this process), and rounded to milliseconds.
+# It only sees the files when poll is invoked, so use its sleep instead of
+# time.sleep while waiting for the planner. A file which disappears (e.g. because
+# it was renamed) and is later created again is recorded anew
+# -----------------------------------------------------------------------------
+class PlanEvents(object):
+
+    """
+    this class records the time when every plan file matching the given pattern
+    appears in directory. Times are taken with the monotonic clock, relative to
+    origin (by default, the start of this process), and rounded to
+    milliseconds. It only sees the files when poll is invoked, so use its sleep
+    instead of time.sleep while waiting for the planner. A file which
+    disappears (e.g. because it was renamed) and is later created again is
+    recorded anew
+    """
+
+    def __init__ (self, directory, pattern, origin=None):
+        self.__directory = directory
+        self.__pattern = pattern
+        self.__origin = START if origin is None else origin
+        self.__present = set ()
+        self.__times = dict ()
+        self.events = list ()
+
+    def poll (self):
+        """
+        records the plan files which appeared since the last poll and returns
+        them as a list of (name, time)
+        """
+
+        now = round (monotonic () - self.__origin, 3)
+        present = set (fnmatch.filter (os.listdir (self.__directory), self.__pattern))
+        events = [(name, now) for name in sorted (present - self.__present)]
+        self.__present = present
+        for (name, soltime) in events:
+            self.__times [name] = soltime
+        self.events += events
+        return events
+
+    def sleep (self, seconds, interval=POLL_INTERVAL):
+        """
+        waits the given number of seconds polling the directory every interval
+        seconds
+        """
+
+        deadline = monotonic () + seconds
+        self.poll ()
+        while True:
+            left = deadline - monotonic ()
+            if left <= 0:
+                break
+            time.sleep (min (interval, left))
+            self.poll ()
+
+    def when (self, name):
+        """
+        returns the time when the plan file name was last seen appearing. If it
+        has not been seen yet, the directory is polled first. It returns None if
+        it does not exist
+        """
+
+        if name not in self.__present:
+            self.poll ()
+        return self.__times.get (name)
+
+
 # Local Variables:
 # mode:python
 # fill-column:80
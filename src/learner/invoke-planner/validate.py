@@ -60,6 +60,7 @@ import time             # time mgmt
 
 import PrettyTable      # beautified ascii output
 
+import IPCarchive       # outcome archives
 import IPCini           # for accessing the ini configuration files
 
 import argtools         # new argparse actions
@@ -99,7 +100,7 @@ def create_parser ():
     mandatory = parser.add_argument_group ("Mandatory arguments", "The following arguments are required. Note that it is assumed that the INI configuration file is '~/.ipc.ini'")
     mandatory.add_argument ('-d', '--directory',
                             required=True,
-                            help ="specifies the directory to examine. All terminal directories found beneath the given one will be validated" )
+                            help ="specifies the directory to examine. All terminal directories found beneath the given one will be validated. If an outcome archive written by invokeplanner.py is given instead, all its runs that have not been validated yet are validated and the results are recorded in the archive" )
 
     # Group of configuration arguments
     conf = parser.add_argument_group ('Configuration arguments', 'The following arguments set various configuration parameters')
@@ -407,8 +408,13 @@ class dispatcher (object):
         # check that the Automatic Validation Tool is available in the system
         validatel0.checkval ()
 
-        # and validate the results
-        (nbdirs, nbsolved, nbfiles, nbsuccessful) = validate (self._directory, verbose=self._verbose)
+        # and validate the results, either in a results tree or in an archive
+        if (os.path.isfile (self._directory)):
+            archive = IPCarchive.IPCarchive (self._directory)
+            (nbdirs, nbsolved, nbfiles, nbsuccessful) = archive.validate (verbose=self._verbose)
+            archive.close ()
+        else:
+            (nbdirs, nbsolved, nbfiles, nbsuccessful) = validate (self._directory, verbose=self._verbose)
 
         # show the output
         show_output (nbdirs, nbsolved, nbfiles, nbsuccessful)
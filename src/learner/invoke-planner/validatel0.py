@@ -364,6 +364,76 @@ def checkoutput (lines):
             re.match (FINALVALUE, cost [0]).group ('length'))
 
 
+# -----------------------------------------------------------------------------
+# runval
+#
+# validates the given solution file with VAL. It returns a tuple with the status
+# of the plan, its final value and step length (as in checkoutput), the return
+# code of VAL and the lines it wrote to the standard error
+# -----------------------------------------------------------------------------
+def runval (domain, problem, solfile):
+    """
+    validates the given solution file with VAL. It returns a tuple with the
+    status of the plan, its final value and step length (as in checkoutput), the
+    return code of VAL and the lines it wrote to the standard error
+    """
+
+    # launch the automated validation and capture the standard output, the
+    # standard error and the return value
+    valprocess = subprocess.Popen ([VAL, "-L", "-t", "0.000005", 
+                                    domain, problem, solfile], 
+                                   bufsize=-1, stdout=subprocess.PIPE, 
+                                   stderr=subprocess.PIPE)
+
+    # wait for the validation to terminate so that the return code can be
+    # captured
+    (stdout, stderr) = valprocess.communicate ()
+    (status, value, length) = checkoutput (stdout.splitlines (True))
+    return (status, value, length, valprocess.returncode, stderr.splitlines (True))
+
+
+# -----------------------------------------------------------------------------
+# logsolution
+#
+# writes the validation of a solution file in the given VAL log file. If no
+# status is given, the solution file was empty and it is marked as skipped
+# -----------------------------------------------------------------------------
+def logsolution (vallog, solfile, solsize, status=None, value=None, length=None,
+                 returncode=None, stderr=None):
+    """
+    writes the validation of a solution file in the given VAL log file. If no
+    status is given, the solution file was empty and it is marked as skipped
+    """
+
+    vallog.write ( " Solution file: %s\n" % solfile )
+    if (status is None):
+        vallog.write ( " Size         : %i [skipped]\n\n" % solsize)
+        return
+
+    vallog.write ( " Size         : %i\n" % solsize)
+    vallog.write ( " Status       : %s\n" % status )
+    vallog.write ( " Value        : %s\n" % value )
+    vallog.write ( " Step length  : %s\n" % length )
+    vallog.write ( " return code  : %s\n" % returncode )
+    vallog.write ( " stderr       : %s\n\n" % stderr)
+
+
+# -----------------------------------------------------------------------------
+# logtotals
+#
+# writes the number of solution files validated and the number of them that were
+# found successful in the given VAL log file
+# -----------------------------------------------------------------------------
+def logtotals (vallog, nbsolfiles, correct):
+    """
+    writes the number of solution files validated and the number of them that
+    were found successful in the given VAL log file
+    """
+
+    vallog.write (" Number of solution files found: " + str (nbsolfiles) + "\n")
+    vallog.write (" Number of correct solutions found: " + str (correct) + "\n\n")
+
+
 # -----------------------------------------------------------------------------
 # validate0
 #
@@ -429,8 +499,8 @@ def validate0 (directory, verbose=False, error=True):
     # and the result of the automated validation - count also the number of
     # validated solutions found
     if (len (solfiles) == 0):
-        vallog.write ("\n\n Number of solution files found: 0\n")
-        vallog.write (" Number of correct solutions found: 0\n\n")
+        vallog.write ("\n\n")
+        logtotals (vallog, 0, 0)
 
         if (verbose):
             logger.info (""" Number of solution files found: 0
@@ -448,31 +518,17 @@ def validate0 (directory, verbose=False, error=True):
             # only in case the file is not empty
             if (solsize > 0):
 
-                # launch the automated validation and capture the standard output,
-                # the standard error and the return value
-                valprocess = subprocess.Popen ([VAL, "-L", "-t", "0.000005", 
-                                                directory + '/' + "domain.pddl", 
-                                                directory + '/' + "problem.pddl", 
-                                                directory + '/' + isolfile], 
-                                               bufsize=-1, stdout=subprocess.PIPE, 
-                                               stderr=subprocess.PIPE)
-
-                # wait for the validation to terminate so that the return code can
-                # be captured
-                valprocess.wait ()
+                # launch the automated validation
                 try:
-                    (status, value, length) = checkoutput (valprocess.stdout.readlines ())
+                    (status, value, length, returncode, stderr) = \
+                        runval (directory + '/' + "domain.pddl", 
+                                directory + '/' + "problem.pddl", 
+                                directory + '/' + isolfile)
                 except:
                     logger.critical(" Fatal Error in directory '%s'" % directory, extra=LOGDICT)
                     raise IOError
 
-                vallog.write ( " Solution file: %s\n" % isolfile )
-                vallog.write ( " Size         : %i\n" % solsize)
-                vallog.write ( " Status       : %s\n" % status )
-                vallog.write ( " Value        : %s\n" % value )
-                vallog.write ( " Step length  : %s\n" % length )
-                vallog.write ( " return code  : %s\n" % valprocess.returncode )
-                vallog.write ( " stderr       : %s\n\n" % valprocess.stderr.readlines ())
+                logsolution (vallog, isolfile, solsize, status, value, length, returncode, stderr)
 
                 if (verbose):
                     logger.info ( """ Solution file: %s
@@ -490,16 +546,14 @@ def validate0 (directory, verbose=False, error=True):
             # otherwise note this explicitly in the vallog
             else:
 
-                vallog.write ( " Solution file: %s\n" % isolfile )
-                vallog.write ( " Size         : %i [skipped]\n\n" % solsize)
+                logsolution (vallog, isolfile, solsize)
 
                 if (verbose):
                     logger.info ( """ Solution file: %s
  Size         : %i [skipped]\n\n""" % (isolfile, solsize), extra=LOGDICT)
 
         # print the number of correct solutions found so far before exiting
-        vallog.write (" Number of solution files found: " + str (nbsolfiles) + "\n")
-        vallog.write (" Number of correct solutions found: " + str (correct) + "\n\n")
+        logtotals (vallog, nbsolfiles, correct)
 
     # close the log val file
     vallog.close ()
@@ -7,11 +7,111 @@ __email__ = "icenamor@inf.uc3m.es"
 
 # imports
 # -----------------------------------------------------------------------------
+import multiprocessing  # pool of feature extractions
 import os               # path and process management
+import shutil           # scratch directories
+import subprocess       # translator server
 import sys              # argv, exit
+import time             # time mgmt
+
+import featuretools     # time-budgeted feature extraction
 
 TIME_LIMIT = 900
 MEMORY_LIMIT = 4096
+SERVER_STARTUP_TIMEOUT = 30  # seconds we wait for the translator server
+
+# feature extraction of every training problem. Many problems are extracted at
+# once, so that the deadlines are CPU time (see featuretools.py) and the budget
+# only guards against extractors that hang
+FEATURES_BUDGET = 300        # seconds for the whole feature extraction
+TRANSLATE_DEADLINE = 180     # translate_client.py
+PREPROCESS_DEADLINE = 120    # preprocess, started once output.sas is ready
+FFLEARNER_DEADLINE = 120     # roller3.0
+HEURISTICS_DEADLINE = 180    # training.sh (its search is also limited to 100s CPU)
+EXTRACTORS = 4               # extractors of a problem that run at once
+JOBS_ENV = "LEARNER_JOBS"    # number of concurrent feature extractions and Weka runs
+
+translator_server = None
+
+# -----------------------------------------------------------------------------
+# start_translator_server
+#
+# starts the resident translator and exports its socket to translate_client.py
+# -----------------------------------------------------------------------------
+def start_translator_server(rootpath):
+    """
+    starts the resident translator and exports its socket to translate_client.py
+    """
+
+    global translator_server
+
+    socket_path = "/tmp/translate-server-%d.sock" % os.getpid()
+    os.environ["TRANSLATE_SERVER_SOCKET"] = socket_path
+    translator_server = subprocess.Popen(["python2.7", rootpath + "/features/translate/translate_server.py", socket_path])
+    waited = 0
+    while not os.path.exists(socket_path) and waited < SERVER_STARTUP_TIMEOUT:
+        time.sleep(0.1)
+        waited += 0.1
+    if not os.path.exists(socket_path):
+        # translate_client.py falls back to an in-process translator
+        print "Warning: the translator server did not start"
+
+
+# -----------------------------------------------------------------------------
+# stop_translator_server
+#
+# terminates the resident translator
+# -----------------------------------------------------------------------------
+def stop_translator_server():
+    """
+    terminates the resident translator
+    """
+
+    if translator_server is not None and translator_server.poll() is None:
+        translator_server.terminate()
+        translator_server.wait()
+    del os.environ["TRANSLATE_SERVER_SOCKET"]
+
+
+# -----------------------------------------------------------------------------
+# extract_features
+#
+# extracts the features of a training problem in its own scratch directory and
+# returns its problem id along with the features line and the names of the
+# feature groups that were imputed
+# -----------------------------------------------------------------------------
+def extract_features(job):
+    """
+    extracts the features of a training problem in its own scratch directory and
+    returns its problem id along with the features line and the names of the
+    feature groups that were imputed
+    """
+
+    (rootpath, domain_file, problem_file, problem_id, scratch) = job
+    if os.path.isdir(scratch):
+        shutil.rmtree(scratch)
+    os.mkdir(scratch)
+    print "Extract Features with original problem and domain: " + problem_file
+    # preprocess waits for the output.sas of the translator, the other
+    # extractors run concurrently, each in its own scratch directory
+    controller = featuretools.FeatureController(FEATURES_BUDGET, scratch, cpu_time=True)
+    command = "python2.7 " + rootpath + "/features/translate/translate_client.py " + domain_file + " " + problem_file
+    controller.add(featuretools.Extractor("translate", command, ["translateFile", "translateProfile", "output.sas"], TRANSLATE_DEADLINE))
+    command =  rootpath + "/features/preprocess/preprocess < output.sas"
+    controller.add(featuretools.Extractor("preprocess", command, ["features.arff", "output"], PREPROCESS_DEADLINE,
+                                          requires=["translate"], inputs=["output.sas"]))
+    command = rootpath + "/features/ff-learner/roller3.0 -o " + domain_file + " -f " + problem_file + " -S 28 > init-features.txt"
+    controller.add(featuretools.Extractor("ff-learner", command, ["initfeature-info.txt", "init-features.txt"], FFLEARNER_DEADLINE))
+    command = rootpath + "/features/heuristics/training.sh "  + domain_file + " " + problem_file
+    controller.add(featuretools.Extractor("heuristics", command, ["tmp_results"], HEURISTICS_DEADLINE))
+    controller.run()
+    controller.join()
+    controller.report()
+    features = joinFile.read_features(scratch)
+    shutil.rmtree(scratch)
+    sys.stdout.flush()
+    return (problem_id, features, controller.imputed())
+
 
 # main
 # -----------------------------------------------------------------------------
@@ -57,53 +157,58 @@ if __name__ == '__main__':
     print "Training folder: " + training_folder
     print "DCK folder: " + dck_folder + "\n"
 
-    problems = os.listdir(training_folder)
     # Getting root path
     pathname = os.path.dirname(sys.argv[0])
     currentpath = os.path.abspath(pathname)
     rootpath = os.path.abspath(os.path.join(currentpath,".."))
+    sys.path.insert(0, rootpath + "/models")
+    sys.path.insert(0, rootpath + "/createModel")
+    import dataset
+    import joinFile
+    import selection
+
+    # The features of every problem are recorded in the features index under
+    # the names invokeplanner.py gives to the domain and problem, so that the
+    # training sets join them with the results by key
+    domain_name = domain_file[domain_file.rfind("/") + 1: domain_file.rfind(".")]
+    features_index = rootpath + "/" + dataset.FEATURES_INDEX
+    if (os.path.isfile(features_index)):
+        os.remove(features_index)
     ##Features
-    for problem in problems:	
-        print "Extract Features with original problem and domain"
-        ##print  rootpath + "/features/translate/translate.py"
-        command = "python2.7 " + rootpath + "/features/translate/translate.py " + domain_file + " " + training_folder + "/"+ problem
-	print "Run command: " + str(command)
-	os.system(command)
-	command =  rootpath + "/features/preprocess/preprocess < output.sas"
-	print "Run command: " + str(command)
-	os.system(command)
-	command = rootpath + "/features/ff-learner/roller3.0 -o " + domain_file + " -f " +  training_folder + "/"+ problem + " -S 28 > init-features.txt"
-	print "Run command: " + str(command)
-	os.system(command)
-	command = rootpath + "/features/heuristics/training.sh "  + domain_file + " "  +  training_folder + "/"+  problem
-	print "Run command: " + str(command)
-	os.system(command)
-	actual_rootpath = rootpath + "/models"
-	root_files = rootpath[:rootpath.rfind("/")]
-	root_files = root_files[:root_files.rfind("/")+1]
-	command = "python2.7 "+ actual_rootpath + "/joinFile.py " + root_files
-	print "Run command: " + str(command)
-	os.system(command)
-    command = "java -cp "+ rootpath +"/models/weka.jar -Xmx2048M weka.filters.unsupervised.attribute.Remove -R 1,4,6,8-12,14-15,17-20,22,24-25,27-32,34-35,37,39-42,45-48,51-53,56-57,60-69,71-76,78-79,81,88-89,101-104 -i global_features.arff -o global_features_simply_clasification.arff"
-    print "Run command: " + str(command)
-    os.system(command)
-    command = "java -cp "+ rootpath +"/models/weka.jar -Xmx2048M weka.filters.unsupervised.attribute.Remove -R 1-3,6,8,10-14,16-17,19-22,24,26-27,29-34,36-37,39,41-44,47-52,55-59,62-71,73-79,82-83,85,92-93,101-103,105 -i global_features.arff -o global_features_simply_regression.arff"
-    print "Run command: " + str(command)
-    os.system(command)
-    #Create Models
-    command = "java -Xmx1024M -cp "+ rootpath +"/Models/weka.jar weka.classifiers.rules.DecisionTable -t "+  rootpath +"/global_features_simply_regression.arff  -no-cv -d rules.DecisionTable.time.model"
-    print "Run command: " + str(command)
-    os.system(command)
-    command = "java -Xmx1024M -cp "+ rootpath +"/Models/weka.jar weka.classifiers.trees.RandomForest -t "+  rootpath +"/global_features_simply_clasification.arff  -no-cv -d trees.RandomForest.model"
-    
-    print "Run command: " + str(command)
-    os.system(command)
-    command = "mv *.model " + dck_folder
-    print "Run command: " + str(command)
-    os.system(command)
-    command = "mv *.arff " + dck_folder
-    print "Run command: " + str(command)
-    os.system(command)
+    # A resident translator serves every training problem, so that each of
+    # them does not pay the interpreter startup and the translator imports
+    start_translator_server(rootpath)
+    # The problems are extracted by a pool of processes, each one in its own
+    # scratch directory. Their features are merged in the order of the
+    # problem ids, whatever the order in which they finish. Every problem runs
+    # several extractors at once, so that there is a process for every
+    # EXTRACTORS cores by default
+    jobs = [(rootpath, domain_file, training_folder + "/" + problem, problem_id,
+             os.path.join(os.getcwd(), "features-problem-" + problem_id))
+            for problem, problem_id in dataset.problem_ids(training_folder)]
+    njobs = int(os.environ.get(JOBS_ENV, max(1, multiprocessing.cpu_count() // EXTRACTORS)))
+    print "Extracting the features of %d problems with %d processes\n" % (len(jobs), njobs)
+    pool = multiprocessing.Pool(njobs)
+    extracted = {}
+    imputed = {}
+    started = time.time()
+    for problem_id, features, groups in pool.imap_unordered(extract_features, jobs):
+        extracted[problem_id] = features
+        for group in groups:
+            imputed[group] = imputed.get(group, 0) + 1
+        elapsed = time.time() - started
+        eta = elapsed / len(extracted) * (len(jobs) - len(extracted))
+        print "Features: %d/%d problems in %.2f seconds, ETA %.2f seconds" % (len(extracted), len(jobs), elapsed, eta)
+        sys.stdout.flush()
+    pool.close()
+    pool.join()
+    stop_translator_server()
+    print "Imputed feature groups: %s" % (", ".join("%s in %d/%d problems" % (group, imputed[group], len(jobs))
+                                                     for group in sorted(imputed)) or "none")
+    for job in jobs:
+        problem_id = job[3]
+        joinFile.writeFile(os.getcwd() + "/global_features.arff", extracted[problem_id], joinFile.Head([]))
+        dataset.append_features(features_index, domain_name, problem_id, extracted[problem_id])
 
 
     # Launching each candidate planner with every training problem
@@ -129,26 +234,17 @@ if __name__ == '__main__':
     os.system(command)
 
 
-    # Generating IPC report
-    print "\nGenerating report\n"
+    # Building the training sets: the outcome of every run is joined with the
+    # features of its problem
+    print "\nBuilding training sets\n"
     os.chdir(rootpath)
-
-    if (os.path.isfile("./report.txt")):
-        print "\nThe report file already exists, so we remove it\n"
-        command = "rm ./report.txt"
-        os.system(command)
-
-    command = "python2.7 ./report/report.py --directory ./invoke-planner/results/ --level problem -v values oktimesols > ./report.txt"
-    os.system(command)
-    # Generating data for scip
-    print "Creating file Results"
-    ./output.py <IPC_results> file_output>"
-    command = "python2.7 ./getResultsIPC/output.py report.txt outputArff"
-    os.system(command)
+    rows = dataset.build(rootpath + "/invoke-planner/results", features_index,
+                         rootpath + "/global_features_simply_clasification.arff",
+                         rootpath + "/global_features_simply_regression.arff")
+    print str(rows) + " training instances\n"
     
-    # Parsing the scip output and Generating dck file
+    # Generating dck file
     print "\nGenerating dck file...\n"
-    domain_name = domain_file[domain_file.rfind("/") + 1: domain_file.rfind(".")]
 
     if(os.path.isdir(dck_folder)):
         if(os.path.isdir(dck_folder + "/" + domain_name)):
@@ -166,8 +262,19 @@ if __name__ == '__main__':
         command = "mkdir " + dck_folder + "/" + domain_name
         os.system(command)
 
+    # Creating the models: every candidate learner is cross-validated over the
+    # training problems and the best ones are trained on all of them
+    print "\nSelecting models...\n"
+    classifier, regressor = selection.select(rootpath + "/invoke-planner/results", features_index,
+                                             rootpath + "/models/weka.jar", dck_folder,
+                                             jobs=int(os.environ.get(JOBS_ENV, multiprocessing.cpu_count())),
+                                             cache=rootpath)
+    print "Classifier: " + classifier[0] + " " + " ".join(classifier[2])
+    print "Regression model: " + regressor[0] + " " + " ".join(regressor[2])
+    command = "mv *.arff " + dck_folder
+    print "Run command: " + str(command)
+    os.system(command)
 
-   
 
 # Local Variables:
 # mode:python2.7
@@ -0,0 +1,149 @@
+#!/usr/bin/python2.7
+# -*- coding: utf-8 -*-
+#
+# schedule.py
+# Description: time slices of the portfolio
+# -----------------------------------------------------------------------------
+
+"""
+time slices of the portfolio
+
+Given the probability that every planner solves the problem (classification
+model) and its expected runtime (regression model), the planners run in
+sequence with the slices that maximize the expected coverage within the
+budget, or the expected IPC quality score if the quality of the plans of every
+planner is given.
+
+The probability that planner i solves the problem within s seconds is taken as
+p_i * (1 - exp (-s / t_i)), where p_i and t_i are its predicted probability and
+runtime. Every one of these is concave in s, so the slices are grown greedily
+by quanta, each time for the planner whose quantum most increases the expected
+score per second. The planners are then sorted by their probability of
+success per second of their slice, which minimizes the expected time to the
+first solution.
+"""
+
+# imports
+# -----------------------------------------------------------------------------
+import math             # exp
+
+# -----------------------------------------------------------------------------
+
+# globals
+# -----------------------------------------------------------------------------
+
+QUANTUM = 5                  # seconds added to a slice at a time
+MIN_SLICE = 10               # no planner runs for less
+MIN_RUNTIME = 10             # predicted runtimes up to 1 second are taken as this
+
+# -----------------------------------------------------------------------------
+
+# funcs
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# success_probability
+#
+# returns the probability that a planner with the given probability of
+# solving the problem and expected runtime solves it within 'seconds'
+# -----------------------------------------------------------------------------
+def success_probability (probability, runtime, seconds):
+    """
+    returns the probability that a planner with the given probability of
+    solving the problem and expected runtime solves it within 'seconds'
+    """
+
+    if seconds <= 0:
+        return 0.0
+    if runtime <= 1:
+        runtime = MIN_RUNTIME
+    return probability * (1 - math.exp (- float (seconds) / runtime))
+
+
+# -----------------------------------------------------------------------------
+# expected_score
+#
+# returns the expected score of running every planner in 'slices' for its
+# slice: the probability that any of them solves the problem, or the expected
+# quality of the best of them if the quality of every planner is given
+# -----------------------------------------------------------------------------
+def expected_score (probabilities, runtimes, slices, quality=None):
+    """
+    returns the expected score of running every planner in 'slices' for its
+    slice: the probability that any of them solves the problem, or the
+    expected quality of the best of them if the quality of every planner is
+    given
+    """
+
+    planners = [planner for planner in slices if slices [planner] > 0]
+    if quality is not None:
+        planners.sort (key=lambda planner: -quality.get (planner, 1.0))
+    score = 0.0
+    unsolved = 1.0
+    for planner in planners:
+        solved = success_probability (probabilities [planner], runtimes [planner], slices [planner])
+        value = quality.get (planner, 1.0) if quality is not None else 1.0
+        # the best planners come first, so this one only counts if they fail
+        score += value * solved * unsolved
+        unsolved *= 1 - solved
+    return score
+
+
+# -----------------------------------------------------------------------------
+# schedule
+#
+# returns the planners to run as a list of (planner, seconds) in the order in
+# which they have to run. 'probabilities' and 'runtimes' map every planner to
+# its predicted probability of solving the problem and runtime. If 'quality'
+# is given, it maps every planner to the expected quality of its plans and the
+# expected IPC score is maximized instead of the coverage. Planners that add
+# nothing are not run, so part of the budget may be left
+# -----------------------------------------------------------------------------
+def schedule (probabilities, runtimes, budget, quality=None, quantum=QUANTUM,
+              min_slice=MIN_SLICE, max_planners=None):
+    """
+    returns the planners to run as a list of (planner, seconds) in the order in
+    which they have to run. Planners that add nothing are not run, so part of
+    the budget may be left
+    """
+
+    # planners without a predicted runtime are expected to need the budget
+    runtimes = dict ((planner, float (runtimes.get (planner, budget)))
+                     for planner in probabilities)
+    slices = dict ((planner, 0) for planner in probabilities)
+    left = int (budget)
+    score = 0.0
+    while left > 0:
+        chosen = len ([planner for planner in slices if slices [planner] > 0])
+        best = None
+        for planner in sorted (slices):
+            # a planner starts with the minimum slice
+            step = quantum if slices [planner] > 0 else min_slice
+            if step > left:
+                step = left
+                if slices [planner] == 0 and step < min_slice:
+                    continue
+            if slices [planner] == 0 and max_planners is not None and chosen >= max_planners:
+                continue
+            slices [planner] += step
+            gain = (expected_score (probabilities, runtimes, slices, quality) - score) / step
+            slices [planner] -= step
+            if gain > 0 and (best is None or gain > best [0]):
+                best = (gain, planner, step)
+        if best is None:
+            break
+        (gain, planner, step) = best
+        slices [planner] += step
+        score = expected_score (probabilities, runtimes, slices, quality)
+        left -= step
+
+    chosen = [planner for planner in slices if slices [planner] > 0]
+    chosen.sort (key=lambda planner: (-success_probability (probabilities [planner], runtimes [planner],
+                                                            slices [planner]) / slices [planner], planner))
+    return [(planner, slices [planner]) for planner in chosen]
+
+
+# Local Variables:
+# mode:python2.7
+# fill-column:80
+# End:
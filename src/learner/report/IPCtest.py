@@ -54,10 +54,18 @@ TABLE, OCTAVE, HTML, EXCEL, WIKI = range (0, NB_FORMATS)
 
 # the following variable stores the number of tests that can be performed with
 # this script
-NBTESTS = 4
+NBTESTS = 5
 
 # the name of the tests is specified below
-MANNWHITNEYU, TTEST, WILCOXON, BINOMIAL = range (0,NBTESTS)
+MANNWHITNEYU, TTEST, WILCOXON, BINOMIAL, BOOTSTRAP = range (0,NBTESTS)
+
+# default parameters of the bootstrap confidence intervals: number of
+# replicates, confidence level, seed of the random generator and number of
+# replicates computed at once by every process
+REPLICATES = 1000
+CONFIDENCE = 0.95
+SEED = 0
+CHUNK = 100
 
 # the names of the tests as they are shown in the final report are described
 # next
@@ -65,14 +73,16 @@ TESTS = {
     MANNWHITNEYU : "Mann-Whitney U",
     TTEST        : "T-Test",
     WILCOXON     : "Wilcoxon signed-rank test",
-    BINOMIAL     : "Binomial test"}
+    BINOMIAL     : "Binomial test",
+    BOOTSTRAP    : "Bootstrap confidence interval"}
 
 # the acronyms used to refer to each particular test are:
 ACRONYMS = {
     MANNWHITNEYU : 'mw',
     TTEST        : 'tt',
     WILCOXON     : 'wx',
-    BINOMIAL     : 'bt'
+    BINOMIAL     : 'bt',
+    BOOTSTRAP    : 'bs'
 }
 
 # finally, the description of the test is the following
@@ -80,12 +90,14 @@ DESCS = {
     MANNWHITNEYU : "Computes the Mann-Whitney rank test on two samples. It assesses whether one of two samples of\n independent observations tends to have larger values than the other. This test corrects for ties and\n by default uses a continuity correction. The reported p-value is for a one-sided hypothesis, to get\n the two-sided p-value multiply the returned p-value by 2.",
     TTEST        : "Calculates the T-test for the means of two independent samples of scores.\n This is a two-sided test for the null hypothesis that two independent samples have identical average\n (expected) values.\n We can use this test, if we observe two independent samples from the same or different population,\n e.g. exam scores of boys and girls or of two ethnic groups. The test measures whether the average\n (expected) value differs significantly across samples. If we observe a large p-value, for example\n larger than 0.05 or 0.1, then we cannot reject the null hypothesis of identical average scores. If\n the p-value is smaller than the threshold, e.g. 1%, 5% or 10%, then we reject the null hypothesis\n of equal averages.",
     WILCOXON     : "Calculate the Wilcoxon signed-rank test.\n The Wilcoxon signed-rank test tests the null hypothesis that two related samples come from the same\n distribution. It is a a non-parametric version of the paired T-test and it is therefore a two-sided\n test. Both distributions shall have the same number of items",
-    BINOMIAL     : "Perform a binomial two-sided sign test. It computes the number n of times that the serie shown in\n the row behaves differently than the serie shown in the column. It returns the probability according\n to a binomial distribution with p=0.5 that the number of times that the serie shown in the row takes\n values larger than the serie shown in the column equals at least the number of times that this\n difference was observed.\n If this probability is less or equal than a given threshold, e.g., 0.01, 0.05 or 0.1, then reject\n the null hypothesis and assume that the serie shown in the column is significantly smaller"}
+    BINOMIAL     : "Perform a binomial two-sided sign test. It computes the number n of times that the serie shown in\n the row behaves differently than the serie shown in the column. It returns the probability according\n to a binomial distribution with p=0.5 that the number of times that the serie shown in the row takes\n values larger than the serie shown in the column equals at least the number of times that this\n difference was observed.\n If this probability is less or equal than a given threshold, e.g., 0.01, 0.05 or 0.1, then reject\n the null hypothesis and assume that the serie shown in the column is significantly smaller",
+    BOOTSTRAP    : "Computes a percentile bootstrap confidence interval of the mean difference between the serie shown\n in the row and the serie shown in the column over the entries where both are compared. The problems\n are resampled with replacement and every cell shows the observed mean difference followed by the\n interval. If the interval does not contain zero, the difference is significant at the chosen\n confidence level."}
 
 
 # imports
 # -----------------------------------------------------------------------------
 import datetime                 # for printing current date and time
+import multiprocessing          # parallel bootstrap
 
 import numpy                    # arbitrary numerical precision
 import scipy                    # scientific analysis in python
@@ -190,17 +202,231 @@ class IPCtest:
  Fatal Error - Unknown test '%i' in IPCtest.test""" % test
             raise IndexError
 
-        # invoke the handler that corresponds to the given index
-        do_handler = "do_%s (self._seriea, self._serieb)" % ACRONYMS [test]
-            
-        # and just return the result of the invocation
+        # and just return the result of the handler that corresponds to the
+        # given index
         try:
-            return eval (do_handler)
+            return HANDLERS [test] (self._seriea, self._serieb)
 
         except Exception, message:
             return (-1, message)
 
 
+# -----------------------------------------------------------------------------
+# IPCmatrix
+#
+#     This class stores an arbitrary number of series in arrays and performs
+#     every statistical test over all pairs of them at once
+# -----------------------------------------------------------------------------
+class IPCmatrix:
+    """
+    This class stores an arbitrary number of series in arrays and performs
+    every statistical test over all pairs of them at once
+    """
+
+    # default constructor
+    def __init__ (self, series, matcher, noentry):
+        """
+        this constructor receives a dictionary of series whose keys are their
+        names and whose values are the lists to analyze. The matcher and
+        noentry are interpreted as in IPCtest
+
+        The series are stored in a matrix with one row per serie. For every pair
+        of series (i, j), self._paired [i,j] selects the entries where both are
+        compared and self._sample [i,j] the entries of the i-th serie that are
+        compared with the j-th one, i.e., the paired ones plus those beyond the
+        end of the j-th serie that are accepted by the matcher
+        """
+
+        if (matcher not in ['or', 'and', 'all']):
+            print """
+ Fatal Error - Unknown matcher '%s'
+""" % matcher
+            raise KeyError
+
+        # the names of the series are kept in the same order used for printing
+        self._names = series.keys ()
+        length = max ([len (series [iserie]) for iserie in self._names] + [0])
+
+        # copy all series into a matrix, padding the shorter ones
+        raw = numpy.empty ((len (self._names), length))
+        raw.fill (NOENTRY)
+        present = numpy.zeros ((len (self._names), length), dtype=bool)
+        for (index, iserie) in enumerate (self._names):
+            raw [index, :len (series [iserie])] = series [iserie]
+            present [index, :len (series [iserie])] = True
+        valid = present & (raw != NOENTRY)
+
+        # substitute all the non-filtered entries with the noentry value
+        self._values = numpy.where (valid, raw, noentry)
+
+        # compute the pairwise associations accepted by the matcher. Entries are
+        # indexed by [row serie, column serie, problem]
+        both = present [:, None, :] & present [None, :, :]
+        if (matcher == 'and'):
+            self._paired = both & valid [:, None, :] & valid [None, :, :]
+            tail = numpy.zeros_like (both)
+        elif (matcher == 'or'):
+            self._paired = both & (valid [:, None, :] | valid [None, :, :])
+            tail = valid [:, None, :] & ~present [None, :, :]
+        else:
+            self._paired = both
+            tail = present [:, None, :] & ~present [None, :, :]
+        self._sample = self._paired | tail
+
+    # methods
+
+    # performs the requested statistical test with all pairs of series and
+    # returns a dictionary of dictionaries with the p-value of every pair. If
+    # the test of a pair fails, the error message is stored instead
+    def test (self, test):
+        """
+        performs the requested statistical test with all pairs of series and
+        returns a dictionary of dictionaries with the p-value of every pair. If
+        the test of a pair fails, the error message is stored instead
+        """
+
+        # check the test is among the known ones
+        if (test not in range (0, NBTESTS)):
+
+            print """
+ Fatal Error - Unknown test '%i' in IPCmatrix.test""" % test
+            raise IndexError
+
+        # the t-test and the binomial test have closed forms that are computed
+        # for all pairs at once
+        if (test == TTEST):
+            return self._todict (self._ttest ())
+
+        elif (test == BINOMIAL):
+            return self._todict (self._binomial ())
+
+        elif (test == BOOTSTRAP):
+            return self.bootstrap ()
+
+        # the p-values of the rank tests are symmetric, so that they are only
+        # computed once per pair
+        result = [[None] * len (self._names) for iserie in self._names]
+        for i in range (0, len (self._names)):
+            for j in range (i+1, len (self._names)):
+                # the Wilcoxon test is paired, so it only takes the paired
+                # entries (the per-pair engine failed with series of unequal
+                # length)
+                if (test == WILCOXON):
+                    (seriea, serieb) = (self._values [i][self._paired [i, j]],
+                                        self._values [j][self._paired [i, j]])
+                else:
+                    (seriea, serieb) = (self._values [i][self._sample [i, j]],
+                                        self._values [j][self._sample [j, i]])
+                try:
+                    result [i][j] = result [j][i] = float (HANDLERS [test] (seriea, serieb) [1])
+                except Exception, message:
+                    result [i][j] = result [j][i] = message
+        return self._todict (result)
+
+    # computes the bootstrap confidence interval of the mean difference between
+    # every pair of series over their paired entries and returns a dictionary
+    # of dictionaries with the tuple (mean difference, lower bound, upper
+    # bound) of every pair. The replicates are split in chunks of CHUNK that
+    # are computed by 'jobs' processes, each one with its own seed derived from
+    # 'seed', so that the result does not depend on the number of processes
+    def bootstrap (self, replicates=REPLICATES, confidence=CONFIDENCE, jobs=1, seed=SEED):
+        """
+        computes the bootstrap confidence interval of the mean difference
+        between every pair of series over their paired entries and returns a
+        dictionary of dictionaries with the tuple (mean difference, lower bound,
+        upper bound) of every pair. The result does not depend on the number of
+        processes
+        """
+
+        # the intervals of (j, i) are those of (i, j) with the opposite sign, so
+        # that only the pairs above the main diagonal are resampled
+        pairs = [(i, j) for i in range (0, len (self._names)) for j in range (i+1, len (self._names))]
+        if (not pairs or not self._values.shape [1]):
+            return self._todict ([[(numpy.nan,) * 3] * len (self._names) for iserie in self._names])
+        mask = numpy.array ([self._paired [i, j] for (i, j) in pairs], dtype=float)
+        diffs = numpy.array ([self._values [i] - self._values [j] for (i, j) in pairs]) * mask
+
+        # compute all replicates, chunk by chunk
+        chunks = [(diffs, mask, min (CHUNK, replicates - start), seed + start // CHUNK)
+                  for start in range (0, replicates, CHUNK)]
+        if (jobs > 1 and len (chunks) > 1):
+            pool = multiprocessing.Pool (min (jobs, len (chunks)))
+            try:
+                means = pool.map (do_replicates, chunks)
+            finally:
+                pool.terminate ()
+        else:
+            means = map (do_replicates, chunks)
+        means = numpy.sort (numpy.hstack (means), axis=1)
+
+        # and take the percentiles of every pair, ignoring the replicates where
+        # it has no entries at all
+        result = [[None] * len (self._names) for iserie in self._names]
+        with numpy.errstate (invalid='ignore', divide='ignore'):
+            observed = diffs.sum (axis=1) / mask.sum (axis=1)
+        for (index, (i, j)) in enumerate (pairs):
+            sample = means [index][~numpy.isnan (means [index])]
+            if (len (sample)):
+                lower = sample [int (numpy.floor ((1. - confidence) / 2. * (len (sample) - 1)))]
+                upper = sample [int (numpy.ceil ((1. + confidence) / 2. * (len (sample) - 1)))]
+            else:
+                (lower, upper) = (numpy.nan, numpy.nan)
+            result [i][j] = (float (observed [index]), float (lower), float (upper))
+            result [j][i] = (- float (observed [index]), - float (upper), - float (lower))
+        return self._todict (result)
+
+    # computes the p-values of the T-test of all pairs of series at once
+    def _ttest (self):
+        """
+        computes the p-values of the T-test of all pairs of series at once
+        """
+
+        # size, mean and sum of squared deviations of the sample of every serie
+        # when compared with every other one
+        values = self._values [:, None, :]
+        count = self._sample.sum (axis=2)
+        with numpy.errstate (invalid='ignore', divide='ignore'):
+            mean = (self._sample * values).sum (axis=2) / count
+            squares = (self._sample * (values - mean [:, :, None]) ** 2).sum (axis=2)
+
+            # the statistics of the column serie are those of the transposed
+            # pair. The variance is pooled, as in scipy.stats.ttest_ind
+            df = count + count.T - 2
+            variance = (squares + squares.T) / df
+            t = (mean - mean.T) / numpy.sqrt (variance * (1. / count + 1. / count.T))
+            return scipy.stats.t.sf (numpy.abs (t), df) * 2
+
+    # computes the p-values of the binomial test of all pairs of series at once
+    def _binomial (self):
+        """
+        computes the p-values of the binomial test of all pairs of series at
+        once
+        """
+
+        # number of paired entries where the row serie differs from the column
+        # serie and where it is larger. Unlike the former per-pair engine, the
+        # entries beyond the end of the shorter serie are not counted: they
+        # were compared with None, and thus taken as differences won by the
+        # longer serie
+        (rows, columns) = (self._values [:, None, :], self._values [None, :, :])
+        n = (self._paired & (rows != columns)).sum (axis=2)
+        k = (self._paired & (rows > columns)).sum (axis=2)
+        return 1. - scipy.stats.binom.cdf (k-1, n, .5)
+
+    # returns the given matrix as a dictionary of dictionaries indexed by the
+    # names of the series, leaving out the main diagonal
+    def _todict (self, matrix):
+        """
+        returns the given matrix as a dictionary of dictionaries indexed by the
+        names of the series, leaving out the main diagonal
+        """
+
+        return dict ((iserie, dict ((jserie, matrix [i][j] if (isinstance (matrix [i][j], (tuple, Exception)))
+                                     else float (matrix [i][j]))
+                                    for (j, jserie) in enumerate (self._names) if (i != j)))
+                     for (i, iserie) in enumerate (self._names))
+
+
 # -----------------------------------------------------------------------------
 # IPCtests
 #
@@ -251,6 +477,10 @@ class IPCtests:
         # make this an unnamed report
         self._name = 'unnamed'
 
+        # and use the default parameters of the bootstrap
+        (self._replicates, self._confidence, self._jobs, self._seed) = \
+         (REPLICATES, CONFIDENCE, 1, SEED)
+
     # operator overloading
 
     # printing service
@@ -305,6 +535,17 @@ class IPCtests:
         self._name = name
 
 
+    # sets the parameters of the bootstrap confidence intervals
+    def set_bootstrap (self, replicates, confidence, jobs, seed):
+        """
+        sets the number of replicates, the confidence level, the number of
+        processes and the seed of the bootstrap confidence intervals
+        """
+
+        (self._replicates, self._confidence, self._jobs, self._seed) = \
+         (replicates, confidence, jobs, seed)
+
+
     # the following method goes through all the statistical tests and series and
     # performs them
     def tests (self):
@@ -313,38 +554,25 @@ class IPCtests:
         and performs them
         """
 
+        # store all the series in arrays, so that every test is performed over
+        # all pairs of series at once
+        matrix = IPCmatrix (self._series, self._matcher, self._noentry)
+
         # Perform all the statistical tests
         for itest in self._tests:
 
             # check these series are suitable for the selected analysis. Only if
             # they look properly arranged, the test is performed. This
             # particular action is performed using handlers
-            check_handler = "check_%s (self._series)" % ACRONYMS [itest]
-            if (eval (check_handler)):
-
-                # if this test is not already in _p store it
-                if (itest not in self._p):
-                    self._p [itest] = {}
-
-                # for every particular serie in the private dictionary of series
-                for iserie in self._series:
+            if (CHECKERS [itest] (self._series)):
 
-                    # if iserie not in _p add this key
-                    if (iserie not in self._p [itest]):
-                        self._p [itest][iserie] = {}
-
-                    for jserie in self._series:
-
-                        # just only in case they are different
-                        if (iserie != jserie):
-
-                            # create an IPCtest with these two series
-                            test = IPCtest (self._matcher, self._noentry, 
-                                            self._series [iserie], self._series [jserie])
-
-                            # perform the statistical test and store the resulting
-                            # p-value according to the selection made in this instance
-                            self._p [itest][iserie][jserie] = test.test (itest) [1]
+                # store the p-value of every pair of series (or the confidence
+                # interval of their difference)
+                if (itest == BOOTSTRAP):
+                    self._p [itest] = matrix.bootstrap (self._replicates, self._confidence,
+                                                        self._jobs, self._seed)
+                else:
+                    self._p [itest] = matrix.test (itest)
 
             # otherwise, ...
             else:
@@ -354,6 +582,18 @@ class IPCtests:
 
     # printing services
 
+    # returns the value to show for the given test and pair of series. The
+    # confidence intervals are shown as 'mean [lower, upper]'
+    def _cell (self, itest, iserie, jserie):
+        """
+        returns the value to show for the given test and pair of series
+        """
+
+        value = self._p [itest][iserie][jserie]
+        if (isinstance (value, tuple)):
+            return "%.4f [%.4f, %.4f]" % value
+        return value
+
     # print the contents of this class as a pretty table
     def print_table (self):
         """
@@ -393,7 +633,7 @@ class IPCtests:
                     if (iserie != jserie):
 
                         # add the p-value of this particular combination
-                        thisrow.append (self._p [itest][iserie][jserie])
+                        thisrow.append (self._cell (itest, iserie, jserie))
 
                     # otherwise, add a dash
                     else:
@@ -446,16 +686,21 @@ class IPCtests:
                                                             datetime.datetime.now ().strftime ("%c"))
             sout += "# name: %s\n" % self._name
             sout += "# type: matrix\n"
+            # the confidence intervals take three columns: mean difference,
+            # lower and upper bound
+            width = {False: 1, True: 3}[itest == BOOTSTRAP]
             sout += "# rows: %i\n" % len (self._series)
-            sout += "# columns: %i\n" % len (self._series)
+            sout += "# columns: %i\n" % (width * len (self._series))
 
             # create the lines with the requested data
             for iserie in self._series:
                 for jserie in self._series:
-                    if (iserie != jserie):
+                    if (iserie != jserie and width > 1):
+                        sout += "%s %s %s " % self._p [itest][iserie][jserie]
+                    elif (iserie != jserie):
                         sout += "%s " % self._p [itest][iserie][jserie]
                     else:
-                        sout += "0.0 "
+                        sout += "0.0 " * width
                 sout += '\n'
 
             # compute the footer
@@ -520,7 +765,7 @@ class IPCtests:
                 ws.write (row, 1, iserie, hstyle)
                 for jserie in self._series:
                     if (iserie != jserie):
-                        ws.write (row, col, self._p [itest][iserie][jserie], dstyle)
+                        ws.write (row, col, self._cell (itest, iserie, jserie), dstyle)
                     else:
                         ws.write (row, col, '---', dstyle)
                     col +=1
@@ -580,7 +825,7 @@ class IPCtests:
                 sout += "\n|| '''%s''' ||" % iserie
                 for jserie in self._series:
                     if (iserie != jserie):
-                        sout += "  %s ||" % self._p [itest][iserie][jserie]
+                        sout += "  %s ||" % self._cell (itest, iserie, jserie)
                     else:
                         sout += "  --- ||"
 
@@ -665,6 +910,42 @@ def do_bt (seriea, serieb):
     return (0., 1. - binomial.cdf (k-1))
 
 
+# Bootstrap confidence interval of the mean difference
+def do_bs (seriea, serieb):
+    """
+    Bootstrap confidence interval of the mean difference of both series. It
+    returns the mean difference and the tuple (mean difference, lower bound,
+    upper bound) computed with the default parameters
+    """
+
+    interval = IPCmatrix ({'a': seriea [:len (serieb)], 'b': serieb [:len (seriea)]}, 'all', NOENTRY).bootstrap () ['a']['b']
+    return (interval [0], interval)
+
+
+# computes a chunk of bootstrap replicates of the mean differences. It receives
+# a tuple (differences, mask, replicates, seed) where 'differences' has a row
+# per pair of series with their differences in the paired entries (and zero
+# elsewhere) and 'mask' flags those entries. It returns the mean difference of
+# every pair (row) in every replicate (column). It is a function of the module
+# so that it can be pickled by multiprocessing
+def do_replicates (args):
+    """
+    computes a chunk of bootstrap replicates of the mean differences. It
+    returns the mean difference of every pair (row) in every replicate (column)
+    """
+
+    (differences, mask, replicates, seed) = args
+
+    # every replicate resamples the problems with replacement, which amounts to
+    # weighting each one with the number of times it is drawn
+    generator = numpy.random.RandomState (seed)
+    weights = generator.multinomial (differences.shape [1],
+                                     [1. / differences.shape [1]] * differences.shape [1],
+                                     size=replicates).T
+    with numpy.errstate (invalid='ignore', divide='ignore'):
+        return numpy.dot (differences, weights) / numpy.dot (mask, weights)
+
+
 # Checkers
 #
 # the following handlers shall return true if the data passed is *expected* to
@@ -719,6 +1000,35 @@ def check_bt (series):
 
     return True
 
+    
+# returns True if the series are *expected* to be correct for the bootstrap
+# confidence intervals
+def check_bs (series):
+    """
+    returns True if the series are *expected* to be correct for the bootstrap
+    confidence intervals
+    """
+
+    return True
+
+
+# the handlers of every test
+HANDLERS = {
+    MANNWHITNEYU : do_mw,
+    TTEST        : do_tt,
+    WILCOXON     : do_wx,
+    BINOMIAL     : do_bt,
+    BOOTSTRAP    : do_bs
+}
+
+CHECKERS = {
+    MANNWHITNEYU : check_mw,
+    TTEST        : check_tt,
+    WILCOXON     : check_wx,
+    BINOMIAL     : check_bt,
+    BOOTSTRAP    : check_bs
+}
+
 
 
 # Local Variables:
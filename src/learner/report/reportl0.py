@@ -54,6 +54,11 @@ import sys              # argv, exit
 
 import IPCrun           # for storing info about different runs
 
+# the log files are read with the services of invoke-planner, which wrote them
+sys.path.append (os.path.join (os.path.dirname (os.path.abspath (__file__)), '../invoke-planner'))
+
+import IPClog           # for reading the samples of the log files
+
 # -----------------------------------------------------------------------------
 
 # globals
@@ -72,7 +77,7 @@ NUMSOLSREGEXP    = '^ Number of solutions found: (?P<numsols>[0-9]+)'
 
 TIMELABELREGEXP  = '^ \\[real-time [0-9]+\\] total_time: (?P<timelabel>[0-9\.]+)'
 MEMLABELREGEXP   = '^ \\[real-time [0-9]+\\] total_vsize: (?P<memlabel>[0-9\.]+)'
-TIMESOLREGEXP    = '^ Time/solution.*:.*\\[(?P<timesollabel>[0-9, ]+)\\]'
+TIMESOLREGEXP    = '^ Time/solution.*:.*\\[(?P<timesollabel>[0-9., ]+)\\]'
 
 #VALLOGREGEXP = '_(?P<track>[a-z]+)-(?P<subtrack>[a-z]+)\.(?P<planner>([a-zA-Z0-9-_]+|[a-zA-Z0-9-_]+\.[a-zA-Z0-9]+))-(?P<domain>[a-zA-Z-]+).(?P<problem>[0-9]+)-val'
 VALLOGREGEXP = '_(?P<planner>([a-zA-Z0-9-_]+|[a-zA-Z0-9-_]+\.[a-zA-Z0-9]+))-(?P<domain>[a-zA-Z-]+).(?P<problem>[0-9]+)-val'
@@ -200,10 +205,11 @@ def parselogdepth0 (directory, logfile, warning=False):
     particular regexp
     """
 
-    # get the contents of the logfile (which is known to exist)
+    # get the contents of the logfile (which is known to exist), with the
+    # samples of time and memory as they were written in it before they were
+    # written separately
     logpathfile = directory + '/' + logfile
-    logstream = open (logpathfile, 'r')
-    lines = logstream.readlines ()
+    lines = IPClog.readlines (logpathfile)
 
     # get the time bound, memory bound, overall runtime, overall memory and
     # maximum memory ---all these values are mandatory and shall appear always!
@@ -220,12 +226,13 @@ def parselogdepth0 (directory, logfile, warning=False):
         exit ()
 
     # now, in case any solution has been found, report the number of solutions
-    # found and the time ticks when they were found
+    # found and the time ticks when they were found. Older logs give them in
+    # whole seconds, newer ones with millisecond resolution
     try:
         numsols    = 0
         timesols   = list ()
         numsols    = int   (parsefield0 (NUMSOLSREGEXP,'numsols', lines, logpathfile, warning)[0])
-        timesols   = [int (reading)
+        timesols   = [float (reading)
                       for reading in [filter (lambda x:x!=',', ith)
                                       for ith in \
                                       parsefield0 (TIMESOLREGEXP, 'timesollabel', lines, logpathfile, warning)[0].split ()]]
@@ -245,9 +252,6 @@ def parselogdepth0 (directory, logfile, warning=False):
         print " Fatal exception raised while parsing the memory usage profile"
         exit ()
         
-    # close and exit
-    logstream.close ()
-
     # and return the values read so far
     return (timeout, memory, runtime, memend, memmax, numsols, timesols, timelabels, memlabels)
 
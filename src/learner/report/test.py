@@ -80,7 +80,7 @@ def create_parser ():
     """
 
     # create the parser
-    parser = argparse.ArgumentParser (description="performs statistical tests on two series of data")
+    parser = argparse.ArgumentParser (description="performs statistical tests on all pairs of series of data")
     
     # now, add the arguments
     
@@ -89,7 +89,7 @@ def create_parser ():
     mandatory.add_argument ('-t', '--test',
                             nargs = '*',
                             default = ['mw'],
-                            choices=['mw','tt','wx','bt'],
+                            choices=['mw','tt','wx','bt','bs'],
                             help='sets up the type of statistical analysis to be performed. Use the directive --tests to see an explanation of all kinds of tests. It is possible to define as many as desired. Mann-Whitney U is used by default')
     
     # Group of alternative arguments
@@ -159,6 +159,29 @@ def create_parser ():
                              choices=['table','octave','html','excel','wiki'],
                              help='sets the report style')
     
+    # Group of bootstrap arguments
+    bootstrap = parser.add_argument_group ("Bootstrap", "The following arguments set up the bootstrap confidence intervals computed with --test bs")
+    bootstrap.add_argument ('-b', '--replicates',
+                            metavar='INTEGER',
+                            type=int,
+                            default=IPCtest.REPLICATES,
+                            help='number of bootstrap replicates. By default, %(default)s')
+    bootstrap.add_argument ('-c', '--confidence',
+                            metavar='FLOAT',
+                            type=float,
+                            default=IPCtest.CONFIDENCE,
+                            help='confidence level of the intervals. By default, %(default)s')
+    bootstrap.add_argument ('-j', '--jobs',
+                            metavar='INTEGER',
+                            type=int,
+                            default=1,
+                            help='number of processes that compute the replicates. The intervals do not depend on it. By default, %(default)s')
+    bootstrap.add_argument ('-r', '--seed',
+                            metavar='INTEGER',
+                            type=int,
+                            default=IPCtest.SEED,
+                            help='seed of the random generator. By default, %(default)s')
+
     # Group of miscellaneous arguments
     misc = parser.add_argument_group ('Miscellaneous')
     misc.add_argument ('-x','--variables',
@@ -355,7 +378,7 @@ class dispatcher (object):
     def __init__ (self, test, directory, summary, name, level,
                   planner, domain, problem, variable, 
                   vfilter, matcher, noentry, unroll, sorting,
-                  style, wxProgressDialog=None):
+                  style, wxProgressDialog=None, bootstrap=None):
         """
         Default constructor
         """
@@ -370,6 +393,9 @@ class dispatcher (object):
           vfilter, matcher, noentry, unroll, sorting, 
           style, wxProgressDialog)
 
+        # the parameters of the bootstrap: (replicates, confidence, jobs, seed)
+        self._bootstrap = bootstrap
+
         # Initialize the information returned by the reporter
         self._run = None
 
@@ -422,6 +448,8 @@ class dispatcher (object):
         tests = IPCtest.IPCtests (self._series, self._test, self._matcher, self._noentry)
         tests.set_format (eval ("IPCtest.%s" % self._style.upper ()))
         tests.set_name (self._name)
+        if (self._bootstrap):
+            tests.set_bootstrap (*self._bootstrap)
         tests.tests ()
         print tests
 
@@ -457,7 +485,8 @@ if __name__ == '__main__':
     ARGS.test = map (lambda x:{'mw': IPCtest.MANNWHITNEYU, 
                                'tt': IPCtest.TTEST, 
                                'wx': IPCtest.WILCOXON, 
-                               'bt': IPCtest.BINOMIAL}[x],
+                               'bt': IPCtest.BINOMIAL,
+                               'bs': IPCtest.BOOTSTRAP}[x],
                      ARGS.test)
 
     # besides, translate the sorting values (in case they are provided) to the
@@ -478,7 +507,8 @@ if __name__ == '__main__':
     TESTER = dispatcher (ARGS.test, None, ARGS.summary, ARGS.name, LEVEL,
                          ARGS.planner, ARGS.domain, ARGS.problem, ARGS.variable, 
                          ARGS.filter, ARGS.matcher, ARGS.noentry, ARGS.unroll, 
-                         ARGS.sorting, ARGS.style)
+                         ARGS.sorting, ARGS.style,
+                         bootstrap=(ARGS.replicates, ARGS.confidence, ARGS.jobs, ARGS.seed))
     with TESTER:
         
         # and request the extraction of data and the realization of the statistical test
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import scipy.stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import IPCtest
+
+# The series have unequal length, so the matchers 'or' and 'all' accept the
+# entries of the longer serie beyond the end of the shorter one. The paired
+# tests (binomial and Wilcoxon) only take the paired entries.
+LONGER = [3, 5, 7, 9, 2, 6, 8, 1]
+SHORTER = [1, 5, 8, 2, 5]
+
+
+def test_binomial_ignores_unpaired_entries():
+    for matcher in ["or", "all"]:
+        result = IPCtest.IPCmatrix({"a": LONGER, "b": SHORTER}, matcher,
+                                   IPCtest.NOENTRY).test(IPCtest.BINOMIAL)
+        # a is larger in entries 0 and 3 and smaller in 2 and 4, out of four
+        # differences. The former engine counted the last three entries of a
+        # as three more differences won by it.
+        expected = 1. - scipy.stats.binom.cdf(1, 4, .5)
+        assert abs(result["a"]["b"] - expected) < 1e-12, matcher
+        assert abs(result["b"]["a"] - expected) < 1e-12, matcher
+
+
+def test_wilcoxon_takes_paired_entries():
+    expected = scipy.stats.wilcoxon(LONGER[:len(SHORTER)], SHORTER)[1]
+    for matcher in ["or", "all"]:
+        result = IPCtest.IPCmatrix({"a": LONGER, "b": SHORTER}, matcher,
+                                   IPCtest.NOENTRY).test(IPCtest.WILCOXON)
+        # the former engine failed with series of unequal length
+        assert isinstance(result["a"]["b"], float), matcher
+        assert abs(result["a"]["b"] - expected) < 1e-12, matcher
+        assert result["b"]["a"] == result["a"]["b"], matcher
@@ -3,13 +3,25 @@
 __author__      = "Isabel Cenamor"
 __copyright__   = "Copyright 2013, Portfolio Project Features"
 __email__ = "icenamor@inf.uc3m.es"
+
+# phases of the translator whose wall-clock time (seconds) and change of
+# resident memory (KB) can be added to the features (see joinFile.py), with
+# the stem of their attributes
+PROFILE_PHASES = [("Parsing", "parsing"),
+                  ("Normalizing task", "normalizing"),
+                  ("Instantiating", "instantiating"),
+                  ("Computing fact groups", "fact_groups"),
+                  ("Translating task", "translating_task"),
+                  ("Writing output", "writing_output")]
+
 # -----------------------------------------------------------------------------
 ## Class store the weka head
 # -----------------------------------------------------------------------------
 class Head:
-    def __init__(self, list_head):	
-        "store the Weka head"
+    def __init__(self, list_head, profile=False):	
+        "store the Weka head, with the attributes of the translator profile if profile is True"
         self.head = list_head
+        self.profile = profile
         self.set_values()
     def set_values(self):
         self.head.append("@relation problem\n\n")
@@ -112,6 +124,10 @@ class Head:
         self.head.append("@attribute Landmark_count numeric\n")
         self.head.append("@attribute Landmark-cut numeric\n")
         self.head.append("@attribute Max numeric\n")
+        if self.profile:
+            for (phase, stem) in PROFILE_PHASES:
+                self.head.append("@attribute translate_" + stem + "_time numeric\n")
+                self.head.append("@attribute translate_" + stem + "_memory numeric\n")
         self.head.append("@attribute planner {arvand,dae_yahsp,fd-autotune-1,fd-autotune-2,fdss-1,fdss-2,lama-2008,lama-2011,lamar,lpg,madagascar,probe,randward,sgplan,yahsp2-mt}\n")
         self.head.append("@attribute class {True,False}\n\n")
         self.head.append("@data\n\n")
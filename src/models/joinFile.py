@@ -7,12 +7,14 @@ __email__ = "icenamor@inf.uc3m.es"
 import sys
 import string
 import os
-from head import Head
+import json
+from head import Head, PROFILE_PHASES
 
 ##translateFile --> translate
 ##features.arff --> preprocess
 ##initfeature-info.txt --> ff-learner
 ##tmp_results --> heuristics
+##translateProfile --> translate (only with profile, see read_profile)
 def readFile(name, datos):
 	print name
 	
@@ -96,21 +98,40 @@ def join(translate, preprocess, fflearner, heuristics, union):
 		entry_translate = "?,?,?,?,?,?,?,?,?"
 		union = union + entry_translate
 	return union
-# main
 # -----------------------------------------------------------------------------
-if __name__ == '__main__':
+# read_profile
+#
+# returns the wall-clock time and change of resident memory of every phase in
+# PROFILE_PHASES, as written by the translator to translateProfile in the
+# directory route. Missing phases are imputed with '?'
+# -----------------------------------------------------------------------------
+def read_profile(route):
+    values = []
+    try:
+	    phases = json.load(open(route + "/translateProfile"))["phases"]
+    except (IOError, ValueError, KeyError):
+	    print "No file in translate profile"
+	    phases = []
+    measured = dict((phase["phase"], phase) for phase in phases if phase["depth"] == 0)
+    for (name, stem) in PROFILE_PHASES:
+	    phase = measured.get(name, {})
+	    for key in ("wall", "rss_delta"):
+		    values.append(str(phase[key]) if phase.get(key) is not None else "?")
+    return ",".join(values)
 
+# -----------------------------------------------------------------------------
+# read_features
+#
+# joins the features written by the extractors into the directory route in a
+# single line. Missing files are imputed with '?'. If profile is True, the
+# time and memory of the phases of the translator are added at the end
+# -----------------------------------------------------------------------------
+def read_features(route, profile=False):
     translate = []
     preprocess =[]
     fflearner = []
     heuristics =[]
     union_final = ""
-    route = ""
-    if (len(sys.argv) == 2):
-        route = sys.argv[1]
-    else:
-        print "ERROR:::: Need one argument to create the features file" 
-        sys.exit(-1)
     try:
 	    print route + "/translateFile"
 	    translate = readFile(route+"/translateFile", translate) ## translateFile
@@ -138,6 +159,31 @@ if __name__ == '__main__':
     except:
 	    print "General error"
 	    union_final = "?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?"
-    head = Head([])
+    if profile:
+	    union_final = union_final + "," + read_profile(route)
+    return union_final
+
+# -----------------------------------------------------------------------------
+# join_file
+#
+# writes global_features.arff into the directory route and returns the
+# features line, so that the launcher can pass it to the next stages
+# -----------------------------------------------------------------------------
+def join_file(route, profile=False):
+    union_final = read_features(route, profile)
+    head = Head([], profile)
     writeFile(route+"/global_features.arff", union_final, head)
+    return union_final
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
 
+    if (len(sys.argv) == 2):
+        route = sys.argv[1]
+    elif (len(sys.argv) == 3 and sys.argv[2] == "--profile"):
+        route = sys.argv[1]
+    else:
+        print "ERROR:::: Need one argument to create the features file (and optionally --profile)" 
+        sys.exit(-1)
+    join_file(route, len(sys.argv) == 3)
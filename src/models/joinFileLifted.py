@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import string
+import os
+from head import Head
+from joinFileRegression import writeEntries
+
+##liftedFile --> lifted features (features/translate/lifted.py), the first
+##columns of translateFile
+
+# numeric lifted features (requirements ... use_min_cost_metric) among the
+# first columns of the features, after the names of the domain and task
+LIFTED = slice(2, 12)
+
+# index (from 1) of the planner attribute, as given to weka with -p
+PLANNER_ATTRIBUTE = LIFTED.stop - LIFTED.start + 1
+
+PLANNERS = ["arvand", "fd-autotune-1", "fd-autotune-2", "fdss-1", "fdss-2", "lama-2008",
+            "lama-2011", "madagascar", "lpg", "probe", "randward", "yahsp2-mt", "dae_yahsp",
+            "lamar", "sgplan"]
+
+# -----------------------------------------------------------------------------
+# lifted_head
+#
+# returns the Weka head of the lifted features followed by the planner and the
+# class (kind "classification") or time (kind "regression"), as the learner
+# selects them from the full features (see createModel/dataset.py)
+# -----------------------------------------------------------------------------
+def lifted_head(kind):
+    attributes = [i for i in Head([]).head if i.startswith("@attribute")]
+    planner = [i for i in attributes if i.startswith("@attribute planner ")]
+    head = ["@relation problem\n\n"] + attributes[LIFTED] + planner
+    if kind == "classification":
+        head.append("@attribute class {True,False}\n\n")
+    else:
+        head.append("@attribute time numeric\n\n")
+    head.append("@data\n\n")
+    return head
+
+class LiftedHead:
+    def __init__(self, kind):
+        "store the Weka head of the lifted features"
+        self.head = lifted_head(kind)
+
+# -----------------------------------------------------------------------------
+# join_file_lifted
+#
+# writes global_features_lifted.arff and global_features_lifted_regression.arff
+# into the directory route with one entry per planner. union_final is the line
+# of lifted features (or all the features, of which the lifted ones are the
+# first)
+# -----------------------------------------------------------------------------
+def join_file_lifted(route, union_final, planners=PLANNERS):
+    values = ",".join(union_final.strip().split(",")[LIFTED])
+    writeEntries(route+"/global_features_lifted.arff", values, LiftedHead("classification"), planners)
+    writeEntries(route+"/global_features_lifted_regression.arff", values, LiftedHead("regression"), planners)
+    return values
+
+# main
+# -----------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    if (len(sys.argv) == 2):
+        route = sys.argv[1]
+    else:
+        print "ERROR:::: Need one argument to create the features file"
+        sys.exit(-1)
+    join_file_lifted(route, open(route+"/liftedFile").read())
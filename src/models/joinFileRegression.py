@@ -8,6 +8,7 @@ import sys
 import string
 import os
 from headRegression import headRegression
+from joinFile import read_features
 
 ##translateFile --> translate
 ##features.arff --> preprocess
@@ -24,6 +25,12 @@ def readFile(name, datos):
 	return datos
 
 def writeFile(name, data, head, planners):
+	fs =  open(planners, 'r')
+	num_planners = [i[:-1] for i in fs.readlines()]
+	fs.close()
+	writeEntries(name, data, head, num_planners)
+
+def writeEntries(name, data, head, planners):
 	fd = open(name,'w')
 	##lines = fd.readlines()
 	for i in head.head:
@@ -31,11 +38,8 @@ def writeFile(name, data, head, planners):
 	line = ""
 	for i in data:
 		line = line + i
-	fs =  open(planners, 'r')
-	num_planners = fs.readlines()
-	for i in num_planners:
-		##print i[:-1] 
-		entry = entry = line + "," +i[:-1] + ",?\n"
+	for i in planners:
+		entry = line + "," + i + ",?\n"
 		fd.write(entry)
 	fd.close()
 	
@@ -72,48 +76,29 @@ def join(translate, preprocess, fflearner, heuristics, union):
 		entry_translate = "?,?,?,?,?,?,?,?,?"
 		union = union + entry_translate
 	return union
+# -----------------------------------------------------------------------------
+# join_file_regression
+#
+# writes global_features_regression.arff into the directory route with one
+# entry per planner selected by the classification model. The features line
+# is read from route unless it is given
+# -----------------------------------------------------------------------------
+def join_file_regression(route, planners, union_final=None):
+    if union_final is None:
+        union_final = read_features(route)
+    head = headRegression([])
+    writeEntries(route+"/global_features_regression.arff", union_final, head, planners)
+    return union_final
+
 # main
 # -----------------------------------------------------------------------------
 if __name__ == '__main__':
 
-    translate = []
-    preprocess =[]
-    fflearner = []
-    heuristics =[]
-    union_final = ""
-    route = ""
     if (len(sys.argv) == 3):
         route = sys.argv[1]
     else:
         print "ERROR:::: Need one argument to create the features file" 
         sys.exit(-1)
-    try:
-	    print route + "/translateFile"
-	    translate = readFile(route+"/translateFile", translate) ## translateFile
-	   
-    except:
-	    print "No file in translate"
-	    translate = ["?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?"]
-    try:
-	    preprocess = readFile(route+"/features.arff", preprocess) ## features.arff
-    except:
-	    print "No file in preprocess"
-	    preprocess = ["?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?\n"]
-    try:
-	    fflearner = readFile(route+"/initfeature-info.txt", fflearner) 
-    except:
-	    print "No file in fflearner"
-	    fflearner = ["?,?,?,?,?,?,?,?,?,?,?,?,?\n"]
-    try:
-	    heuristics = readFile(route+"/tmp_results", heuristics)
-    except:
-	    print "No file in heuristics"
-	    heuristics = ["?,?,?,?,?,?,?,?,?\n"]
-    try:
-	    union_final = join(translate, preprocess, fflearner, heuristics, union_final)
-    except:
-	    print "General error"
-	    union_final = "?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?"
+    union_final = read_features(route)
     head = headRegression([])
     writeFile(route+"/global_features_regression.arff", union_final, head, sys.argv[2])
-
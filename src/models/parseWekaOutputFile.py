@@ -83,15 +83,54 @@ def split_problems(data, listData):
 			aux = 1
 	return listData
 
-if(len(sys.argv) >= 3):
+# -----------------------------------------------------------------------------
+# read_results
+#
+# returns the results of the Weka output file name, one per planner
+# -----------------------------------------------------------------------------
+def read_results(name):
 	data = []
-	data = readFile(data, sys.argv[1])
+	data = readFile(data, name)
 	data = clear_data(data)
 	results = []
 	for i in data:
 		result = Result(0, "", "", 0.0, "")
 		result = result.split_line(i)
 		results.append(result)
+	return results
+
+# -----------------------------------------------------------------------------
+# predictions
+#
+# returns a dictionary that maps every planner in the Weka output file name to
+# its probability of solving the problem
+# -----------------------------------------------------------------------------
+def predictions(name):
+	return dict((result.planner, success_probability(result)) for result in read_results(name))
+
+# -----------------------------------------------------------------------------
+# success_probability
+#
+# returns the probability of the class True of result. Weka reports the
+# confidence of the predicted class, which split_line only turns into the
+# probability of True for the lowercase label false, whereas the training sets
+# declare the classes {True,False}
+# -----------------------------------------------------------------------------
+def success_probability(result):
+	confidence = float(result.error)
+	if(result.predicted.lower().find("false") >= 0 and result.predicted.find("false") < 0):
+		return 1 - confidence
+	return confidence
+
+# -----------------------------------------------------------------------------
+# parse_weka_output
+#
+# ranks the planners of the Weka output file name and writes the first
+# numberPlanner of them into the file output, which may be None. Returns the
+# list of selected planners
+# -----------------------------------------------------------------------------
+def parse_weka_output(name, output, numberPlanner=STRATEGY):
+	results = read_results(name)
 	## from more than one problem
 	listData = []
 	for i in range(int(len(results)/15)):
@@ -103,14 +142,19 @@ if(len(sys.argv) >= 3):
 			list_aux.append(j)
 	sortedData = []
 	sortedData = sorted_results(list_aux, sortedData)
-	
-	if(len(sys.argv) == 4):
-		writeFile(sortedData, sys.argv[2], int(sys.argv[3]))
+	if output is not None:
+		writeFile(sortedData, output, numberPlanner)
+	return [sortedData[i].planner for i in range(numberPlanner)]
+
+if __name__ == '__main__':
+	if(len(sys.argv) >= 3):
+		if(len(sys.argv) == 4):
+			parse_weka_output(sys.argv[1], sys.argv[2], int(sys.argv[3]))
+		else:
+			parse_weka_output(sys.argv[1], sys.argv[2], STRATEGY)
+			
 	else:
-		writeFile(sortedData, sys.argv[2], STRATEGY)
-		
-else:
-	print "Need python parseWekaOutputFile.py input input2"
-	print "input >> output model"
-	print "input >> domain,problem"
-	sys.exit(-1)
+		print "Need python parseWekaOutputFile.py input input2"
+		print "input >> output model"
+		print "input >> domain,problem"
+		sys.exit(-1)
@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parseWekaOutputFile
+
+# 'weka -p 0' reports the confidence of the predicted class of every instance,
+# and the training sets declare the classes {True,False}
+OUTPUT = """=== Predictions on test data ===
+
+ inst#     actual  predicted error prediction (planner)
+     1        1:?     1:True       0.8 (lama-2011)
+     2        1:?    2:False       0.9 (arvand)
+"""
+
+
+def test_predictions_are_probabilities_of_success(tmpdir):
+    name = tmpdir.join("weka.output")
+    name.write(OUTPUT)
+    probabilities = parseWekaOutputFile.predictions(str(name))
+    assert sorted(probabilities) == ["arvand", "lama-2011"]
+    assert abs(probabilities["lama-2011"] - 0.8) < 1e-12
+    # arvand is predicted to fail with confidence 0.9
+    assert abs(probabilities["arvand"] - 0.1) < 1e-12